@@ -0,0 +1,107 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Report the latency percentiles and the throughput of every SwitcheoApi method against the local mock server,
+as well as of the transaction serializer and the signing, as a baseline to catch regressions between releases.
+
+Usage:
+    python -m benchmarks.bench_api [--iterations 200] [--latency 0] [--only list_offers,deposit] [--output FILE]
+"""
+
+import json
+import time
+import argparse
+from benchmarks.fixtures import WIF, TRANSACTION
+from benchmarks.mock_server import CONTRACT_HASH, ORDERS, MockSwitcheoServer
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.serialization import serialize_transaction, sign_transaction
+from pyswitcheo.signer import Signer
+
+ADDRESS = "ANVLCD3xqGXKhDnrivpVFvDLcvkpgPbbMt"
+
+
+def percentile(samples, fraction):
+    """Return the nearest rank percentile of sorted samples, for eg. fraction=0.99 for the p99."""
+    index = max(0, min(len(samples) - 1, int(round(fraction * len(samples) + 0.5)) - 1))
+    return samples[index]
+
+
+def _cancel_all(client, signer):
+    """Cancel all the orders of the mock server, checking that every one of them was cancelled."""
+    results = client.cancel_all(signer, CONTRACT_HASH)
+    assert len(results) == ORDERS and all(result.ok for result in results), results
+    return results
+
+
+def cases(client, signer):
+    """Return (name, callable) for every measured operation, the SwitcheoApi methods first."""
+    order = {"pair": "SWTH_NEO", "side": "buy", "price": 0.0005, "want_amount": 1, "asset_id": "SWTH",
+             "use_native_tokens": True, "contract_hash": CONTRACT_HASH}
+    return [
+        ("list_contracts", client.list_contracts),
+        ("list_pairs", lambda: client.list_pairs(["NEO"])),
+        ("get_exchange_timestamp", client.get_exchange_timestamp),
+        ("get_contract_tokens_info", client.get_contract_tokens_info),
+        ("get_candle_sticks", lambda: client.get_candle_sticks("SWTH_NEO", 1531215240, 1531245240, 5)),
+        ("get_candle_sticks_array", lambda: client.get_candle_sticks_array("SWTH_NEO", 1531215240, 1531245240, 5)),
+        ("list_balances", lambda: client.list_balances([ADDRESS], [CONTRACT_HASH])),
+        ("list_trades", lambda: client.list_trades(CONTRACT_HASH, "SWTH_NEO", limit=1000)),
+        ("list_offers", lambda: client.list_offers("neo", "SWTH_NEO", CONTRACT_HASH)),
+        ("list_orders", lambda: client.list_orders(ADDRESS, CONTRACT_HASH)),
+        ("deposit", lambda: client.deposit(signer, "SWTH", 1, CONTRACT_HASH)),
+        ("withdraw", lambda: client.withdraw(signer, "SWTH", 1, CONTRACT_HASH)),
+        ("create_order", lambda: client.create_order(signer, **order)),
+        ("create_orders(10)", lambda: client.create_orders(signer, [order] * 10)),
+        ("create_cancellation", lambda: client.create_cancellation("c415f943-bea8-4dbf-82e3-8460c559d8b7", signer)),
+        ("cancel_orders(10)", lambda: client.cancel_orders(["order-{0}".format(i) for i in range(10)], signer)),
+        ("cancel_all", lambda: _cancel_all(client, signer)),
+        ("serialize_transaction", lambda: serialize_transaction(TRANSACTION, signed=False)),
+        ("sign_transaction", lambda: sign_transaction(TRANSACTION, signer.private_key)),
+    ]
+
+
+def measure(func, iterations, warmup=3):
+    """Call func iterations times, returning the sorted durations in seconds and the total time."""
+    for _ in range(warmup):
+        func()
+    durations = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+    durations.sort()
+    return durations, total
+
+
+def run(iterations, latency, only=None, output=None):
+    """Print p50/p99 latency and throughput of every case, optionally saving them as json."""
+    results = {}
+    with MockSwitcheoServer(latency=latency) as server:
+        client = SwitcheoApi(server.base_url)
+        signer = Signer(WIF)
+        print("{0:>26} {1:>10} {2:>10} {3:>12}".format("operation", "p50 (ms)", "p99 (ms)", "ops/s"))
+        for name, func in cases(client, signer):
+            if only and name not in only:
+                continue
+            durations, total = measure(func, iterations)
+            results[name] = {"p50_ms": percentile(durations, 0.5) * 1000, "p99_ms": percentile(durations, 0.99) * 1000,
+                             "ops_per_s": iterations / total, "iterations": iterations}
+            print("{0:>26} {1:>10.3f} {2:>10.3f} {3:>12.1f}".format(
+                name, results[name]["p50_ms"], results[name]["p99_ms"], results[name]["ops_per_s"]))
+        client.close()
+
+    if output:
+        with open(output, "w") as f:
+            json.dump({"latency": latency, "results": results}, f, indent=2, sort_keys=True)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="Number of measured calls per operation.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mock server waits per request.")
+    parser.add_argument("--only", default=None, help="Comma separated operations to measure, defaults to all.")
+    parser.add_argument("--output", default=None, help="Save the results as json to this file.")
+    args = parser.parse_args()
+    run(args.iterations, args.latency, only=args.only.split(",") if args.only else None, output=args.output)
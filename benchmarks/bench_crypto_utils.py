@@ -0,0 +1,144 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Micro-benchmarks of the hex primitives called in every serialization pass, with a regression check.
+
+The timings are stored relative to a calibration made of builtin calls, timed on the same machine, so the
+baselines saved in benchmarks/baselines/crypto_utils.json stay roughly comparable across machines. Single
+primitives still drift by tens of percent between runs, so CI only reports them and --check is meant to be
+run on a quiet machine before and after a change.
+
+Usage:
+    python -m benchmarks.bench_crypto_utils                # print the timings against the baselines
+    python -m benchmarks.bench_crypto_utils --check        # exit with 1 if a primitive got slower
+    python -m benchmarks.bench_crypto_utils --update       # store the current timings as the baselines
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+from pyswitcheo import crypto_utils
+from pyswitcheo.datatypes.fixed8 import Fixed8
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "crypto_utils.json")
+
+# Relative slowdown over the baseline tolerated by --check, 0.25 means 25% slower.
+DEFAULT_THRESHOLD = 0.25
+
+_TX_HASH = "71d280abc0a6d6063573faf7c0c3d5ecc3fb8e9f505728ec4f5a3f04f0daef23"
+_SCRIPT = ("0800ca9a3b000000001432e125258b7db0a0dffde5bd03b2b859253538ab1449a7f81f67944e02c9d7da02b14"
+           "dc87d20ae44d153c1076465706f73697467823b63e7c70a795a7615a38d1ba67d9e54c195a1") * 4
+_SIGNABLE = ('{"blockchain":"neo","contract_hash":"a195c1549e7da61b8da315765a790ac7e7633b82",'
+             '"order_type":"limit","pair":"SWTH_NEO","price":"0.0005","side":"buy",'
+             '"timestamp":1533807240000,"use_native_tokens":true,"want_amount":"100000000000"}')
+_FIXED8 = Fixed8("12.345")
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+# (name, callable) at the input sizes met when serializing a transaction or signing a payload.
+CASES = [
+    ("is_hex(32 bytes)", lambda: crypto_utils.is_hex(_TX_HASH)),
+    ("is_hex(280 bytes)", lambda: crypto_utils.is_hex(_SCRIPT)),
+    ("reverse_hex(32 bytes)", lambda: crypto_utils.reverse_hex(_TX_HASH)),
+    ("reverse_hex(20 bytes)", lambda: crypto_utils.reverse_hex(_TX_HASH[:40])),
+    ("num_to_hex_string(uint8)", lambda: crypto_utils.num_to_hex_string(209)),
+    ("num_to_hex_string(uint16 le)", lambda: crypto_utils.num_to_hex_string(47, 2, True)),
+    ("num_to_hex_string(uint64 le)", lambda: crypto_utils.num_to_hex_string(1533807240000, 8, True)),
+    ("num_to_var_int(1 byte)", lambda: crypto_utils.num_to_var_int(2)),
+    ("num_to_var_int(3 bytes)", lambda: crypto_utils.num_to_var_int(280)),
+    ("Fixed8.to_reverse_hex", _FIXED8.to_reverse_hex),
+    ("encode_msg(signable params)", lambda: crypto_utils.encode_msg(_SIGNABLE)),
+]
+
+
+def _best_ns(func, number, repeat):
+    """Return the best time of one call of func in nanoseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+def _calibration():
+    """A fixed mix of the builtin string and bytes calls the primitives rely on, the unit of the timings."""
+    "%x" % 1533807240000
+    bytes.fromhex("71d280abc0a6d606")[::-1].hex()
+    "".join(["71", "d2", "80", "ab"])
+    _HEX_DIGITS.issuperset("71d280abc0a6d606")
+
+
+def measure(number, repeat, cases=CASES):
+    """Return the calibration time in ns and the time of every case in calibration units.
+
+    The calibration is timed right before every case, so that a change of the machine load during the run
+    affects both sides of the ratio.
+    """
+    units, results = [], {}
+    for name, func in cases:
+        units.append(_best_ns(_calibration, number, repeat))
+        results[name] = _best_ns(func, number, repeat) / units[-1]
+    return min(units), results
+
+
+def load_baselines(path=BASELINES):
+    """Return the stored baselines in calibration units, or an empty dict if none were saved."""
+    try:
+        with open(path) as f:
+            return json.load(f)["cases"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(results, path=BASELINES):
+    """Store results, in calibration units, as the baselines."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"unit": "calibration", "cases": {name: round(value, 4) for name, value in results.items()}},
+                  f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressions(results, baselines, threshold=DEFAULT_THRESHOLD):
+    """Return the names of the cases more than threshold slower than their baseline."""
+    return [name for name, value in results.items()
+            if name in baselines and value > baselines[name] * (1 + threshold)]
+
+
+def run(number, repeat, threshold, check=False, update=False, retries=2, path=BASELINES):
+    """Print every case against its baseline, returning the process exit code."""
+    unit, results = measure(number, repeat)
+    baselines = load_baselines(path)
+    print("calibration: {0:.0f} ns".format(unit))
+    print("{0:>30} {1:>10} {2:>10} {3:>9}".format("primitive", "ns/call", "base (ns)", "change"))
+    for name, value in results.items():
+        base = baselines.get(name)
+        print("{0:>30} {1:>10.0f} {2:>10} {3:>9}".format(
+            name, value * unit, "{0:.0f}".format(base * unit) if base else "-",
+            "{0:+.0%}".format(value / base - 1) if base else "-"))
+
+    if update:
+        save_baselines(results, path)
+        print("Baselines saved to {0}".format(path))
+        return 0
+    slower = regressions(results, baselines, threshold)
+    # A regression has to show up again when measured on its own, a busy machine slows down a single run.
+    for _ in range(retries):
+        if not slower:
+            break
+        _, again = measure(number, repeat, [case for case in CASES if case[0] in slower])
+        slower = regressions(again, baselines, threshold)
+    if check and slower:
+        print("Slower than the baseline by more than {0:.0%}: {1}".format(threshold, ", ".join(slower)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="Calls per measurement.")
+    parser.add_argument("--repeat", type=int, default=7, help="Number of measurements to take the best of.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Tolerated slowdown, 0.25 is 25%%.")
+    parser.add_argument("--baselines", default=BASELINES, help="Json file holding the baselines.")
+    parser.add_argument("--check", action="store_true", help="Exit with 1 if a primitive is slower than allowed.")
+    parser.add_argument("--update", action="store_true", help="Store the current timings as the baselines.")
+    parser.add_argument("--retries", type=int, default=2, help="Measurements a slower primitive is confirmed with.")
+    args = parser.parse_args()
+    sys.exit(run(args.number, args.repeat, args.threshold, check=args.check, update=args.update,
+                 retries=args.retries, path=args.baselines))
@@ -0,0 +1,79 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Compare the memory held by orders decoded as dicts with the one held by the slotted Order models.
+
+Usage:
+    python -m benchmarks.bench_models [--count 100000]
+"""
+
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+from pyswitcheo.datatypes.models import decode_orders
+
+
+def _order(index):
+    """Return one list_orders item with a fill and a make, amounts as strings like the exchange sends them."""
+    return {"id": "c415f943-bea8-4dbf-82e3-8460c559d8b{0}".format(index), "blockchain": "neo",
+            "contract_hash": "a195c1549e7da61b8da315765a790ac7e7633b82",
+            "address": "6d0b2bca2fe8a1ac0d5ec0fd8f0fdb6df0e32a4e", "side": "buy",
+            "offer_asset_id": "c56f33fc6ecfcd0c225c4ab356fee59390af8560be0e930faebe74a6daff7c9b",
+            "want_asset_id": "ab38352559b8b203bde5fddfa0b07d8b2525e132", "offer_amount": "{0}".format(index),
+            "want_amount": "{0}".format(2 * index), "transfer_amount": "0", "priority_gas_amount": "0",
+            "use_native_token": True, "native_fee_transfer_amount": 0, "deposit_txn": None,
+            "created_at": "2018-08-08T10:40:59.398Z", "status": "processed",
+            "fills": [{"id": "2eaa3621-0e7e-4b3d-9c8c-454427f20949", "offer_hash": "bb70a40e8465596bf63dbddf9862",
+                       "offer_asset_id": "ab38352559b8b203bde5fddfa0b07d8b2525e132",
+                       "want_asset_id": "c56f33fc6ecfcd0c225c4ab356fee59390af8560be0e930faebe74a6daff7c9b",
+                       "fill_amount": "1000000", "want_amount": "2000000", "filled_amount": "",
+                       "fee_asset_id": "ab38352559b8b203bde5fddfa0b07d8b2525e132", "fee_amount": "73888",
+                       "price": "0.00050000", "txn": None, "status": "success",
+                       "created_at": "2018-08-08T10:40:59.398Z", "transaction_hash": "97ad8c0c3ff4e2d3c1e3b7a2"}],
+            "makes": [{"id": "ba5c1fb3-c7ad-42cd-b7b6-0a1a4ec4a1a0", "offer_hash": None,
+                       "available_amount": "{0}".format(index),
+                       "offer_asset_id": "c56f33fc6ecfcd0c225c4ab356fee59390af8560be0e930faebe74a6daff7c9b",
+                       "offer_amount": "{0}".format(index),
+                       "want_asset_id": "ab38352559b8b203bde5fddfa0b07d8b2525e132",
+                       "want_amount": "{0}".format(2 * index), "filled_amount": "0.0", "txn": None,
+                       "cancel_txn": None, "price": "0.0005", "status": "confirming",
+                       "created_at": "2018-08-08T10:40:59.398Z", "transaction_hash": "4c4e8c0c3ff4e2d3c1e3b7a2",
+                       "trades": []}]}
+
+
+def _measure(build):
+    """Return (result, bytes still allocated by result, seconds) of build()."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    # Only count what result keeps alive, not the garbage left by building it.
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def run(count):
+    """Print the memory held by count orders as parsed dicts and as models."""
+    payload = json.dumps([_order(index) for index in range(count)])
+
+    # Both sides start from the payload, the models keep some of the strings of the parse.
+    dicts, dicts_size, dicts_time = _measure(lambda: json.loads(payload))
+    dicts_count, dicts = len(dicts), None
+    models, models_size, models_time = _measure(lambda: decode_orders(json.loads(payload)))
+    assert dicts_count == len(models) == count
+
+    print("{0:>8} {1:>12} {2:>14} {3:>10}".format("", "total (MB)", "per order (B)", "time (s)"))
+    for name, size, elapsed in (("dicts", dicts_size, dicts_time), ("models", models_size, models_time)):
+        print("{0:>8} {1:>12.1f} {2:>14.0f} {3:>10.3f}".format(name, size / 1e6, size / count, elapsed))
+    print("models hold {0:.1f}x less memory".format(dicts_size / models_size))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000, help="Number of orders to decode.")
+    args = parser.parse_args()
+    run(args.count)
@@ -0,0 +1,35 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Compare serialize_transaction with serialize_transaction_bytes on growing transactions.
+
+Usage:
+    python -m benchmarks.bench_serialization [--sizes 1,10,100,500] [--repeat 20]
+"""
+
+import argparse
+import timeit
+from benchmarks.fixtures import transaction_with
+from pyswitcheo.serialization import serialize_transaction, serialize_transaction_bytes
+
+
+def run(sizes, repeat):
+    """Print the best time of both serializers for every number of inputs and outputs."""
+    print("{0:>8} {1:>14} {2:>14} {3:>9}".format("in/out", "hex (ms)", "bytes (ms)", "speedup"))
+    for size in sizes:
+        tx = transaction_with(inputs=size, outputs=size)
+        assert bytes.fromhex(serialize_transaction(tx, signed=False)) == serialize_transaction_bytes(tx, signed=False)
+
+        number = max(1, 1000 // size)
+        as_hex = min(timeit.repeat(lambda: serialize_transaction(tx, signed=False),
+                                   number=number, repeat=repeat)) / number * 1000
+        as_bytes = min(timeit.repeat(lambda: serialize_transaction_bytes(tx, signed=False),
+                                     number=number, repeat=repeat)) / number * 1000
+        print("{0:>8} {1:>14.4f} {2:>14.4f} {3:>8.1f}x".format(size, as_hex, as_bytes, as_hex / as_bytes))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,10,100,500", help="Comma separated number of inputs and outputs.")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of measurements to take the best of.")
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.repeat)
@@ -0,0 +1,40 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Compare the signing executors on batches of 1, 10, 100 and 1000 transactions.
+
+Usage:
+    python -m benchmarks.bench_signing [--workers N] [--sizes 1,10,100,1000]
+"""
+
+import argparse
+import time
+from benchmarks.fixtures import WIF, transactions
+from pyswitcheo.executors import get_signing_executor, INLINE, THREAD, PROCESS
+from pyswitcheo.serialization import sign_array
+from pyswitcheo.signer import Signer
+
+
+def run(sizes, workers):
+    """Print the time taken by every executor mode for every batch size."""
+    priv_key = Signer(WIF).private_key
+    print("{0:>8} {1:>10} {2:>12} {3:>12}".format("txns", "mode", "total (ms)", "per txn (ms)"))
+    for size in sizes:
+        txns = transactions(size)
+        for mode in (INLINE, THREAD, PROCESS):
+            executor = get_signing_executor(mode, max_workers=workers)
+            # Warm up the pool so that worker start-up is not part of the measurement.
+            sign_array(txns[:1], priv_key, executor=executor)
+
+            start = time.perf_counter()
+            sign_array(txns, priv_key, executor=executor)
+            elapsed = (time.perf_counter() - start) * 1000
+            executor.shutdown()
+            print("{0:>8} {1:>10} {2:>12.2f} {3:>12.3f}".format(size, mode, elapsed, elapsed / size))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=None, help="Workers per pool, defaults to the cpu count.")
+    parser.add_argument("--sizes", default="1,10,100,1000", help="Comma separated batch sizes.")
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.workers)
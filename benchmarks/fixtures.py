@@ -0,0 +1,44 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Sample payloads shared by the benchmarks."""
+
+import copy
+
+# Test wallet used across the examples and tests.
+WIF = "L4FSnRosoUv22cCu5z7VEEGd2uQWTK7Me83vZxgQQEsJZ2MReHbu"
+
+# A deposit invocation transaction as received from the create deposit end point.
+TRANSACTION = {
+    "hash": "71d280abc0a6d6063573faf7c0c3d5ecc3fb8e9f505728ec4f5a3f04f0daef23",
+    "sha256": "e2c7cfa234ffe2bc00441580b3ad0b8bbd436a5d4ff1933ef92219349e9d3fd3",
+    "type": 209,
+    "version": 1,
+    "attributes": [{"usage": 32, "data": "49a7f81f67944e02c9d7da02b14dc87d20ae44d1"}],
+    "inputs": [{"prevHash": "476fe15755b0b244a110ebc0bb31d1034994b04908f584c3ce21322dec5f84d0", "prevIndex": 0},
+               {"prevHash": "04e412b05a3e594cbf05c3aab606fc409735fea02ab2a452f2fa0e47f3292fe9", "prevIndex": 47}],
+    "outputs": [{"assetId": "602c79718b16e442de58778e148d0b1084e3b2dffd5de6b7b16cee7969282de7",
+                 "scriptHash": "e707714512577b42f9a011f8b870625429f93573",
+                 "value": 1e-08}],
+    "scripts": [],
+    "script": ("0800ca9a3b000000001432e125258b7db0a0dffde5bd03b2b859253538ab1449a7f81f67944e02c9d7da02b14"
+               "dc87d20ae44d153c1076465706f73697467823b63e7c70a795a7615a38d1ba67d9e54c195a1"),
+    "gas": 0
+}
+
+
+def transactions(count):
+    """Return `count` distinct {"id", "txn"} items as found in the fills and makes of an order."""
+    items = []
+    for i in range(count):
+        txn = copy.deepcopy(TRANSACTION)
+        txn["inputs"][1]["prevIndex"] = i
+        items.append({"id": "txn-{0}".format(i), "txn": txn})
+    return items
+
+
+def transaction_with(inputs, outputs):
+    """Return a copy of TRANSACTION carrying the given number of inputs and outputs."""
+    txn = copy.deepcopy(TRANSACTION)
+    txn["inputs"] = [{"prevHash": "{0:064x}".format(i + 1), "prevIndex": i % 65536} for i in range(inputs)]
+    txn["outputs"] = [dict(TRANSACTION["outputs"][0], value=(i + 1) / 1e8) for i in range(outputs)]
+    return txn
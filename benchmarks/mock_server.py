@@ -0,0 +1,238 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Local stand-in for the Switcheo v2 API, serving realistic payloads with a configurable latency.
+
+Usage:
+    python -m benchmarks.mock_server [--port 8000] [--latency 0.02] [--jitter 0.005]
+
+The client can then be pointed at it with SwitcheoApi("http://127.0.0.1:8000").
+"""
+
+import re
+import copy
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from socketserver import ThreadingMixIn
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+from benchmarks.fixtures import TRANSACTION
+
+CONTRACT_HASH = "a195c1549e7da61b8da315765a790ac7e7633b82"
+ADDRESS_SCRIPT_HASH = "6d0b2bca2fe8a1ac0d5ec0fd8f0fdb6df0e32a4e"
+NEO_ASSET_ID = "c56f33fc6ecfcd0c225c4ab356fee59390af8560be0e930faebe74a6daff7c9b"
+GAS_ASSET_ID = "602c79718b16e442de58778e148d0b1084e3b2dffd5de6b7b16cee7969282de7"
+SWTH_ASSET_ID = "ab38352559b8b203bde5fddfa0b07d8b2525e132"
+
+TOKENS = {"NEO": {"hash": NEO_ASSET_ID, "decimals": 8},
+          "GAS": {"hash": GAS_ASSET_ID, "decimals": 8},
+          "SWTH": {"hash": SWTH_ASSET_ID, "decimals": 8}}
+CONTRACTS = {"NEO": {"V1": "0ec5712e0f7c63e4b0fea31029a28cea5e9d551f",
+                     "V1_5": "c41d8b0c30252ce7e8b6d95e9ce13fdd68d2a5a8", "V2": CONTRACT_HASH}}
+PAIRS = ["GAS_NEO", "SWTH_NEO", "NEO_SWTH", "GAS_SWTH"]
+BALANCES = {"confirming": {"GAS": [{"event_type": "withdrawal", "asset_id": GAS_ASSET_ID, "amount": "-100000000",
+                                    "transaction_hash": None, "created_at": "2018-07-12T10:48:48.866Z"}]},
+            "confirmed": {"GAS": "47320000000.0", "SWTH": "421549852102.0", "NEO": "50269113921.0"},
+            "locked": {"GAS": "500000000.0", "NEO": "1564605000.0"}}
+
+# Number of offers per side and orders returned by the list end points.
+OFFERS_PER_SIDE = 70
+ORDERS = 50
+
+
+def _fill(index):
+    return {"id": str(uuid.UUID(int=index)), "offer_hash": "bb70a40e8465596bf63dbddf9862a009246e3ca27a4cf5140d70",
+            "offer_asset_id": SWTH_ASSET_ID, "want_asset_id": NEO_ASSET_ID, "fill_amount": "1000000000",
+            "want_amount": "1000000", "filled_amount": "", "fee_asset_id": SWTH_ASSET_ID, "fee_amount": "73888",
+            "price": "0.001", "txn": copy.deepcopy(TRANSACTION), "status": "pending",
+            "created_at": "2018-08-08T10:40:59.398Z", "transaction_hash": "97ad8c0c3ff4e2d3c1e3b7a2"}
+
+
+def _make(index):
+    return {"id": str(uuid.UUID(int=index + 1)), "offer_hash": None, "available_amount": "1050000",
+            "offer_asset_id": NEO_ASSET_ID, "offer_amount": "1050000", "want_asset_id": SWTH_ASSET_ID,
+            "want_amount": "1050000000", "filled_amount": "0.0", "txn": copy.deepcopy(TRANSACTION),
+            "cancel_txn": None, "price": "0.001", "status": "pending", "created_at": "2018-08-08T10:40:59.398Z",
+            "transaction_hash": "4c4e8c0c3ff4e2d3c1e3b7a2", "trades": []}
+
+
+def _order(index, side="buy"):
+    return {"id": str(uuid.UUID(int=index)), "blockchain": "neo", "contract_hash": CONTRACT_HASH,
+            "address": ADDRESS_SCRIPT_HASH, "side": side, "offer_asset_id": NEO_ASSET_ID,
+            "want_asset_id": SWTH_ASSET_ID, "offer_amount": "2050000", "want_amount": "2050000000",
+            "transfer_amount": "0", "priority_gas_amount": "0", "use_native_token": True,
+            "native_fee_transfer_amount": 0, "deposit_txn": None, "created_at": "2018-08-08T10:40:59.398Z",
+            "status": "pending", "order_status": "open", "fills": [_fill(2 * index)], "makes": [_make(2 * index)]}
+
+
+def _orders(query, body):
+    """Every listed order is open, filtering on another status gives none."""
+    if query.get("order_status", "open") != "open":
+        return []
+    return [_order(i) for i in range(min(ORDERS, int(query.get("limit", ORDERS))))]
+
+
+def _offers(query, body):
+    asks = [{"id": str(uuid.UUID(int=i)), "offer_asset": "SWTH", "want_asset": "NEO",
+             "available_amount": 100000000000, "offer_amount": 100000000000, "want_amount": 50000000 + i * 1000}
+            for i in range(OFFERS_PER_SIDE)]
+    bids = [{"id": str(uuid.UUID(int=OFFERS_PER_SIDE + i)), "offer_asset": "NEO", "want_asset": "SWTH",
+             "available_amount": 49000000 - i * 1000, "offer_amount": 49000000 - i * 1000,
+             "want_amount": 100000000000} for i in range(OFFERS_PER_SIDE)]
+    return asks + bids
+
+
+def _trades(query, body):
+    limit = int(query.get("limit", 5000))
+    to_time = int(query.get("to", 1528457523 + limit))
+    return [{"id": str(uuid.UUID(int=i)), "fill_amount": 9122032316 + i, "take_amount": 20921746 + i,
+             "event_time": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(to_time - 1 - i)),
+             "is_buy": bool(i % 2)} for i in range(min(limit, 5000))]
+
+
+def _candles(query, body):
+    interval = int(query.get("interval", 1)) * 60
+    start, end = int(query["start_time"]), int(query["end_time"])
+    return [{"time": str(t), "open": "0.00049408", "close": "0.00049238", "high": "0.000497", "low": "0.00048919",
+             "volume": "110169445.0", "quote_volume": "55313.0"}
+            for t in range(start + (-start % interval), end + 1, interval)]
+
+
+def _withdrawal_broadcast(query, body, withdrawal_id):
+    return {"event_type": "withdrawal", "amount": "-100000000", "asset_id": SWTH_ASSET_ID, "status": "confirming",
+            "id": withdrawal_id, "blockchain": "neo", "reason_code": 9, "address": ADDRESS_SCRIPT_HASH,
+            "transaction_hash": None, "created_at": "2018-08-08T10:40:59.398Z",
+            "updated_at": "2018-08-08T10:40:59.398Z", "contract_hash": CONTRACT_HASH}
+
+
+# (method, path regex relative to /v2, handler(query, body, *groups) returning the json payload)
+ROUTES = [
+    ("GET", r"/exchange/timestamp", lambda query, body: {"timestamp": int(time.time() * 1000)}),
+    ("GET", r"/exchange/contracts", lambda query, body: CONTRACTS),
+    ("GET", r"/exchange/tokens", lambda query, body: TOKENS),
+    ("GET", r"/exchange/pairs", lambda query, body: PAIRS),
+    ("GET", r"/tickers/candlesticks", _candles),
+    ("GET", r"/balances", lambda query, body: BALANCES),
+    ("GET", r"/trades", _trades),
+    ("GET", r"/offers", _offers),
+    ("GET", r"/orders", _orders),
+    ("POST", r"/orders", lambda query, body: _order(random.getrandbits(32), body.get("side", "buy"))),
+    ("POST", r"/orders/([^/]+)/broadcast", lambda query, body, order_id: dict(_order(0), id=order_id)),
+    ("POST", r"/deposits", lambda query, body: {"id": str(uuid.uuid4()), "transaction": TRANSACTION}),
+    ("POST", r"/deposits/([^/]+)/broadcast", lambda query, body, deposit_id: {"result": "ok"}),
+    ("POST", r"/withdrawals", lambda query, body: {"id": str(uuid.uuid4())}),
+    ("POST", r"/withdrawals/([^/]+)/broadcast", _withdrawal_broadcast),
+    ("POST", r"/cancellations", lambda query, body: {"id": str(uuid.uuid4()), "transaction": TRANSACTION}),
+    ("POST", r"/cancellations/([^/]+)/broadcast", lambda query, body, cancellation_id: _order(0)),
+]
+_COMPILED_ROUTES = [(method, re.compile(r"^/v2{0}/?$".format(path)), handler) for method, path, handler in ROUTES]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Dispatches the requests to ROUTES after sleeping for the latency of the server."""
+
+    # Keep the connections alive so that the client pool is exercised like against the real exchange.
+    protocol_version = "HTTP/1.1"
+    # The headers and the body are sent separately, Nagle would hold the body back until the headers are acked.
+    disable_nagle_algorithm = True
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length).decode("utf-8")) if length else {}
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        self.server.wait()
+        for route_method, pattern, handler in _COMPILED_ROUTES:
+            match = pattern.match(url.path)
+            if route_method == method and match:
+                status, payload = 200, handler(query, body, *match.groups())
+                break
+        else:
+            status, payload = 404, {"error": "Not found: {0} {1}".format(method, url.path)}
+
+        content = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockSwitcheoServer(ThreadingMixIn, HTTPServer):
+    """Switcheo v2 API stand-in listening on localhost, usable as a context manager.
+
+    Example:
+        with MockSwitcheoServer(latency=0.02) as server:
+            client = SwitcheoApi(server.base_url)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, jitter=0.0):
+        """Bind the server, requests are only served once start() is called.
+
+        Args:
+            port (int)      : Port to listen on, 0 picks a free one.
+            latency (float) : Seconds every request waits before being answered.
+            jitter (float)  : Maximum number of seconds randomly added to the latency.
+        """
+        HTTPServer.__init__(self, ("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """Return the url to pass to SwitcheoApi, without the api version."""
+        return "http://{0}:{1}".format(*self.server_address)
+
+    def wait(self):
+        """Sleep for the configured latency, called before answering every request."""
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def start(self):
+        """Serve the requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-switcheo-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the socket."""
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every request waits before the answer.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum seconds randomly added to the latency.")
+    args = parser.parse_args()
+    server = MockSwitcheoServer(args.port, args.latency, args.jitter)
+    print("Serving the Switcheo v2 API on {0}/v2".format(server.base_url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -10,20 +10,102 @@ from pyswitcheo.internal.api import tickers
 from pyswitcheo.internal.api import trades
 from pyswitcheo.internal.api import orders
 from pyswitcheo.internal.api import withdrawals
+from pyswitcheo import batch
 from pyswitcheo.utils import response_to_json
+from pyswitcheo.session import SwitcheoSession, DEFAULT_POOL_SIZE
+from pyswitcheo.tokens import TokenInfoCache, DEFAULT_TOKEN_CACHE_TTL
+from pyswitcheo.executors import get_signing_executor
+from pyswitcheo.signer import SignerCache, as_signer
+from pyswitcheo.schemas import ResponseValidator
+from pyswitcheo.store import MarketDataStore
+from pyswitcheo.clock import ExchangeClock
+from pyswitcheo.instrumentation import Instrumentation, instrumented
 
 
 class SwitcheoApi(object):
     """Base implementation for interacting with pyswitcheo APIs."""
 
-    def __init__(self, base_url, api_version="v2"):
+    def __init__(self, base_url, api_version="v2", pool_size=DEFAULT_POOL_SIZE, session=None,
+                 token_cache_ttl=DEFAULT_TOKEN_CACHE_TTL, signing_executor=None, validate_responses=False,
+                 validation_sample_rate=1, cache_dir=None, sync_clock=False, retry=None, rate_limits=None,
+                 coalesce_reads=False, freshness_ms=0, hooks=None, tracer=None, wire_log=None,
+                 cache_signers=False):
         """Initialize Api class instances.
         Args:
             base_url(str)    : Base url represents the endpoint to query the Switcheo API server.
             api_version(str) : An optional api version which could change in future
+            pool_size(int)   : Number of keep-alive connections to keep open to the API server.
+            session(requests.Session) : An optional session to use instead of creating a new pooled one. The
+                                        session options below cannot be combined with it, set them on the session.
+            token_cache_ttl(float)    : Seconds for which the exchange token metadata is cached. None never expires.
+            signing_executor(str|concurrent.futures.Executor) : Executor, or one of inline, thread or process,
+                                        used to sign the fills and makes of an order concurrently.
+            validate_responses(bool)    : Whether to check the responses against the schemas in pyswitcheo.schemas.
+            validation_sample_rate(int) : Validate only one out of every validation_sample_rate responses.
+            cache_dir(str)   : Optional directory to persist the closed candlesticks and trades buckets in.
+            sync_clock(bool) : Whether to timestamp the signed payloads with the exchange clock, estimated from
+                               /exchange/timestamp every few minutes, instead of the local clock.
+            retry(RetryPolicy)   : Retry policy of the pooled session, defaults to retrying GETs on 429/500/503
+                                   with a jittered exponential backoff. False disables retries.
+            rate_limits(dict)    : Optional client side rate limits of the pooled session, endpoint class
+                                   (public, account or trading) to (requests per second, burst).
+            coalesce_reads(bool) : Whether concurrent identical GETs share one network call and response object.
+            freshness_ms(int)    : Milliseconds for which a successful GET response is reused by identical GETs.
+            hooks(list[callable]) : Callables receiving the pyswitcheo.instrumentation.CallMetrics of every call,
+                                    for eg. a PrometheusExporter.
+            tracer(pyswitcheo.tracing.Tracer) : Optional tracer of the calls, a pyswitcheo Tracer or an OpenTelemetry
+                                                one. Every call is a span with child spans for its steps.
+            wire_log(pyswitcheo.wirelog.WireLog) : Optional ring buffer of the pooled session capturing a sample
+                                                   of the raw requests and responses.
+            cache_signers(bool) : Whether to keep the key material derived from the WIFs across calls, until
+                                  signer_cache.clear() is called. Otherwise it is derived once per call.
         """
         self.base_url = str(base_url).strip("/") + '/' + api_version.strip("/")
-
+        self.pool_size = pool_size
+        if session is not None:
+            session_options = {"retry": retry is not None, "rate_limits": rate_limits is not None,
+                               "coalesce_reads": coalesce_reads, "freshness_ms": bool(freshness_ms),
+                               "wire_log": wire_log is not None}
+            ignored = sorted(name for name, given in session_options.items() if given)
+            if ignored:
+                raise ValueError("{0} cannot be combined with an explicit session, set them on the session "
+                                 "instead".format(", ".join(ignored)))
+        else:
+            session = SwitcheoSession(pool_size=pool_size, retry=retry, rate_limits=rate_limits,
+                                      coalesce=coalesce_reads, freshness=freshness_ms / 1000.0, wire_log=wire_log)
+        self.session = session
+        self.token_cache = TokenInfoCache(self.base_url, session=self.session, ttl=token_cache_ttl)
+
+        self._owns_signing_executor = isinstance(signing_executor, str)
+        if self._owns_signing_executor:
+            signing_executor = get_signing_executor(signing_executor)
+        self.signing_executor = signing_executor
+        self.response_validator = ResponseValidator(validation_sample_rate) if validate_responses else None
+        self.market_data = MarketDataStore(cache_dir, self.base_url, session=self.session) if cache_dir else None
+        self.clock = ExchangeClock(self.base_url, session=self.session) if sync_clock else None
+        self.instrumentation = Instrumentation(hooks)
+        self.tracer = tracer
+        self.signer_cache = SignerCache() if cache_signers else None
+
+    def close(self):
+        """Close the underlying session and release all the pooled connections."""
+        self.session.close()
+        if self._owns_signing_executor:
+            self.signing_executor.shutdown()
+
+    def _validate(self, endpoint, json_obj):
+        """Check a parsed response against the schema of its end point when validation is enabled."""
+        if self.response_validator is not None:
+            self.response_validator.validate(endpoint, json_obj)
+        return json_obj
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @instrumented
     def get_candle_sticks(self, pair, start_time, end_time, interval):
         """Get candlestick chart data filtered by url parameters.
 
@@ -64,9 +146,33 @@ class SwitcheoApi(object):
             pair=pair,
             start_time=start_time,
             end_time=end_time,
-            interval=interval
+            interval=interval,
+            session=self.session,
         )
 
+    @instrumented
+    def get_candle_sticks_array(self, pair, start_time, end_time, interval, fixed8=False):
+        """Get candlestick chart data of any time range parsed into typed columns.
+
+        Long ranges are split in chunks within the limits of the server, fetched concurrently over
+        the pooled session and stitched back together. With a cache_dir the closed chunks are read from disk.
+
+        Args:
+            pair (str)	       : Show chart data of this trading pair
+            start_time (int)   : Start of time range for data in epoch seconds
+            end_time (int)	   : End of time range for data in epoch seconds
+            interval (int)	   : Candlestick period in minutes Possible values are: 1, 5, 30, 60, 360, 1440
+            fixed8 (bool)      : Whether to return the prices as int64 Fixed8 units instead of float64.
+
+        Returns:
+            CandleSticks namedtuple with one int64 or float64 column (numpy array if installed) per field.
+        """
+        if self.market_data is not None:
+            return self.market_data.get_candle_sticks(pair, start_time, end_time, interval, fixed8=fixed8)
+        return tickers._get_candle_sticks_array(self.base_url, pair, start_time, end_time, interval, fixed8=fixed8,
+                                                session=self.session)
+
+    @instrumented
     def list_contracts(self):
         """Fetch updated hashes of contracts deployed by Switcheo.
 
@@ -83,8 +189,9 @@ class SwitcheoApi(object):
               }
             }
         """
-        return exchange._list_contracts(self.base_url)
+        return exchange._list_contracts(self.base_url, session=self.session)
 
+    @instrumented
     def list_pairs(self, bases):
         """Fetch available currency pairs on Switcheo Exchange filtered by the base parameter. Defaults to all pairs.
 
@@ -101,8 +208,9 @@ class SwitcheoApi(object):
               "SWTH_NEO"
             ]
         """
-        exchange._list_currency_pairs(self.base_url, bases)
+        return exchange._list_currency_pairs(self.base_url, bases, session=self.session)
 
+    @instrumented
     def get_exchange_timestamp(self):
         """Returns the current timestamp in the exchange.
 
@@ -119,8 +227,9 @@ class SwitcheoApi(object):
               "timestamp": 1534392760908
             }
         """
-        return exchange._get_exchange_timestamp(self.base_url)
+        return exchange._get_exchange_timestamp(self.base_url, session=self.session)
 
+    @instrumented
     def get_contract_tokens_info(self):
         """Fetch updated hashes of contracts deployed by Switcheo along with their precision.
 
@@ -147,8 +256,9 @@ class SwitcheoApi(object):
               ...
             }
         """
-        return exchange._get_contract_tokens_info(self.base_url)
+        return exchange._get_contract_tokens_info(self.base_url, session=self.session)
 
+    @instrumented
     def list_balances(self, addresses, contract_hashes):
         """List contract balances of the given address and contract hashes.
 
@@ -186,8 +296,9 @@ class SwitcheoApi(object):
         """
         assert isinstance(addresses, list), "addresses should be a list object for eg. {}".format([addresses])
         assert isinstance(contract_hashes, list), "contract_hashes should be a list object for eg. [contract_hashes]"
-        return balances._list_balances(self.base_url, addresses, contract_hashes)
+        return balances._list_balances(self.base_url, addresses, contract_hashes, session=self.session)
 
+    @instrumented
     def list_trades(self, contract_hash, pair, from_time=None, to_time=None, limit=None):
         """Retrieve trades that have already occurred on Switcheo Exchange filtered by the request parameters.
 
@@ -220,9 +331,52 @@ class SwitcheoApi(object):
               ...
             ]
         """
-        return trades._list_trades(base_url=self.base_url, contract_hash=contract_hash, pair=pair,
-                                   from_time=from_time, to_time=to_time, limit=limit)
+        trades_resp = trades._list_trades(base_url=self.base_url, contract_hash=contract_hash, pair=pair,
+                                          from_time=from_time, to_time=to_time, limit=limit, session=self.session)
+        if self.response_validator is not None:
+            self.response_validator.validate_response("list_trades", trades_resp)
+        return trades_resp
+
+    def iter_trades(self, contract_hash, pair, start=None, end=None, page_size=trades.MAX_TRADES_PAGE,
+                    prefetch=False):
+        """Lazily iterate over all the trades of a time range, paging through list_trades.
 
+        Trades are yielded newest first and the ones repeated at page boundaries are skipped.
+
+        Args:
+            contract_hash (str) : Only return trades for this contract hash.
+            pair (str)          : Only return trades for this pair.
+            start (int)         : Only return trades after this time in epoch seconds.
+            end (int)           : Only return trades before this time in epoch seconds.
+            page_size (int)     : Number of trades to request per call (min: 1, max: 10000).
+            prefetch (bool)     : Whether to fetch the next page in the background while the current one is consumed.
+
+        Returns:
+            generator of trade dicts, see list_trades for an example.
+        """
+        return trades._iter_trades(self.base_url, contract_hash, pair, start=start, end=end, page_size=page_size,
+                                   prefetch=prefetch, session=self.session)
+
+    @instrumented
+    def get_trades_array(self, contract_hash, pair, start, end):
+        """Get all the trades of a time range parsed into typed columns, oldest first.
+
+        With a cache_dir the trades of closed hours are read from disk and only the missing ones are fetched.
+
+        Args:
+            contract_hash (str) : Only return trades for this contract hash.
+            pair (str)          : Only return trades for this pair.
+            start (int)         : Only return trades at or after this time in epoch seconds.
+            end (int)           : Only return trades before this time in epoch seconds.
+
+        Returns:
+            TradeColumns namedtuple with the ids and one int64 or int8 column (numpy array if installed) per field.
+        """
+        if self.market_data is not None:
+            return self.market_data.get_trades(contract_hash, pair, start, end)
+        return trades._get_trades_array(self.base_url, contract_hash, pair, start, end, session=self.session)
+
+    @instrumented
     def deposit(self, priv_key_wif, asset_id, amount, contract_hash, blockchain="NEO"):
         """This api creates a deposit of provided asset on smart-contract.
 
@@ -230,7 +384,7 @@ class SwitcheoApi(object):
         This method performs two tasks 1. Creates a deposit on smart-contract 2. Executes it.
 
         Args:
-            priv_key_wif (str)  : The private key wif of the user.
+            priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
             asset_id (str)      : The asset symbol or ID to deposit. for eg. SWTH
             amount (int)        : Amount of tokens to deposit.
             contract_hash (str) : Switcheo Exchange contract hash to execute the deposit on.
@@ -239,12 +393,16 @@ class SwitcheoApi(object):
         Returns:
             If response from the server is HTTP_OK (200) then this returns the requests.response object
         """
+        priv_key_wif = as_signer(priv_key_wif, cache=self.signer_cache)
         deposits_resp = deposits._create_deposit(base_url=self.base_url, priv_key_wif=priv_key_wif,
                                                  asset_id=asset_id, amount=amount, contract_hash=contract_hash,
-                                                 blockchain=blockchain)
-        return deposits._execute_deposit(base_url=self.base_url,
-                                         deposit=response_to_json(deposits_resp), priv_key_wif=priv_key_wif,)
+                                                 blockchain=blockchain, session=self.session,
+                                                 token_cache=self.token_cache, clock=self.clock)
+        deposit = self._validate("create_deposit", response_to_json(deposits_resp))
+        return deposits._execute_deposit(base_url=self.base_url, deposit=deposit,
+                                         priv_key_wif=priv_key_wif, session=self.session)
 
+    @instrumented
     def list_offers(self, blockchain, pair, contract_hash):
         """Retrieves the best 70 offers (per side) on the offer book.
 
@@ -268,8 +426,9 @@ class SwitcheoApi(object):
                 }
             ]
         """
-        return offers._list_offers(self.base_url, blockchain, pair, contract_hash)
+        return offers._list_offers(self.base_url, blockchain, pair, contract_hash, session=self.session)
 
+    @instrumented
     def list_orders(self, address, contract_hash, pair=None):
         """Retrieves the best 70 offers (per side) on the offer book.
 
@@ -305,8 +464,9 @@ class SwitcheoApi(object):
               }
             ]
         """
-        return orders._list_orders(self.base_url, address, contract_hash, pair=None)
+        return orders._list_orders(self.base_url, address, contract_hash, pair=pair, session=self.session)
 
+    @instrumented
     def create_order(self, priv_key_wif, pair, side, price, want_amount, asset_id,
                      use_native_tokens, contract_hash, blockchain="neo", order_type='limit'):
         """Create an order on SWTH DEX.
@@ -321,7 +481,7 @@ class SwitcheoApi(object):
 
         Args:
             base_url (str)           : This paramter governs whether to connect to test or mainnet.
-            priv_key_wif (str)       : The private key wif of the user.
+            priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
             pair (str)               : The pair to buy or sell on.
             blockchain (str)         : Blockchain that the pair is on. Possible values are: neo.
             side (str)               : Whether to buy or sell on this pair. Possible values are: buy, sell.
@@ -335,16 +495,40 @@ class SwitcheoApi(object):
         Returns:
             If response from the server is HTTP_OK (200) then this returns the requests.response object
         """
+        priv_key_wif = as_signer(priv_key_wif, cache=self.signer_cache)
         orders_response = orders._create_order(base_url=self.base_url, priv_key_wif=priv_key_wif, pair=pair,
                                                blockchain=blockchain, side=side, price=price, want_amount=want_amount,
                                                use_native_tokens=use_native_tokens, asset_id=asset_id,
                                                order_type=order_type, contract_hash=contract_hash,
-                                               )
+                                               session=self.session, token_cache=self.token_cache, clock=self.clock)
+
+        orders_json_resp = self._validate("create_order", response_to_json(orders_response))
 
-        orders_json_resp = response_to_json(orders_response)
+        return orders._execute_order(base_url=self.base_url, order=orders_json_resp, priv_key_wif=priv_key_wif,
+                                     session=self.session, executor=self.signing_executor)
 
-        return orders._execute_order(base_url=self.base_url, order=orders_json_resp, priv_key_wif=priv_key_wif,)
+    @instrumented
+    def create_orders(self, priv_key_wif, orders, max_workers=None):
+        """Create and execute a batch of orders concurrently.
+
+        All the create payloads are signed up front and sent concurrently, each order is then signed and
+        broadcast as soon as its own create response arrives. A failing order does not stop the others.
+
+        Args:
+            priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+            orders (list[dict])       : Keyword arguments of create_order for every order, except priv_key_wif.
+                                        blockchain and order_type default to neo and limit.
+            max_workers (int)         : Number of orders in flight at the same time, defaults to pool_size.
+
+        Returns:
+            list of pyswitcheo.batch.OrderResult(order, response, error), in the order of the batch.
+        """
+        priv_key_wif = as_signer(priv_key_wif, cache=self.signer_cache)
+        return batch._create_orders(self.base_url, priv_key_wif, orders, max_workers or self.pool_size,
+                                    session=self.session, token_cache=self.token_cache,
+                                    executor=self.signing_executor, validate=self._validate, clock=self.clock)
 
+    @instrumented
     def withdraw(self, priv_key_wif, asset_id, amount, contract_hash, blockchain="NEO"):
         """Withdraw your balanaces from Switcheo smart contract balance.
 
@@ -354,7 +538,7 @@ class SwitcheoApi(object):
         A signature of the request payload has to be provided for this API call.
 
         Args:
-            priv_key_wif (str)      : The private key wif of the user.
+            priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
             asset_id (str)          : The asset symbol or ID to withdraw. for eg. SWTH
             amount (int)            : Amount of tokens to withdraw.
             contract_hash (str)     : Switcheo Exchange contract hash to execute the withdraw on.
@@ -368,15 +552,21 @@ class SwitcheoApi(object):
             }
 
         """
+        priv_key_wif = as_signer(priv_key_wif, cache=self.signer_cache)
         withdrawals_response = withdrawals._create_withdrawal(base_url=self.base_url, asset_id=asset_id,
                                                               contract_hash=contract_hash, amount=amount,
-                                                              priv_key_wif=priv_key_wif, blockchain=blockchain)
-        withdrawals_response_json_obj = response_to_json(withdrawals_response)
+                                                              priv_key_wif=priv_key_wif, blockchain=blockchain,
+                                                              session=self.session, token_cache=self.token_cache,
+                                                              clock=self.clock)
+        withdrawals_response_json_obj = self._validate("create_withdrawal", response_to_json(withdrawals_response))
         # Now lets execute withdrawal
         return withdrawals._execute_withdrawal(base_url=self.base_url,
                                                withdrawal=withdrawals_response_json_obj,
-                                               priv_key_wif=priv_key_wif)
+                                               priv_key_wif=priv_key_wif,
+                                               session=self.session,
+                                               clock=self.clock)
 
+    @instrumented
     def create_cancellation(self, order_id, priv_key_wif):
         """This API is responsible for order cancellation.
 
@@ -384,10 +574,50 @@ class SwitcheoApi(object):
 
         Args:
             order_id (str) : The order id which needs to be cancelled.
+            priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
         Returns:
             If response from the server is HTTP_OK (200) then this returns the requests.response object
 
         """
-        cancellation_response = orders._create_cancellation(self.base_url, order_id, priv_key_wif)
+        priv_key_wif = as_signer(priv_key_wif, cache=self.signer_cache)
+        cancellation_response = orders._create_cancellation(self.base_url, order_id, priv_key_wif,
+                                                            session=self.session, clock=self.clock)
         cancellation_resp_json = response_to_json(cancellation_response)
-        return orders._execute_cancellation(self.base_url, cancellation_resp_json, priv_key_wif)
+        return orders._execute_cancellation(self.base_url, cancellation_resp_json, priv_key_wif,
+                                            session=self.session)
+
+    @instrumented
+    def cancel_orders(self, order_ids, priv_key_wif, max_workers=None):
+        """Cancel several orders concurrently.
+
+        All the create cancellation payloads are signed up front and sent concurrently, each cancellation
+        is then signed and broadcast as soon as its own create response arrives.
+
+        Args:
+            order_ids (list[str])     : The ids of the orders which need to be cancelled.
+            priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+            max_workers (int)         : Number of cancellations in flight at the same time, defaults to pool_size.
+        Returns:
+            list of pyswitcheo.batch.CancellationResult(order_id, response, error), in the order of order_ids.
+        """
+        priv_key_wif = as_signer(priv_key_wif, cache=self.signer_cache)
+        return batch._cancel_orders(self.base_url, order_ids, priv_key_wif, max_workers or self.pool_size,
+                                    session=self.session, clock=self.clock)
+
+    @instrumented
+    def cancel_all(self, priv_key_wif, contract_hash, pair=None, max_workers=None):
+        """Cancel every open order of the account.
+
+        All the pages of open orders are listed for the address of priv_key_wif and cancelled with cancel_orders.
+
+        Args:
+            priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+            contract_hash (str)       : Only cancel the orders made on this contract hash.
+            pair (str)                : Only cancel the orders of this pair. (optional)
+            max_workers (int)         : Number of cancellations in flight at the same time, defaults to pool_size.
+        Returns:
+            list of pyswitcheo.batch.CancellationResult(order_id, response, error).
+        """
+        priv_key_wif = as_signer(priv_key_wif, cache=self.signer_cache)
+        return batch._cancel_all(self.base_url, priv_key_wif, contract_hash, max_workers or self.pool_size,
+                                 pair=pair, session=self.session, clock=self.clock)
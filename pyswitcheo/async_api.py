@@ -0,0 +1,177 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Asyncio implementation of the pyswitcheo API."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.internal.api import trades
+from pyswitcheo.session import DEFAULT_POOL_SIZE
+
+# Number of worker threads, and so of calls in flight, of an AsyncSwitcheoApi by default.
+DEFAULT_MAX_WORKERS = 32
+
+# asyncio.get_running_loop was added in Python 3.7.
+_get_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+class AsyncSwitcheoApi(object):
+    """Asyncio flavour of SwitcheoApi exposing the same methods as coroutines.
+
+    This client is thread-backed: every coroutine runs the matching blocking SwitcheoApi call on a worker
+    thread, so at most max_workers calls are in flight at once and the others wait for a free thread.
+    All the calls share a single keep-alive session and the signing/serialization code of the synchronous
+    client. Keep pool_size close to max_workers, the connections opened above pool_size are not kept alive.
+    """
+
+    def __init__(self, base_url, api_version="v2", pool_size=DEFAULT_POOL_SIZE, executor=None,
+                 max_workers=DEFAULT_MAX_WORKERS, **kwargs):
+        """Initialize AsyncApi class instances.
+
+        Args:
+            base_url(str)    : Base url represents the endpoint to query the Switcheo API server.
+            api_version(str) : An optional api version which could change in future
+            pool_size(int)   : Number of keep-alive connections of the pooled session.
+            executor(concurrent.futures.Executor) : An optional executor to run the blocking calls on.
+            max_workers(int) : Number of worker threads, i.e. of concurrent calls, when no executor is given.
+            kwargs           : Any other keyword argument accepted by SwitcheoApi, for eg. session.
+        """
+        self.api = SwitcheoApi(base_url=base_url, api_version=api_version, pool_size=pool_size, **kwargs)
+        self._owns_executor = executor is None
+        self._executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_workers)
+
+    @property
+    def base_url(self):
+        """Return the base url of the underlying synchronous client."""
+        return self.api.base_url
+
+    @property
+    def token_cache(self):
+        """Return the token metadata cache shared with the synchronous client."""
+        return self.api.token_cache
+
+    @property
+    def session(self):
+        """Return the pooled session shared by all the calls."""
+        return self.api.session
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking call on the executor and wait for its result."""
+        loop = _get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def close(self):
+        """Close the underlying session and shut down the executor if it is owned by this client."""
+        self.api.close()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def get_candle_sticks(self, pair, start_time, end_time, interval):
+        """Get candlestick chart data filtered by url parameters. See SwitcheoApi.get_candle_sticks."""
+        return await self._run(self.api.get_candle_sticks, pair=pair, start_time=start_time,
+                               end_time=end_time, interval=interval)
+
+    async def get_candle_sticks_array(self, pair, start_time, end_time, interval, fixed8=False):
+        """Get candlestick chart data parsed into typed columns. See SwitcheoApi.get_candle_sticks_array."""
+        return await self._run(self.api.get_candle_sticks_array, pair=pair, start_time=start_time,
+                               end_time=end_time, interval=interval, fixed8=fixed8)
+
+    async def list_contracts(self):
+        """Fetch updated hashes of contracts deployed by Switcheo. See SwitcheoApi.list_contracts."""
+        return await self._run(self.api.list_contracts)
+
+    async def list_pairs(self, bases):
+        """Fetch available currency pairs on Switcheo Exchange. See SwitcheoApi.list_pairs."""
+        return await self._run(self.api.list_pairs, bases)
+
+    async def get_exchange_timestamp(self):
+        """Returns the current timestamp in the exchange. See SwitcheoApi.get_exchange_timestamp."""
+        return await self._run(self.api.get_exchange_timestamp)
+
+    async def get_contract_tokens_info(self):
+        """Fetch contract hashes of tokens along with their precision. See SwitcheoApi.get_contract_tokens_info."""
+        return await self._run(self.api.get_contract_tokens_info)
+
+    async def list_balances(self, addresses, contract_hashes):
+        """List contract balances of the given address and contract hashes. See SwitcheoApi.list_balances."""
+        return await self._run(self.api.list_balances, addresses, contract_hashes)
+
+    async def list_trades(self, contract_hash, pair, from_time=None, to_time=None, limit=None):
+        """Retrieve trades that have already occurred on Switcheo Exchange. See SwitcheoApi.list_trades."""
+        return await self._run(self.api.list_trades, contract_hash, pair, from_time=from_time,
+                               to_time=to_time, limit=limit)
+
+    async def get_trades_array(self, contract_hash, pair, start, end):
+        """Get all the trades of a time range parsed into typed columns. See SwitcheoApi.get_trades_array."""
+        return await self._run(self.api.get_trades_array, contract_hash, pair, start, end)
+
+    async def iter_trades(self, contract_hash, pair, start=None, end=None, page_size=trades.MAX_TRADES_PAGE):
+        """Asynchronously iterate over all the trades of a time range. See SwitcheoApi.iter_trades.
+
+        Every page is fetched on the executor, the trades of a page are then yielded without blocking.
+        """
+        pages = trades._iter_trade_pages(self.base_url, contract_hash, pair, start=start, end=end,
+                                         page_size=page_size, session=self.session)
+        pending = None
+        try:
+            while True:
+                pending = self._executor.submit(next, pages, None)
+                page = await asyncio.wrap_future(pending)
+                if page is None:
+                    break
+                for trade in page:
+                    yield trade
+        finally:
+            # When cancelled while a worker thread is still fetching a page, the pages generator is running
+            # and can only be closed once that page is received.
+            if pending is not None and not pending.done():
+                await asyncio.wait([asyncio.wrap_future(pending)])
+            pages.close()
+
+    async def deposit(self, priv_key_wif, asset_id, amount, contract_hash, blockchain="NEO"):
+        """Create and execute a deposit of provided asset on smart-contract. See SwitcheoApi.deposit."""
+        return await self._run(self.api.deposit, priv_key_wif, asset_id, amount, contract_hash,
+                               blockchain=blockchain)
+
+    async def list_offers(self, blockchain, pair, contract_hash):
+        """Retrieves the best 70 offers (per side) on the offer book. See SwitcheoApi.list_offers."""
+        return await self._run(self.api.list_offers, blockchain, pair, contract_hash)
+
+    async def list_orders(self, address, contract_hash, pair=None):
+        """Retrieves orders made by an address. See SwitcheoApi.list_orders."""
+        return await self._run(self.api.list_orders, address, contract_hash, pair=pair)
+
+    async def create_order(self, priv_key_wif, pair, side, price, want_amount, asset_id,
+                           use_native_tokens, contract_hash, blockchain="neo", order_type='limit'):
+        """Create and execute an order on SWTH DEX. See SwitcheoApi.create_order."""
+        return await self._run(self.api.create_order, priv_key_wif, pair, side, price, want_amount, asset_id,
+                               use_native_tokens, contract_hash, blockchain=blockchain, order_type=order_type)
+
+    async def create_orders(self, priv_key_wif, orders, max_workers=None):
+        """Create and execute a batch of orders concurrently. See SwitcheoApi.create_orders."""
+        return await self._run(self.api.create_orders, priv_key_wif, orders, max_workers=max_workers)
+
+    async def withdraw(self, priv_key_wif, asset_id, amount, contract_hash, blockchain="NEO"):
+        """Withdraw your balanaces from Switcheo smart contract balance. See SwitcheoApi.withdraw."""
+        return await self._run(self.api.withdraw, priv_key_wif, asset_id, amount, contract_hash,
+                               blockchain=blockchain)
+
+    async def create_cancellation(self, order_id, priv_key_wif):
+        """Create and execute an order cancellation. See SwitcheoApi.create_cancellation."""
+        return await self._run(self.api.create_cancellation, order_id, priv_key_wif)
+
+    async def cancel_orders(self, order_ids, priv_key_wif, max_workers=None):
+        """Cancel several orders concurrently. See SwitcheoApi.cancel_orders."""
+        return await self._run(self.api.cancel_orders, order_ids, priv_key_wif, max_workers=max_workers)
+
+    async def cancel_all(self, priv_key_wif, contract_hash, pair=None, max_workers=None):
+        """Cancel every open order of the account. See SwitcheoApi.cancel_all."""
+        return await self._run(self.api.cancel_all, priv_key_wif, contract_hash, pair=pair,
+                               max_workers=max_workers)
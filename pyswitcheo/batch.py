@@ -0,0 +1,178 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Pipelined execution of batches of orders and cancellations.
+
+Every order of a batch goes through its own create -> sign -> broadcast pipeline on a worker thread,
+so the round trips of different orders overlap and one failing order does not stop the others.
+"""
+
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pyswitcheo import instrumentation
+from pyswitcheo import utils
+from pyswitcheo.internal.api import orders
+from pyswitcheo.signer import as_signer
+
+logger = logging.getLogger(__name__)
+
+# Default values of the optional fields of an order of a batch.
+ORDER_DEFAULTS = {"blockchain": "neo", "order_type": "limit"}
+
+
+class OrderResult(namedtuple("OrderResult", ["order", "response", "error"])):
+    """Outcome of one order of a batch: the broadcast response, or the exception which stopped it."""
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        """Return True if the order was created and broadcast."""
+        return self.error is None
+
+
+class CancellationResult(namedtuple("CancellationResult", ["order_id", "response", "error"])):
+    """Outcome of one cancellation of a batch: the broadcast response, or the exception which stopped it."""
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        """Return True if the cancellation was created and broadcast."""
+        return self.error is None
+
+
+def _run_pipelines(pipeline, items, max_workers):
+    """Run pipeline(item) for every item on a thread pool, returning the results in order."""
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+        return list(pool.map(instrumentation.bind_context(pipeline), items))
+
+
+def _create_orders(base_url, priv_key_wif, batch, max_workers, session=None, token_cache=None, executor=None,
+                   validate=None, clock=None):
+    """Create and execute a batch of orders, pipelining the orders across worker threads.
+
+    All the create payloads are signed up front. The create requests are then sent concurrently and the
+    fills and makes of each order are signed and broadcast as soon as its own create response arrives.
+
+    Args:
+        base_url (str)         : This paramter governs whether to connect to test or mainnet.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        batch (list[dict])     : The orders, each one holding the keyword arguments of SwitcheoApi.create_order
+                                 except priv_key_wif, for eg. {"pair": "SWTH_NEO", "side": "buy", ...}
+        max_workers (int)      : Number of orders in flight at the same time.
+        session (requests.Session) : Optional pooled session to send the requests with.
+        token_cache (TokenInfoCache) : Optional cache of the exchange token metadata.
+        executor (concurrent.futures.Executor) : Optional executor used to sign the fills and makes.
+        validate (callable)    : Optional callable(endpoint, json_obj) checking the create responses.
+        clock (ExchangeClock)  : Optional clock synchronized with the exchange to timestamp the payloads.
+    Returns:
+        list of OrderResult, in the order of the batch.
+    """
+    signer = as_signer(priv_key_wif)
+    timestamp = utils.get_current_epoch_milli(clock=clock)
+
+    signed = []
+    for index, order in enumerate(batch):
+        try:
+            kwargs = {**ORDER_DEFAULTS, **order}
+            # The timestamp is the nonce of the order, keep it unique within the batch.
+            signed.append((order, orders._sign_order_params(base_url, signer, session=session,
+                                                            token_cache=token_cache, timestamp=timestamp + index,
+                                                            **kwargs), None))
+        except Exception as exc:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Failed to sign order {0}: {1!r}".format(index, exc))
+            signed.append((order, None, exc))
+
+    def pipeline(item):
+        order, params, error = item
+        if error is not None:
+            return OrderResult(order, None, error)
+        try:
+            created = utils.response_to_json(orders._send_order(base_url, params, session=session))
+            if validate is not None:
+                validate("create_order", created)
+            response = orders._execute_order(base_url, created, signer, session=session, executor=executor)
+        except Exception as exc:
+            return OrderResult(order, None, exc)
+        return OrderResult(order, response, None)
+
+    return _run_pipelines(pipeline, signed, max_workers)
+
+
+def _cancel_orders(base_url, order_ids, priv_key_wif, max_workers, session=None, clock=None):
+    """Create and execute the cancellations of several orders, pipelining them across worker threads.
+
+    The key material is derived once and all the create payloads are signed up front, every cancellation
+    transaction is then signed and broadcast as soon as its own create response arrives.
+
+    Args:
+        base_url (str)         : This paramter governs whether to connect to test or mainnet.
+        order_ids (list[str])  : The ids of the orders which need to be cancelled.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        max_workers (int)      : Number of cancellations in flight at the same time.
+        session (requests.Session) : Optional pooled session to send the requests with.
+        clock (ExchangeClock)  : Optional clock synchronized with the exchange to timestamp the payloads.
+    Returns:
+        list of CancellationResult, in the order of order_ids.
+    """
+    signer = as_signer(priv_key_wif)
+    timestamp = utils.get_current_epoch_milli(clock=clock)
+    # The timestamp is the nonce of the cancellation, keep it unique within the batch.
+    signed = [(order_id, orders._sign_cancellation_params(order_id, signer, timestamp=timestamp + index))
+              for index, order_id in enumerate(order_ids)]
+
+    def pipeline(item):
+        order_id, params = item
+        try:
+            cancellation = utils.response_to_json(orders._send_cancellation(base_url, params, session=session))
+            response = orders._execute_cancellation(base_url, cancellation, signer, session=session)
+        except Exception as exc:
+            return CancellationResult(order_id, None, exc)
+        return CancellationResult(order_id, response, None)
+
+    return _run_pipelines(pipeline, signed, max_workers)
+
+
+def _is_cancellable(order):
+    """Return False if the exchange reports the order with a status other than open.
+
+    The orders are listed with the open status filter already, an order without a status is trusted to be open.
+    """
+    return order.get("order_status", "open") == "open"
+
+
+def _list_open_orders(base_url, address, contract_hash, pair=None, session=None, page_size=orders.MAX_ORDERS_PAGE):
+    """Return every open order of an address, paging through the list orders end point until it is exhausted."""
+    open_orders, before_id = [], None
+    while True:
+        page = utils.response_to_json(orders._list_orders(base_url, address, contract_hash, pair=pair,
+                                                          session=session, order_status="open",
+                                                          before_id=before_id, limit=page_size))
+        open_orders.extend(page)
+        if len(page) < page_size:
+            return open_orders
+        before_id = page[-1]["id"]
+
+
+def _cancel_all(base_url, priv_key_wif, contract_hash, max_workers, pair=None, session=None, clock=None):
+    """Cancel every open order of the account of priv_key_wif.
+
+    Args:
+        base_url (str)         : This paramter governs whether to connect to test or mainnet.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        contract_hash (str)    : Only cancel the orders made on this contract hash.
+        max_workers (int)      : Number of cancellations in flight at the same time.
+        pair (str)             : Only cancel the orders of this pair. (optional)
+        session (requests.Session) : Optional pooled session to send the requests with.
+        clock (ExchangeClock)  : Optional clock synchronized with the exchange to timestamp the payloads.
+    Returns:
+        list of CancellationResult, one per open order.
+    """
+    signer = as_signer(priv_key_wif)
+    open_orders = _list_open_orders(base_url, signer.address, contract_hash, pair=pair, session=session)
+    order_ids = [order["id"] for order in open_orders if _is_cancellable(order)]
+    return _cancel_orders(base_url, order_ids, signer, max_workers, session=session, clock=clock)
@@ -0,0 +1,88 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Columnar representation of the candlestick chart data.
+
+The columns are numpy arrays when numpy is installed (pip install pyswitcheo[numpy]), array.array
+objects otherwise. Both expose the buffer protocol, so numpy.frombuffer can wrap the latter without a copy.
+"""
+
+from array import array
+from collections import namedtuple
+from pyswitcheo.datatypes.fixed8 import FIXED8_SCALE, to_fixed8_array
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Fields of a candle as returned by the candlesticks end point.
+CANDLE_FIELDS = ("time", "open", "close", "high", "low", "volume", "quote_volume")
+PRICE_FIELDS = ("open", "close", "high", "low")
+
+# numpy dtype names of the array.array type codes used for the columns.
+_NUMPY_TYPES = {"q": "int64", "d": "float64", "b": "int8"}
+
+# One column per field of the candles, sorted by time.
+CandleSticks = namedtuple("CandleSticks", CANDLE_FIELDS)
+
+
+def _column(typecode, values):
+    """Build an int64 (q), float64 (d) or int8 (b) column from an array of values."""
+    col = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+    if numpy is not None:
+        return numpy.frombuffer(col, dtype=_NUMPY_TYPES[typecode])
+    return col
+
+
+def candles_to_columns(candles, fixed8=False):
+    """Parse the candles returned by the candlesticks end point into typed columns.
+
+    Args:
+        candles (list[dict]) : Candles whose fields are all strings, sorted by time.
+        fixed8 (bool)        : Whether to return the prices as int64 Fixed8 units instead of float64.
+    Returns:
+        CandleSticks object of int64 time, float64 or int64 prices and float64 volumes.
+    """
+    columns = {"time": _column("q", [int(candle["time"]) for candle in candles])}
+    for field in PRICE_FIELDS:
+        values = [candle[field] for candle in candles]
+        columns[field] = _column("q", to_fixed8_array(values)) if fixed8 else _column("d", map(float, values))
+    for field in ("volume", "quote_volume"):
+        columns[field] = _column("d", map(float, (candle[field] for candle in candles)))
+    return CandleSticks(**columns)
+
+
+def candles_to_arrays(candles):
+    """Parse candles into array.array columns with the prices as int64 Fixed8 units.
+
+    This is the exact representation used to persist the candles, see pyswitcheo.store.
+
+    Args:
+        candles (list[dict]) : Candles whose fields are all strings, sorted by time.
+    Returns:
+        dict of field name to array.array
+    """
+    arrays = {"time": array("q", [int(candle["time"]) for candle in candles])}
+    for field in PRICE_FIELDS:
+        arrays[field] = to_fixed8_array([candle[field] for candle in candles])
+    for field in ("volume", "quote_volume"):
+        arrays[field] = array("d", [float(candle[field]) for candle in candles])
+    return arrays
+
+
+def arrays_to_columns(arrays, fixed8=False):
+    """Convert the columns built by candles_to_arrays to a CandleSticks object.
+
+    Args:
+        arrays (dict)  : Field name to array.array, prices in Fixed8 units.
+        fixed8 (bool)  : Whether to keep the prices as int64 Fixed8 units instead of float64.
+    Returns:
+        CandleSticks object
+    """
+    columns = {}
+    for field in CANDLE_FIELDS:
+        col = arrays[field]
+        if field in PRICE_FIELDS and not fixed8:
+            col = array("d", [value / FIXED8_SCALE for value in col])
+        columns[field] = _column(col.typecode, col)
+    return CandleSticks(**columns)
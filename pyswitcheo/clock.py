@@ -0,0 +1,112 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Local estimate of the exchange clock, used to timestamp the signed payloads."""
+
+import time
+import logging
+import threading
+from pyswitcheo import utils
+from pyswitcheo.internal.api import exchange
+
+logger = logging.getLogger(__name__)
+
+# Number of seconds after which the offset is estimated again.
+DEFAULT_RESYNC_INTERVAL = 300
+
+# Number of timestamp requests sent per synchronization, the one with the lowest round trip wins.
+DEFAULT_SYNC_SAMPLES = 3
+
+
+class ExchangeClock(object):
+    """Estimates the offset between the local clock and the exchange clock, NTP style.
+
+    Every sample records the local time t0 before asking the exchange for its timestamp and t1 once the
+    answer arrives. Assuming a symmetric path, the exchange timestamp corresponds to the local time
+    (t0 + t1) / 2, so offset = server - (t0 + t1) / 2 with an error bounded by half the round trip t1 - t0.
+    The sample with the lowest round trip is kept.
+
+    now_millis() only reads the local clock and adds the offset. Once the estimate is older than
+    resync_interval a background thread refreshes it, so signing never waits for the network except
+    for the very first synchronization.
+    """
+
+    def __init__(self, base_url, session=None, resync_interval=DEFAULT_RESYNC_INTERVAL, samples=DEFAULT_SYNC_SAMPLES):
+        """Initialize the clock, no request is sent until the first timestamp is needed.
+
+        Args:
+            base_url (str)             : This paramter governs whether to connect to test or mainnet.
+            session (requests.Session) : Optional pooled session to send the requests with.
+            resync_interval (float)    : Seconds after which the offset is estimated again. None never resyncs.
+            samples (int)              : Number of timestamp requests per synchronization.
+        """
+        self.base_url = base_url
+        self.session = session
+        self.resync_interval = resync_interval
+        self.samples = samples
+        self.offset = None
+        self.rtt = None
+        self._synced_at = None
+        self._lock = threading.Lock()
+        self._first_sync_lock = threading.Lock()
+        self._syncing = False
+
+    def _sample(self):
+        """Return (offset, rtt) in milliseconds measured with one timestamp request."""
+        t0 = time.time() * 1000
+        resp = exchange._get_exchange_timestamp(self.base_url, session=self.session)
+        t1 = time.time() * 1000
+        server = utils.response_to_json(resp)["timestamp"]
+        return server - (t0 + t1) / 2, t1 - t0
+
+    def sync(self):
+        """Estimate the offset to the exchange clock now.
+
+        Returns:
+            (float) offset in milliseconds to add to the local time.
+        """
+        try:
+            offset, rtt = min((self._sample() for _ in range(self.samples)), key=lambda sample: sample[1])
+            with self._lock:
+                self.offset, self.rtt = offset, rtt
+                self._synced_at = time.monotonic()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Exchange clock offset {0:.1f} ms, rtt {1:.1f} ms".format(offset, rtt))
+            return offset
+        finally:
+            with self._lock:
+                self._syncing = False
+
+    def _resync_in_background(self):
+        with self._lock:
+            if self._syncing:
+                return
+            self._syncing = True
+
+        def run():
+            try:
+                self.sync()
+            except Exception as exc:
+                # Keep the last offset and only try again after another resync_interval.
+                with self._lock:
+                    self._synced_at = time.monotonic()
+                logger.warning("Failed to synchronize with the exchange clock, keeping the last offset: {0!r}".format(
+                    exc))
+
+        threading.Thread(target=run, name="pyswitcheo-clock-sync", daemon=True).start()
+
+    def is_stale(self):
+        """Return True if the offset was never estimated or is older than resync_interval."""
+        if self._synced_at is None:
+            return True
+        return self.resync_interval is not None and time.monotonic() - self._synced_at > self.resync_interval
+
+    def now_millis(self):
+        """Return the current exchange time in epoch milliseconds."""
+        if self.offset is None:
+            # Threads asking for the first timestamp together wait for a single synchronization.
+            with self._first_sync_lock:
+                if self.offset is None:
+                    self.sync()
+        elif self.is_stale():
+            self._resync_in_background()
+        return int(round(time.time() * 1000 + self.offset))
@@ -7,6 +7,7 @@ import string
 import logging
 import base58
 import hashlib
+import functools
 import binascii
 from neocore.KeyPair import KeyPair
 
@@ -15,16 +16,21 @@ logger = logging.getLogger(__name__)
 __HEX_STRING_REGEX_OBJ = re.compile(r"^([0-9A-Fa-f]{2})*$/")
 MAX_TRANSACTION_ATTRIBUTE_SIZE = 65535
 
+# Number of address <-> script hash conversions kept in memory, one per managed wallet is enough.
+ADDRESS_CACHE_SIZE = 4096
+
+# Version byte of the NEO addresses.
+ADDRESS_VERSION = 0x17
+
+_HEX_DIGITS = frozenset(string.hexdigits)
+
 
 def is_hex(input_hex):
     """Check if the passed string is a hex string.
 
     Empty string is always treated as hex.
     """
-    if input_hex == "":
-        return True
-
-    return all(c in set(string.hexdigits) for c in input_hex)
+    return _HEX_DIGITS.issuperset(input_hex)
 
 
 def ensure_hex(input_hex):
@@ -51,6 +57,16 @@ def reverse_hex(input_hex):
     Returns:
         Hex string reversed.
     """
+    if input_hex.islower() or input_hex.isdigit():
+        try:
+            reversed_bytes = bytes.fromhex(input_hex)[::-1]
+        except ValueError:
+            pass
+        else:
+            # fromhex skips whitespace, only trust it if every char was a hex digit.
+            if 2 * len(reversed_bytes) == len(input_hex):
+                return reversed_bytes.hex()
+    # Upper case, odd length or non hex input is reversed pair by pair as is.
     return "".join([input_hex[x: x + 2] for x in range(0, len(input_hex), 2)][::-1])
 
 
@@ -73,17 +89,21 @@ def num_to_hex_string(num, size=1, little_endian=False):
         raise TypeError("size must be a whole integer")
 
     size = size * 2
-    hexstring = hex(num)[2:]
-    hexstr_len = len(hexstring)
+    output = "%x" % num
+    hexstr_len = len(output)
 
-    output = (
-        hexstring if hexstr_len % size == 0 else ("0" * (size) + hexstring)[hexstr_len:]
-    )
+    # Pad to size, a longer string is truncated to its last size digits unless it is a multiple of size.
+    if hexstr_len % size:
+        output = output.rjust(size, "0")[-size:]
     if little_endian:
-        return reverse_hex(output)
+        return bytes.fromhex(output)[::-1].hex()
     return output
 
 
+# Hex strings of the var ints held in a single byte, the length of most arrays.
+_SMALL_VAR_INTS = ["%02x" % num for num in range(0xfd)]
+
+
 def num_to_var_int(num):
     """Convert a number to a variable length Int. Used for array length header.
 
@@ -94,17 +114,18 @@ def num_to_var_int(num):
     Returns:
         (str) hexstring of the variable Int
     """
-    if num < 0xfd:
-        return num_to_hex_string(num)
-    elif num <= 0xffff:
+    if 0 <= num < 0xfd:
+        return _SMALL_VAR_INTS[num]
+    elif 0xfd <= num <= 0xffff:
         # uint16
-        return "fd" + num_to_hex_string(num, 2, True)
-    elif num <= 0xffffffff:
-        # uint32
-        return "fe" + num_to_hex_string(num, 3, True)
-    else:
+        return "fd" + num.to_bytes(2, "little").hex()
+    elif 0xffff < num <= 0xffffffff:
+        # uint32, written on 3 bytes as it always has been.
+        return "fe" + (num & 0xffffff).to_bytes(3, "little").hex()
+    elif num > 0xffffffff:
         # uint64
         return "ff" + num_to_hex_string(num, 8, True)
+    return num_to_hex_string(num)
 
 
 def encode_msg(msg):
@@ -121,13 +142,13 @@ def encode_msg(msg):
         msg = msg.encode("UTF-8")
 
     encoded_msg = binascii.hexlify(msg)
-    length_hex = hex(int(len(encoded_msg) / 2))[2:]
-    logger.debug("Length of hex message {0}".format(length_hex))
+    length_hex = "%x" % len(msg)
 
     encoded_msg = "010001f0{hex_len}{enc_msg}0000".format(
         hex_len=length_hex, enc_msg=encoded_msg.decode()
     )
-    logger.debug("Final message to sign : {0}".format(encoded_msg))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Length of hex message {0}, final message to sign : {1}".format(length_hex, encoded_msg))
     return encoded_msg
 
 
@@ -175,15 +196,19 @@ def get_script_hash_from_wif(wif):
         public key script hash in string format
     """
     pk = KeyPair.PrivateKeyFromWIF(wif)
-    keypair = KeyPair(pk)
-    logger.debug("Public Address is {}".format(keypair.GetAddress()))
-    return get_script_hash_from_address(keypair.GetAddress())
+    address = KeyPair(pk).GetAddress()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Public Address is {}".format(address))
+    return get_script_hash_from_address(address)
 
 
+@functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)
 def get_script_hash_from_address(address):
     """Convert a given address to script hash.
     This code has been taken from:
     https://github.com/CityOfZion/neo-python-core/blob/fcb0837e8f69e6f4dc01f2861b856affd2213446/neocore/bin/cli.py#L23
+
+    The result is cached, so polling the same addresses does not redo the base58 decoding and the checksum.
     """
     data = bytes(base58.b58decode(address))
 
@@ -199,3 +224,40 @@ def get_script_hash_from_address(address):
 
     # Return only the scripthash bytes, reverse it and return hex of it.
     return data[1:-4][::-1].hex()
+
+
+@functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def get_address_from_script_hash(script_hash):
+    """Convert a script hash, as returned by get_script_hash_from_address, back to its address.
+
+    Args:
+        script_hash (str) : script hash in its hex string format.
+    Returns:
+        address in string format
+    """
+    data = bytes([ADDRESS_VERSION]) + bytes.fromhex(script_hash)[::-1]
+    checksum = hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4]
+    address = base58.b58encode(data + checksum)
+    return address.decode("ascii") if isinstance(address, bytes) else address
+
+
+def addresses_to_script_hashes(addresses):
+    """Convert several addresses to their script hashes, each distinct address is only decoded once.
+
+    Args:
+        addresses (list[str]) : addresses to convert.
+    Returns:
+        list of script hashes, in the order of addresses.
+    """
+    return list(map(get_script_hash_from_address, addresses))
+
+
+def script_hashes_to_addresses(script_hashes):
+    """Convert several script hashes to their addresses, each distinct script hash is only encoded once.
+
+    Args:
+        script_hashes (list[str]) : script hashes to convert.
+    Returns:
+        list of addresses, in the order of script_hashes.
+    """
+    return list(map(get_address_from_script_hash, script_hashes))
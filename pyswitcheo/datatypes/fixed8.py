@@ -1,33 +1,186 @@
 # !/usr/bin/env python
 # -*- coding: utf-8 -*-
 """Implementation for custom datatypes to interact with the blockchain."""
+import struct
+import numbers
+import operator
+from array import array
 from decimal import Decimal
-from pyswitcheo.crypto_utils import reverse_hex
+from fractions import Fraction
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Number of units in one Fixed8, i.e. 8 decimal places.
+FIXED8_SCALE = 100000000
+_QUANTIZE = Decimal("1.00000000")
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_INT64_LE = struct.Struct("<q")
+_INT64_BE = struct.Struct(">q")
+
+
+def _to_raw(value):
+    """Convert a number, numeric string, Decimal or Fixed8 to the underlying count of 1e-8 units."""
+    if type(value) is int:
+        raw = value * FIXED8_SCALE
+    elif isinstance(value, Fixed8):
+        return value._raw
+    elif isinstance(value, numbers.Integral):
+        raw = int(value) * FIXED8_SCALE
+    else:
+        # Decimal keeps the exact digits of strings and the exact binary value of floats,
+        # quantize rounds them to 8 decimal places (half to even) without going through a float.
+        raw = int(Decimal(value).quantize(_QUANTIZE).scaleb(8))
+    if not _INT64_MIN <= raw <= _INT64_MAX:
+        raise OverflowError("{0} does not fit in a Fixed8".format(value))
+    return raw
+
 
 class Fixed8(object):
-    """Fixed point representation of a given input number."""
+    """Fixed point representation of a given input number.
+
+    The value is stored as a signed 64 bit count of 1e-8 units, exactly as it is serialized on the NEO blockchain.
+    """
+
+    __slots__ = ("_raw",)
 
     def __init__(self, value):
-        """."""
-        self.__value = float(Decimal(value).quantize(Decimal("1.00000000")))
+        """Create a Fixed8 from an int, float, numeric string, Decimal or another Fixed8."""
+        self._raw = _to_raw(value)
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Create a Fixed8 from its count of 1e-8 units, for eg. Fixed8.from_raw(100000000) is 1."""
+        raw = int(raw)
+        if not _INT64_MIN <= raw <= _INT64_MAX:
+            raise OverflowError("{0} does not fit in a Fixed8".format(raw))
+        obj = cls.__new__(cls)
+        obj._raw = raw
+        return obj
+
+    @property
+    def raw(self):
+        """Return the underlying count of 1e-8 units."""
+        return self._raw
 
     def to_hex(self):
-        output = hex(round(self.__value * 1e+8))[2:]
-        return "0" * (16 - len(output)) + output
+        """Get the big endian hex representation of a given Fixed8."""
+        return _INT64_BE.pack(self._raw).hex()
 
     def to_reverse_hex(self):
         """Get a reverse hex representation of a given Fixed8."""
-        return reverse_hex(self.to_hex())
+        return _INT64_LE.pack(self._raw).hex()
+
+    def to_bytes_le(self):
+        """Get the little endian bytes of a given Fixed8, as serialized in a transaction."""
+        return _INT64_LE.pack(self._raw)
+
+    def to_decimal(self):
+        """Return the exact value as a Decimal."""
+        return Decimal(self._raw).scaleb(-8)
 
     @property
     def value(self):
         """Return the underlying value of fixed 8."""
-        return str(self.__value)
+        return str(self._raw / FIXED8_SCALE)
+
+    def __repr__(self):
+        return "Fixed8('{0}')".format(self)
+
+    def __str__(self):
+        units, fraction = divmod(abs(self._raw), FIXED8_SCALE)
+        return "{0}{1}.{2:08d}".format("-" if self._raw < 0 else "", units, fraction)
+
+    def __float__(self):
+        return self._raw / FIXED8_SCALE
+
+    def __bool__(self):
+        return self._raw != 0
+
+    def __hash__(self):
+        # Hash like the equal int, float, Decimal or Fraction, all of them hash their exact rational value.
+        units, fraction = divmod(self._raw, FIXED8_SCALE)
+        return hash(units) if fraction == 0 else hash(Fraction(self._raw, FIXED8_SCALE))
+
+    def _compare(self, other, op):
+        """Compare the exact values, so that equality, ordering and hash agree with each other.
+
+        Strings are not compared, a string equal to a Fixed8 could not have the same hash.
+        """
+        if isinstance(other, Fixed8):
+            return op(self._raw, other._raw)
+        if isinstance(other, numbers.Integral):
+            return op(self._raw, int(other) * FIXED8_SCALE)
+        if isinstance(other, (float, Decimal, numbers.Rational)):
+            try:
+                other = Fraction(other)
+            except (ValueError, OverflowError):
+                # nan and the infinities, compared as floats they are never equal and order like them.
+                return op(float(self), float(other))
+            return op(Fraction(self._raw, FIXED8_SCALE), other)
+        return NotImplemented
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    def __neg__(self):
+        return Fixed8.from_raw(-self._raw)
+
+    def __abs__(self):
+        return Fixed8.from_raw(abs(self._raw))
+
+    def __add__(self, other):
+        try:
+            return Fixed8.from_raw(self._raw + _to_raw(other))
+        except TypeError:
+            return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        try:
+            return Fixed8.from_raw(self._raw - _to_raw(other))
+        except TypeError:
+            return NotImplemented
+
+    def __rsub__(self, other):
+        try:
+            return Fixed8.from_raw(_to_raw(other) - self._raw)
+        except TypeError:
+            return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, numbers.Integral):
+            return Fixed8.from_raw(self._raw * int(other))
+        try:
+            product = self._raw * _to_raw(other)
+        except TypeError:
+            return NotImplemented
+        return Fixed8.from_raw(round_half_even(product, FIXED8_SCALE))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, numbers.Integral):
+            return Fixed8.from_raw(round_half_even(self._raw, int(other)))
+        try:
+            divisor = _to_raw(other)
+        except TypeError:
+            return NotImplemented
+        return Fixed8.from_raw(round_half_even(self._raw * FIXED8_SCALE, divisor))
 
     @staticmethod
     def num_to_fixed_8(number, size=8):
@@ -46,3 +199,25 @@ class Fixed8(object):
                 "size param must be a whole integer. Received {size}".format(size=size)
             )
         return Fixed8(number).to_reverse_hex()[: size * 2]
+
+
+def round_half_even(numerator, denominator):
+    """Integer division rounding to the nearest integer, ties to even."""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2 == 1):
+        quotient += 1
+    return quotient
+
+
+def to_fixed8_array(values):
+    """Convert a sequence of amounts to their Fixed8 units in one pass.
+
+    Args:
+        values (iterable) : ints, floats, numeric strings, Decimals or Fixed8 objects.
+    Returns:
+        array.array of signed 64 bit integers holding the count of 1e-8 units of every value.
+    """
+    return array("q", map(_to_raw, values))
@@ -0,0 +1,270 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Compact typed models of the objects returned by the Switcheo API.
+
+Every model keeps its fields in __slots__, amounts as plain ints in the smallest unit of their asset
+(i.e. Fixed8 units for the 8 decimal tokens, use Fixed8.from_raw to get a Fixed8) and asset ids interned,
+so tens of thousands of orders hold a single copy of every asset id and no per object __dict__.
+"""
+
+import sys
+from decimal import Decimal
+
+_intern = sys.intern
+
+
+def _amount(value):
+    """Convert an amount received as int, float or string, for eg. "47320000000.0", to an int.
+
+    None and the empty string, which the exchange sends for amounts not known yet, give None. Amounts are
+    in the smallest unit of their asset, a fractional one is a malformed response and raises a ValueError.
+    """
+    if value is None or type(value) is int:
+        return value
+    if value == "":
+        return None
+    if type(value) is str:
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    amount = Decimal(value)
+    if amount != amount.to_integral_value():
+        raise ValueError("Amount {0!r} is not a whole number of units".format(value))
+    return int(amount)
+
+
+def _asset(value):
+    """Intern an asset id or symbol, they repeat across every order."""
+    return _intern(value) if value is not None else None
+
+
+class _Model(object):
+    """Base class giving the models a repr, an equality with its hash and a conversion back to a dict."""
+
+    __slots__ = ()
+
+    def to_dict(self):
+        """Return the fields of the model as a dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        # Equal models share their first field, the id or the asset, which unlike fills or makes is hashable.
+        return hash((type(self), getattr(self, self.__slots__[0])))
+
+    def __repr__(self):
+        return "{0}({1})".format(type(self).__name__,
+                                 ", ".join("{0}={1!r}".format(name, getattr(self, name)) for name in self.__slots__))
+
+    @classmethod
+    def decode_list(cls, items):
+        """Decode a list of raw json objects, for eg. the response of a list end point."""
+        from_json = cls.from_json
+        return [from_json(item) for item in items]
+
+
+class Offer(_Model):
+    """An open order resting on the offer book, as returned by list_offers."""
+
+    __slots__ = ("id", "offer_asset", "want_asset", "available_amount", "offer_amount", "want_amount")
+
+    def __init__(self, id, offer_asset, want_asset, available_amount, offer_amount, want_amount):
+        self.id = id
+        self.offer_asset = offer_asset
+        self.want_asset = want_asset
+        self.available_amount = available_amount
+        self.offer_amount = offer_amount
+        self.want_amount = want_amount
+
+    @classmethod
+    def from_json(cls, obj):
+        """Build an Offer from an item of the list_offers response."""
+        return cls(obj["id"], _asset(obj["offer_asset"]), _asset(obj["want_asset"]),
+                   _amount(obj["available_amount"]), _amount(obj["offer_amount"]), _amount(obj["want_amount"]))
+
+
+class Trade(_Model):
+    """A fill of an offer, as returned by list_trades."""
+
+    __slots__ = ("id", "fill_amount", "take_amount", "event_time", "is_buy")
+
+    def __init__(self, id, fill_amount, take_amount, event_time, is_buy):
+        self.id = id
+        self.fill_amount = fill_amount
+        self.take_amount = take_amount
+        self.event_time = event_time
+        self.is_buy = is_buy
+
+    @classmethod
+    def from_json(cls, obj):
+        """Build a Trade from an item of the list_trades response."""
+        return cls(obj["id"], _amount(obj["fill_amount"]), _amount(obj["take_amount"]), obj["event_time"],
+                   obj["is_buy"])
+
+
+class Fill(_Model):
+    """The part of an order which was matched against an existing offer."""
+
+    __slots__ = ("id", "offer_hash", "offer_asset_id", "want_asset_id", "fill_amount", "want_amount",
+                 "filled_amount", "fee_asset_id", "fee_amount", "price", "txn", "status", "created_at",
+                 "transaction_hash")
+
+    def __init__(self, id, offer_hash, offer_asset_id, want_asset_id, fill_amount, want_amount, filled_amount,
+                 fee_asset_id, fee_amount, price, txn, status, created_at, transaction_hash):
+        self.id = id
+        self.offer_hash = offer_hash
+        self.offer_asset_id = offer_asset_id
+        self.want_asset_id = want_asset_id
+        self.fill_amount = fill_amount
+        self.want_amount = want_amount
+        self.filled_amount = filled_amount
+        self.fee_asset_id = fee_asset_id
+        self.fee_amount = fee_amount
+        self.price = price
+        self.txn = txn
+        self.status = status
+        self.created_at = created_at
+        self.transaction_hash = transaction_hash
+
+    @classmethod
+    def from_json(cls, obj):
+        """Build a Fill from an item of the fills of an order."""
+        get = obj.get
+        return cls(obj["id"], get("offer_hash"), _asset(get("offer_asset_id")), _asset(get("want_asset_id")),
+                   _amount(get("fill_amount")), _amount(get("want_amount")), _amount(get("filled_amount")),
+                   _asset(get("fee_asset_id")), _amount(get("fee_amount")), get("price"), get("txn"), get("status"),
+                   get("created_at"), get("transaction_hash"))
+
+
+class Make(_Model):
+    """The part of an order which was added to the offer book."""
+
+    __slots__ = ("id", "offer_hash", "available_amount", "offer_asset_id", "offer_amount", "want_asset_id",
+                 "want_amount", "filled_amount", "txn", "cancel_txn", "price", "status", "created_at",
+                 "transaction_hash", "trades")
+
+    def __init__(self, id, offer_hash, available_amount, offer_asset_id, offer_amount, want_asset_id, want_amount,
+                 filled_amount, txn, cancel_txn, price, status, created_at, transaction_hash, trades):
+        self.id = id
+        self.offer_hash = offer_hash
+        self.available_amount = available_amount
+        self.offer_asset_id = offer_asset_id
+        self.offer_amount = offer_amount
+        self.want_asset_id = want_asset_id
+        self.want_amount = want_amount
+        self.filled_amount = filled_amount
+        self.txn = txn
+        self.cancel_txn = cancel_txn
+        self.price = price
+        self.status = status
+        self.created_at = created_at
+        self.transaction_hash = transaction_hash
+        self.trades = trades
+
+    @classmethod
+    def from_json(cls, obj):
+        """Build a Make from an item of the makes of an order."""
+        get = obj.get
+        return cls(obj["id"], get("offer_hash"), _amount(get("available_amount")), _asset(get("offer_asset_id")),
+                   _amount(get("offer_amount")), _asset(get("want_asset_id")), _amount(get("want_amount")),
+                   _amount(get("filled_amount")), get("txn"), get("cancel_txn"), get("price"), get("status"),
+                   get("created_at"), get("transaction_hash"), Trade.decode_list(get("trades") or ()))
+
+
+class Order(_Model):
+    """An order with its fills and makes, as returned by list_orders or create_order."""
+
+    __slots__ = ("id", "blockchain", "contract_hash", "address", "side", "offer_asset_id", "want_asset_id",
+                 "offer_amount", "want_amount", "transfer_amount", "priority_gas_amount", "use_native_token",
+                 "native_fee_transfer_amount", "deposit_txn", "created_at", "status", "fills", "makes")
+
+    def __init__(self, id, blockchain, contract_hash, address, side, offer_asset_id, want_asset_id, offer_amount,
+                 want_amount, transfer_amount, priority_gas_amount, use_native_token, native_fee_transfer_amount,
+                 deposit_txn, created_at, status, fills, makes):
+        self.id = id
+        self.blockchain = blockchain
+        self.contract_hash = contract_hash
+        self.address = address
+        self.side = side
+        self.offer_asset_id = offer_asset_id
+        self.want_asset_id = want_asset_id
+        self.offer_amount = offer_amount
+        self.want_amount = want_amount
+        self.transfer_amount = transfer_amount
+        self.priority_gas_amount = priority_gas_amount
+        self.use_native_token = use_native_token
+        self.native_fee_transfer_amount = native_fee_transfer_amount
+        self.deposit_txn = deposit_txn
+        self.created_at = created_at
+        self.status = status
+        self.fills = fills
+        self.makes = makes
+
+    @classmethod
+    def from_json(cls, obj):
+        """Build an Order, with its fills and makes, from an item of the list_orders response."""
+        get = obj.get
+        return cls(obj["id"], _asset(get("blockchain")), _asset(get("contract_hash")), _asset(get("address")),
+                   _asset(get("side")), _asset(get("offer_asset_id")), _asset(get("want_asset_id")),
+                   _amount(get("offer_amount")), _amount(get("want_amount")), _amount(get("transfer_amount")),
+                   _amount(get("priority_gas_amount")), get("use_native_token"),
+                   _amount(get("native_fee_transfer_amount")), get("deposit_txn"), get("created_at"),
+                   _asset(get("status")), Fill.decode_list(get("fills") or ()),
+                   Make.decode_list(get("makes") or ()))
+
+
+class Balance(_Model):
+    """Contract balance of one asset, as returned by list_balances."""
+
+    __slots__ = ("asset", "confirmed", "locked", "confirming")
+
+    def __init__(self, asset, confirmed, locked, confirming):
+        self.asset = asset
+        self.confirmed = confirmed
+        self.locked = locked
+        self.confirming = confirming
+
+    @classmethod
+    def from_json(cls, obj):
+        """Build the balances of every asset from the list_balances response.
+
+        Returns:
+            dict of asset symbol to Balance
+        """
+        confirmed, locked = obj.get("confirmed") or {}, obj.get("locked") or {}
+        confirming = obj.get("confirming") or {}
+        balances = {}
+        for asset in set(confirmed) | set(locked) | set(confirming):
+            pending = confirming.get(asset) or 0
+            if isinstance(pending, list):
+                # Pending events of the asset, for eg. a withdrawal, their amounts add up.
+                pending = sum(_amount(event.get("amount") or 0) for event in pending)
+            asset = _asset(asset)
+            balances[asset] = cls(asset, _amount(confirmed.get(asset) or 0), _amount(locked.get(asset) or 0),
+                                  _amount(pending))
+        return balances
+
+
+def decode_orders(items):
+    """Decode the list_orders response into a list of Order."""
+    return Order.decode_list(items)
+
+
+def decode_trades(items):
+    """Decode the list_trades response into a list of Trade."""
+    return Trade.decode_list(items)
+
+
+def decode_offers(items):
+    """Decode the list_offers response into a list of Offer."""
+    return Offer.decode_list(items)
+
+
+def decode_balances(obj):
+    """Decode the list_balances response into a dict of asset symbol to Balance."""
+    return Balance.from_json(obj)
@@ -0,0 +1,46 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Executors used to sign several transactions concurrently."""
+
+import os
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+# Possible values for the mode of a signing executor.
+INLINE, THREAD, PROCESS = "inline", "thread", "process"
+
+
+class InlineExecutor(Executor):
+    """An executor which runs every submitted call right away in the calling thread."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def get_signing_executor(mode=INLINE, max_workers=None):
+    """Create an executor which can be passed to sign_array and the order execution.
+
+    Signing with neocore is pure python and holds the GIL, so only the process pool gives a real
+    speedup on multiple cores. The thread pool is useful when the signing backend releases the GIL.
+
+    Args:
+        mode (str)        : One of inline, thread or process.
+        max_workers (int) : Number of workers for the thread and process pools. Defaults to the cpu count.
+    Returns:
+        concurrent.futures.Executor object
+    Raises:
+        ValueError in case mode is unknown.
+    """
+    if mode == INLINE:
+        return InlineExecutor()
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if mode == THREAD:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if mode == PROCESS:
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError("Unknown signing executor mode {0}, expected one of {1}".format(mode, (INLINE, THREAD, PROCESS)))
@@ -0,0 +1,449 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Timings of every SwitcheoApi call split by phase, reported to user supplied hooks.
+
+A call records the time spent in each of these phases:
+
+    connect        : DNS resolution, TCP and TLS handshakes of the new connections.
+    http           : Sending the requests and waiting for the responses, i.e. the network and the server.
+    decode         : Parsing the json bodies.
+    key_derivation : Deriving the key material from a WIF.
+    serialization  : Serializing the transactions and the signable payloads.
+    signing        : Computing the ECDSA signatures.
+
+The phases are exclusive, the time spent serializing a transaction while signing it is only counted as
+serialization. Along with the phases, every HTTP request of the call is recorded with its endpoint, status
+and number of retries.
+
+Example:
+    exporter = PrometheusExporter()
+    client = SwitcheoApi("https://test-api.switcheo.network", hooks=[exporter])
+    client.list_offers("neo", "SWTH_NEO", contract_hash)
+    print(exporter.render())
+"""
+
+import re
+import time
+import logging
+import functools
+import threading
+from collections import namedtuple
+from urllib.parse import urlparse
+from pyswitcheo import tracing
+
+logger = logging.getLogger(__name__)
+
+CONNECT = "connect"
+HTTP = "http"
+DECODE = "decode"
+KEY_DERIVATION = "key_derivation"
+SERIALIZATION = "serialization"
+SIGNING = "signing"
+PHASES = (CONNECT, HTTP, DECODE, KEY_DERIVATION, SERIALIZATION, SIGNING)
+
+# Phases spent waiting for the network, the other ones are spent on the local cpu.
+NETWORK_PHASES = frozenset([CONNECT, HTTP])
+
+# Upper bounds in seconds of the buckets of the duration histograms.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path segments made of ids, replaced by {id} so that the endpoint labels keep a bounded cardinality.
+_ID_SEGMENT = re.compile(r"^[0-9a-fA-F-]{16,}$")
+_VERSION_SEGMENT = re.compile(r"^v\d+$")
+
+# One HTTP request of a call, retries being the number of attempts which were retried.
+RequestMetrics = namedtuple("RequestMetrics", ["method", "endpoint", "status", "retries", "seconds"])
+
+
+class _Local(threading.local):
+    """Call being recorded on the current thread and its stack of open phase timers."""
+
+    # Class level defaults, a missing attribute of a thread local would cost an AttributeError per lookup.
+    call = None
+    stack = None
+
+
+_local = _Local()
+
+
+def endpoint_label(url):
+    """Return the endpoint of a url without the api version and the ids, for eg. /orders/{id}/broadcast."""
+    segments = [segment for segment in urlparse(url).path.split("/") if segment]
+    if segments and _VERSION_SEGMENT.match(segments[0]):
+        segments = segments[1:]
+    return "/" + "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in segments)
+
+
+class CallMetrics(object):
+    """Timings of one SwitcheoApi call, passed to the hooks once the call returns or raises.
+
+    The phases of the workers of a batch add up, so they can exceed the duration of the call.
+    """
+
+    __slots__ = ("name", "phases", "requests", "seconds", "error", "_lock")
+
+    def __init__(self, name):
+        self.name = name
+        self.phases = {}
+        self.requests = []
+        self.seconds = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def add_phase(self, phase, seconds):
+        """Add seconds to a phase, the workers of a batch report to the same call concurrently."""
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_request(self, request):
+        """Record a RequestMetrics."""
+        with self._lock:
+            self.requests.append(request)
+
+    @property
+    def endpoint(self):
+        """Return the endpoint of the last request, None if the call sent none."""
+        return self.requests[-1].endpoint if self.requests else None
+
+    @property
+    def status(self):
+        """Return the HTTP status of the last request, None if the call sent none."""
+        return self.requests[-1].status if self.requests else None
+
+    @property
+    def retries(self):
+        """Return the number of retried attempts across all the requests of the call."""
+        return sum(request.retries for request in self.requests)
+
+    @property
+    def network_seconds(self):
+        """Return the seconds spent connecting and waiting for the responses."""
+        return sum(seconds for phase, seconds in self.phases.items() if phase in NETWORK_PHASES)
+
+    @property
+    def local_seconds(self):
+        """Return the seconds spent on the local cpu, decoding, deriving keys, serializing and signing."""
+        return sum(seconds for phase, seconds in self.phases.items() if phase not in NETWORK_PHASES)
+
+    def __repr__(self):
+        return "CallMetrics(name={0!r}, seconds={1!r}, phases={2!r}, requests={3!r})".format(
+            self.name, self.seconds, self.phases, self.requests)
+
+
+class _NoopTimer(object):
+    """Timer returned when no call is being instrumented on the current thread."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class _Timer(object):
+    """Measures the exclusive time of a phase, pausing the enclosing phase of the same thread."""
+
+    __slots__ = ("call", "phase", "start", "elapsed", "nested")
+
+    def __init__(self, call, phase):
+        self.call = call
+        self.phase = phase
+
+    def __enter__(self):
+        stack = _local.stack
+        now = time.perf_counter()
+        self.nested = bool(stack) and stack[-1].phase == self.phase
+        if not self.nested:
+            if stack:
+                stack[-1].elapsed += now - stack[-1].start
+            self.start, self.elapsed = now, 0.0
+            stack.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.nested:
+            return False
+        stack = _local.stack
+        now = time.perf_counter()
+        stack.pop()
+        self.call.add_phase(self.phase, self.elapsed + now - self.start)
+        if stack:
+            stack[-1].start = now
+        return False
+
+
+def current_call():
+    """Return the CallMetrics being recorded on the current thread, None if the call is not instrumented."""
+    return _local.call
+
+
+def timed(phase):
+    """Return a context manager adding the time spent in its block to a phase of the current call.
+
+    It costs a single thread local lookup when the current call is not instrumented.
+    """
+    call = _local.call
+    if call is None:
+        return _NOOP_TIMER
+    return _Timer(call, phase)
+
+
+def phase(name):
+    """Decorate a function so that the time spent in it is added to a phase of the current call."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call = _local.call
+            if call is None:
+                return func(*args, **kwargs)
+            with _Timer(call, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_request(method, url, status, retries, seconds):
+    """Record an HTTP request in the current call, if it is instrumented."""
+    call = _local.call
+    if call is not None:
+        call.add_request(RequestMetrics(method.upper(), endpoint_label(url), status, retries, seconds))
+
+
+def bind(func):
+    """Wrap func so that it reports to the call of the current thread when run on a worker thread."""
+    call = current_call()
+    if call is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = _local.call, _local.stack
+        _local.call, _local.stack = call, []
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.call, _local.stack = previous
+
+    return wrapper
+
+
+def bind_context(func):
+    """Wrap func so that it reports to the current call and is traced under the current span on a worker thread."""
+    return tracing.bind(bind(func))
+
+
+class Instrumentation(object):
+    """The hooks of a client, every hook is called with the CallMetrics of every call."""
+
+    def __init__(self, hooks=None):
+        """Initialize the instrumentation.
+
+        Args:
+            hooks (list[callable]) : Callables accepting a CallMetrics.
+        """
+        self.hooks = list(hooks or [])
+
+    def add_hook(self, hook):
+        """Call hook(call_metrics) after every call."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Stop calling a hook added before."""
+        self.hooks.remove(hook)
+
+    def _emit(self, call):
+        for hook in list(self.hooks):
+            try:
+                hook(call)
+            except Exception:
+                logger.exception("Instrumentation hook {0!r} failed".format(hook))
+
+    def run(self, name, func, *args, **kwargs):
+        """Run func(*args, **kwargs) as the call name, reporting its timings to the hooks.
+
+        A call made while another one is recorded on the same thread is part of the outer call.
+        """
+        if not self.hooks or current_call() is not None:
+            return func(*args, **kwargs)
+        call = CallMetrics(name)
+        _local.call, _local.stack = call, []
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            call.seconds = time.perf_counter() - start
+            _local.call, _local.stack = None, None
+            self._emit(call)
+
+
+def instrumented(method):
+    """Decorate a SwitcheoApi method so that its timings are reported to the hooks of the client.
+
+    When the client has a tracer, the call is also traced as a parent span named after the method.
+    """
+    name = method.__name__
+    span_name = "SwitcheoApi." + name
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        tracer = self.tracer
+        if tracer is None:
+            return self.instrumentation.run(name, method, self, *args, **kwargs)
+        with tracing.activate(tracer), tracer.start_as_current_span(span_name):
+            return self.instrumentation.run(name, method, self, *args, **kwargs)
+
+    return wrapper
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = ["{0}=\"{1}\"".format(name, _escape(value)) for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Histogram(object):
+    """Cumulative bucket counts, sum and count of the observations of one label set."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, buckets, value):
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class PrometheusExporter(object):
+    """Hook aggregating the calls into counters and histograms, rendered in the Prometheus text format.
+
+    Metrics:
+        <namespace>_calls_total{call, outcome}                    : Calls which returned (ok) or raised (error).
+        <namespace>_call_duration_seconds{call}                    : Histogram of the call durations.
+        <namespace>_phase_seconds_total{call, phase}               : Seconds spent in every phase.
+        <namespace>_requests_total{method, endpoint, status}       : HTTP requests sent.
+        <namespace>_request_duration_seconds{method, endpoint}     : Histogram of the request durations.
+        <namespace>_request_retries_total{method, endpoint}        : Attempts which were retried.
+    """
+
+    def __init__(self, namespace="pyswitcheo", buckets=DEFAULT_BUCKETS):
+        """Initialize the exporter.
+
+        Args:
+            namespace (str)       : Prefix of the metric names.
+            buckets (tuple[float]) : Upper bounds in seconds of the histogram buckets.
+        """
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._call_durations = {}
+        self._phases = {}
+        self._requests = {}
+        self._request_durations = {}
+        self._retries = {}
+
+    def __call__(self, call):
+        """Aggregate a CallMetrics, this is the hook passed to SwitcheoApi."""
+        with self._lock:
+            outcome = ("error" if call.error is not None else "ok",)
+            self._calls[(call.name,) + outcome] = self._calls.get((call.name,) + outcome, 0) + 1
+            self._observe(self._call_durations, (call.name,), call.seconds)
+            for phase, seconds in call.phases.items():
+                self._phases[(call.name, phase)] = self._phases.get((call.name, phase), 0.0) + seconds
+            for request in call.requests:
+                key = (request.method, request.endpoint)
+                status_key = key + (request.status,)
+                self._requests[status_key] = self._requests.get(status_key, 0) + 1
+                self._retries[key] = self._retries.get(key, 0) + request.retries
+                self._observe(self._request_durations, key, request.seconds)
+
+    def _observe(self, histograms, key, value):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = _Histogram(len(self.buckets))
+        histogram.observe(self.buckets, value)
+
+    def _render_counter(self, lines, name, help_text, label_names, values):
+        lines.append("# HELP {0} {1}".format(name, help_text))
+        lines.append("# TYPE {0} counter".format(name))
+        for key, value in sorted(values.items(), key=lambda item: tuple(map(str, item[0]))):
+            lines.append("{0}{1} {2}".format(name, _labels(label_names, key), value))
+
+    def _render_histogram(self, lines, name, help_text, label_names, histograms):
+        lines.append("# HELP {0} {1}".format(name, help_text))
+        lines.append("# TYPE {0} histogram".format(name))
+        for key, histogram in sorted(histograms.items()):
+            for bound, count in zip(self.buckets, histogram.counts):
+                lines.append("{0}_bucket{1} {2}".format(name, _labels(label_names, key, "le=\"{0}\"".format(bound)),
+                                                        count))
+            lines.append("{0}_bucket{1} {2}".format(name, _labels(label_names, key, "le=\"+Inf\""), histogram.count))
+            lines.append("{0}_sum{1} {2}".format(name, _labels(label_names, key), histogram.total))
+            lines.append("{0}_count{1} {2}".format(name, _labels(label_names, key), histogram.count))
+
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        ns, lines = self.namespace, []
+        with self._lock:
+            self._render_counter(lines, ns + "_calls_total", "SwitcheoApi calls by outcome.",
+                                 ("call", "outcome"), self._calls)
+            self._render_histogram(lines, ns + "_call_duration_seconds", "Duration of the SwitcheoApi calls.",
+                                   ("call",), self._call_durations)
+            self._render_counter(lines, ns + "_phase_seconds_total", "Seconds spent in every phase of the calls.",
+                                 ("call", "phase"), self._phases)
+            self._render_counter(lines, ns + "_requests_total", "HTTP requests sent to the exchange.",
+                                 ("method", "endpoint", "status"), self._requests)
+            self._render_histogram(lines, ns + "_request_duration_seconds", "Duration of the HTTP requests.",
+                                   ("method", "endpoint"), self._request_durations)
+            self._render_counter(lines, ns + "_request_retries_total", "HTTP attempts which were retried.",
+                                 ("method", "endpoint"), self._retries)
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, addr="127.0.0.1"):
+        """Serve the metrics at http://addr:port/metrics on a daemon thread.
+
+        Args:
+            port (int)  : Port to listen on, 0 picks a free one.
+            addr (str)  : Address to listen on.
+        Returns:
+            http.server.HTTPServer object, call shutdown() on it to stop serving.
+        """
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                content = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer((addr, port), Handler)
+        threading.Thread(target=server.serve_forever, name="pyswitcheo-metrics", daemon=True).start()
+        return server
@@ -8,10 +8,10 @@ As such, when using this endpoint, balances for the specified addresses and cont
 import requests
 from pyswitcheo import utils
 from pyswitcheo.internal.urls.balances import LIST_BALANCES
-from pyswitcheo.crypto_utils import get_script_hash_from_address
+from pyswitcheo.crypto_utils import addresses_to_script_hashes
 
 
-def _list_balances(base_url, addresses, contract_hashes):
+def _list_balances(base_url, addresses, contract_hashes, session=None):
     """List contract balances of the given address and contract hashes.
 
     NOTE: The address gets converted to scripthash internally
@@ -19,6 +19,7 @@ def _list_balances(base_url, addresses, contract_hashes):
         base_url (str)               : This paramter governs whether to connect to test or mainnet..
         addresses (list[str])        : Only return balances for these addresses.
         contract_hashes (list[str])  : Only return balances from these contract hashes.
+        session (requests.Session)   : Optional pooled session to send the request with.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
@@ -47,8 +48,8 @@ def _list_balances(base_url, addresses, contract_hashes):
           }
         }
     """
-    addresses = [get_script_hash_from_address(address) for address in addresses]
+    addresses = addresses_to_script_hashes(addresses)
     params = {"addresses": addresses, "contract_hashes": contract_hashes}
     url = utils.format_urls(base_url, LIST_BALANCES)
-    resp = requests.get(url, params=params)
+    resp = (session or requests).get(url, params=params)
     return utils.response_else_exception(resp)
@@ -11,20 +11,20 @@ Switcheo has determined that it has been successfully broadcasted to the blockch
 import logging
 import requests
 from pyswitcheo import utils
+from pyswitcheo import tracing
 from pyswitcheo.internal.urls import deposits
-from pyswitcheo.serialization import sign_msg, serialize_transaction
-from pyswitcheo.crypto_utils import (
-    encode_msg,
-    get_private_key_from_wif,
-    get_script_hash_from_wif,
-)
+from pyswitcheo.serialization import sign_msg, sign_transaction
+from pyswitcheo.crypto_utils import encode_msg
+from pyswitcheo.signer import as_signer
 
 logger = logging.getLogger(__name__)
 
 # TODO: (ansrivas) Give an option to load from wallet, pass wif and pass private key
 
 
-def _create_deposit(base_url, priv_key_wif, asset_id, amount, contract_hash, blockchain="NEO"):
+@tracing.traced()
+def _create_deposit(base_url, priv_key_wif, asset_id, amount, contract_hash, blockchain="NEO", session=None,
+                    token_cache=None, clock=None):
     """This endpoint creates a deposit which can be executed through Execute Deposit.
 
     To be able to make a deposit, sufficient funds are required in the depositing wallet.
@@ -32,11 +32,14 @@ def _create_deposit(base_url, priv_key_wif, asset_id, amount, contract_hash, blo
 
     Args:
         base_url (str)      : This paramter governs whether to connect to test or mainnet..
-        priv_key_wif (str)  : The private key wif of the user.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
         asset_id (str)      : The asset symbol or ID to deposit. for eg. SWTH
         amount (int)        : Amount of tokens to deposit.
         contract_hash (str) : Switcheo Exchange contract hash to execute the deposit on.
         blockchain (str)    : Blockchain that the token to deposit is on. Possible values are: neo.
+        session (requests.Session) : Optional pooled session to send the request with.
+        token_cache (TokenInfoCache) : Optional cache of the exchange token metadata.
+        clock (ExchangeClock) : Optional clock synchronized with the exchange to timestamp the payload.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
@@ -46,29 +49,33 @@ def _create_deposit(base_url, priv_key_wif, asset_id, amount, contract_hash, blo
     signable_params = {
         "blockchain": blockchain,
         "asset_id": asset_id,
-        "amount": utils.convert_to_neo_asset_amount(amount, asset_id, base_url),
-        "timestamp": utils.get_current_epoch_milli(),
+        "amount": utils.convert_to_neo_asset_amount(amount, asset_id, base_url, session=session,
+                                                    token_cache=token_cache),
+        "timestamp": utils.get_current_epoch_milli(clock=clock),
         "contract_hash": contract_hash,
     }
     signable_params_json_str = utils.jsonify(signable_params)
 
     # The depositer's address. Do not include this in the parameters to be signed.
     # This needs to be the script hash of the public key
-    script_hash = get_script_hash_from_wif(priv_key_wif)
+    signer = as_signer(priv_key_wif)
+    script_hash = signer.script_hash
 
-    pk = get_private_key_from_wif(priv_key_wif)
+    pk = signer.private_key
     encoded_msg = encode_msg(signable_params_json_str)
     signature = sign_msg(encoded_msg, pk)
 
     params = {**signable_params, "signature": signature, "address": script_hash}
 
-    logger.debug("Params being sent to create deposit: {0}".format(params))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Params being sent to create deposit: {0}".format(params))
     url = utils.format_urls(base_url, deposits.CREATE_DEPOSIT)
-    resp = requests.post(url, json=params)
+    resp = (session or requests).post(url, json=params)
     return utils.response_else_exception(resp)
 
 
-def _execute_deposit(base_url, deposit, priv_key_wif):
+@tracing.traced()
+def _execute_deposit(base_url, deposit, priv_key_wif, session=None):
     """This is the second endpoint required to execute a deposit. After using the Create Deposit endpoint,
     you will receive a response which requires additional signing.
     The signature should then be attached as the signature parameter in the request payload.
@@ -79,20 +86,20 @@ def _execute_deposit(base_url, deposit, priv_key_wif):
     Args:
         base_url (str)     : This paramter governs whether to connect to test or mainnet..
         deposit (json)     : The correct json response returned from create_deposit function (json.loads)
-        priv_key_wif (str) : The private key WIF of the user.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        session (requests.Session) : Optional pooled session to send the request with.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
 
     """
-    logger.debug("Deposit transaction is {0}".format(utils.jsonify(deposit["transaction"])))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Deposit transaction is {0}".format(utils.jsonify(deposit["transaction"])))
 
-    pk = get_private_key_from_wif(priv_key_wif)
+    pk = as_signer(priv_key_wif).private_key
     # signature is Signed response from create deposit endpoint.
-    # signable_params_json_str = utils.jsonify(deposit["transaction"])
-
-    signature = sign_msg(serialize_transaction(deposit["transaction"], False), pk)
+    signature = sign_transaction(deposit["transaction"], pk)
 
     url = utils.format_urls(base_url, deposits.EXECUTE_DEPOSIT.format(id=deposit["id"]))
-    resp = requests.post(url, json={"signature": signature})
+    resp = (session or requests).post(url, json={"signature": signature})
     return utils.response_else_exception(resp)
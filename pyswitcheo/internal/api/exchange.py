@@ -12,12 +12,13 @@ from pyswitcheo.internal.urls import exchange
 logger = logging.getLogger(__name__)
 
 
-def _list_currency_pairs(base_url, bases=None):
+def _list_currency_pairs(base_url, bases=None, session=None):
     """Fetch available currency pairs on Switcheo Exchange filtered by the base parameter. Defaults to all pairs.
 
     Args:
         base_url (str)    : This paramter governs whether to connect to test or mainnet..
         bases (list[str]) : Provides pairs for these base symbols. Possible values are NEO, GAS, SWTH, USD.
+        session (requests.Session) : Optional pooled session to send the request with.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
@@ -33,11 +34,11 @@ def _list_currency_pairs(base_url, bases=None):
         params["bases"] = bases
 
     url = utils.format_urls(base_url, exchange.LIST_CURRENCY_PAIRS)
-    resp = requests.get(url, params=params)
+    resp = (session or requests).get(url, params=params)
     return utils.response_else_exception(resp)
 
 
-def _get_exchange_timestamp(base_url):
+def _get_exchange_timestamp(base_url, session=None):
     """Returns the current timestamp in the exchange.
 
     This value should be fetched and used when a timestamp parameter is required for API requests.
@@ -45,6 +46,10 @@ def _get_exchange_timestamp(base_url):
     timestamp then an invalid signature error will be returned. The acceptable range might vary, but it
     should be less than one minute.
 
+    Args:
+        base_url (str)             : This paramter governs whether to connect to test or mainnet.
+        session (requests.Session) : Optional pooled session to send the request with.
+
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
 
@@ -54,15 +59,16 @@ def _get_exchange_timestamp(base_url):
         }
     """
     url = utils.format_urls(base_url, exchange.GET_TIMESTAMP)
-    resp = requests.get(url)
+    resp = (session or requests).get(url)
     return utils.response_else_exception(resp)
 
 
-def _list_contracts(base_url):
+def _list_contracts(base_url, session=None):
     """Fetch updated hashes of contracts deployed by Switcheo.
 
     Args:
         base_url (str): This paramter governs whether to connect to test or mainnet.
+        session (requests.Session) : Optional pooled session to send the request with.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
@@ -78,15 +84,16 @@ def _list_contracts(base_url):
         }
     """
     url = utils.format_urls(base_url, exchange.LIST_CONTRACTS)
-    resp = requests.get(url)
+    resp = (session or requests).get(url)
     return utils.response_else_exception(resp)
 
 
-def _get_contract_tokens_info(base_url):
+def _get_contract_tokens_info(base_url, session=None):
     """Fetch updated hashes of contracts deployed by Switcheo along with their precision.
 
     Args:
         base_url (str): This paramter governs whether to connect to test or mainnet.
+        session (requests.Session) : Optional pooled session to send the request with.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
@@ -109,5 +116,5 @@ def _get_contract_tokens_info(base_url):
         }
     """
     url = utils.format_urls(base_url, exchange.GET_TOKENS)
-    resp = requests.get(url)
+    resp = (session or requests).get(url)
     return utils.response_else_exception(resp)
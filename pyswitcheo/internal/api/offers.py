@@ -8,7 +8,7 @@ from pyswitcheo import utils
 from pyswitcheo.internal.urls.offers import LIST_OFFERS
 
 
-def _list_offers(base_url, blockchain, pair, contract_hash):
+def _list_offers(base_url, blockchain, pair, contract_hash, session=None):
     """Retrieves the best 70 offers (per side) on the offer book.
 
     Args:
@@ -16,6 +16,7 @@ def _list_offers(base_url, blockchain, pair, contract_hash):
         blockchain (str)   : Only return offers from this blockchain. Possible values are neo.
         pair (str)         : Only return offers from this pair, for eg. SWTH_NEO
         contract_hash (str): Only return offers for the contract hash. e.g. eed0d2e14b0027f5f30ade45f2b23dc57dd54ad2
+        session (requests.Session) : Optional pooled session to send the request with.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
@@ -34,5 +35,5 @@ def _list_offers(base_url, blockchain, pair, contract_hash):
     """
     params = {"blockchain": blockchain, "pair": pair, "contract_hash": contract_hash}
     url = utils.format_urls(base_url, LIST_OFFERS)
-    resp = requests.get(url, params=params)
+    resp = (session or requests).get(url, params=params)
     return utils.response_else_exception(resp)
@@ -12,20 +12,24 @@ until the order is filled or the order is cancelled.
 import logging
 import requests
 from pyswitcheo import utils
+from pyswitcheo import tracing
 from pyswitcheo.internal.urls import orders
 from pyswitcheo.datatypes.fixed8 import Fixed8
 from pyswitcheo.serialization import sign_msg, sign_array, sign_transaction
 from pyswitcheo.crypto_utils import (
     encode_msg,
     get_script_hash_from_address,
-    get_private_key_from_wif,
-    get_script_hash_from_wif,
 )
+from pyswitcheo.signer import as_signer
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of orders the list orders end point returns per call.
+MAX_ORDERS_PAGE = 200
 
-def _list_orders(base_url, address, contract_hash, pair=None):
+
+def _list_orders(base_url, address, contract_hash, pair=None, session=None, order_status=None, before_id=None,
+                 limit=None):
     """Retrieves the best 70 offers (per side) on the offer book.
 
     Args:
@@ -33,6 +37,10 @@ def _list_orders(base_url, address, contract_hash, pair=None):
         address (str)      : Only returns orders made by this address.
         contract_hash (str): Only return offers for the contract hash. e.g. eed0d2e14b0023dc57dd54ad2
         pair (str)         : The pair to buy or sell on. (optional)
+        session (requests.Session) : Optional pooled session to send the request with.
+        order_status (str) : Only return orders with this status, one of open, cancelled or completed. (optional)
+        before_id (str)    : Only return orders created before the order with this id. (optional)
+        limit (int)        : Only return this number of orders (min: 1, max: 200, default: 50). (optional)
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
@@ -66,12 +74,18 @@ def _list_orders(base_url, address, contract_hash, pair=None):
 
     if pair:
         params["pair"] = pair
+    if order_status:
+        params["order_status"] = order_status
+    if before_id:
+        params["before_id"] = before_id
+    if limit:
+        params["limit"] = limit
     url = utils.format_urls(base_url, orders.LIST_ORDERS)
-    resp = requests.get(url, params=params)
+    resp = (session or requests).get(url, params=params)
     return utils.response_else_exception(resp)
 
 
-def _create_order(
+def _sign_order_params(
     base_url,
     priv_key_wif,
     pair,
@@ -83,42 +97,28 @@ def _create_order(
     use_native_tokens,
     order_type,
     contract_hash,
+    session=None,
+    token_cache=None,
+    timestamp=None,
+    clock=None,
 ):
-    """This endpoint creates an order which can be executed through Broadcast Order.
+    """Build and sign the parameters sent to the create order end point.
 
-    Orders can only be created after sufficient funds have been deposited into the user's contract
-    balance. A successful order will have zero or one make and/or zero or more fills.
-
-    NOTE: Based on the params you are using, let's say you are trying to sell SWTH for NEO at the price of 0.01
-    exchange rate. The `want_amount` for a sell would be the amount of NEO you want. For eg
-    we want_amount of neo = 0.1 and we want to sell 1 SWTH for 0.0005 NEOs. In this case the sell order would become
-    at 0.0005 exchange rate for 0.1 NEO and 200 SWTH ( so you need to have 200 SWTH in your smart-contract)
-
-    IMPORTANT: After calling this endpoint, the Broadcast Order endpoint has to be called for the order to be executed.
+    See _create_order for the arguments.
 
     Args:
-        base_url (str)           : This paramter governs whether to connect to test or mainnet.
-        priv_key_wif (str)       : The private key wif of the user.
-        pair (str)               : The pair to buy or sell on.
-        blockchain (str)         : Blockchain that the pair is on. Possible values are: neo.
-        address (str)            : Address of the order maker. Do not include this in the parameters to be signed.
-        side (str)               : Whether to buy or sell on this pair. Possible values are: buy, sell.
-        price (str)              : Buy or sell price to 8 decimal places precision.
-        want_amount (int)        : Amount of tokens offered in the order.
-        asset_id (str)           : Asset which is being traded for eg. in SWTH_NEO then its SWTH
-        use_native_tokens (bool) : Whether to use SWTH as fees or not. Possible values are: true or false.
-        order_type (str)         : Order type, possible values are: limit.
-        contract_hash (str)      : Switcheo Exchange contract hash to execute the deposit on.
-
+        timestamp (int) : Optional nonce in epoch milliseconds, defaults to the current time.
+        clock (ExchangeClock) : Optional clock synchronized with the exchange to timestamp the payload.
     Returns:
-        If response from the server is HTTP_OK (200) then this returns the requests.response object
-        Check schemas.CREATE_ORDER_RESPONSE_SCHEMA
+        dict of the signed parameters
     """
     # The current timestamp to be used as a nonce as epoch milliseconds.
-    timestamp = utils.get_current_epoch_milli()
+    if timestamp is None:
+        timestamp = utils.get_current_epoch_milli(clock=clock)
 
     # TODO: (ansrivas) Check how to handle currencies which are not divisible, for eg. NEO ( until v3 is released)
-    want_amount = utils.convert_to_neo_asset_amount(want_amount, asset_id, base_url)
+    want_amount = utils.convert_to_neo_asset_amount(want_amount, asset_id, base_url, session=session,
+                                                    token_cache=token_cache)
     price = Fixed8(price).value
     signable_params = {
         "blockchain": blockchain,
@@ -134,22 +134,93 @@ def _create_order(
 
     # The order creator's address. Do not include this in the parameters to be signed.
     # This needs to be the script hash of the public key
-    script_hash = get_script_hash_from_wif(priv_key_wif)
-    pk = get_private_key_from_wif(priv_key_wif)
+    signer = as_signer(priv_key_wif)
+    script_hash = signer.script_hash
+    pk = signer.private_key
 
     signable_params_json_str = utils.jsonify(signable_params)
     encoded_msg = encode_msg(signable_params_json_str)
     signature = sign_msg(encoded_msg, pk)
 
-    params = {**signable_params, "signature": signature, "address": script_hash}
+    return {**signable_params, "signature": signature, "address": script_hash}
+
 
-    logger.debug("Params being sent to create orders: {0}".format(params))
+@tracing.traced()
+def _send_order(base_url, params, session=None):
+    """Send the parameters built by _sign_order_params to the create order end point.
+
+    Args:
+        base_url (str) : This paramter governs whether to connect to test or mainnet.
+        params (dict)  : The signed parameters of the order.
+        session (requests.Session) : Optional pooled session to send the request with.
+    Returns:
+        If response from the server is HTTP_OK (200) then this returns the requests.response object
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Params being sent to create orders: {0}".format(params))
     url = utils.format_urls(base_url, orders.CREATE_ORDER)
-    resp = requests.post(url, json=params)
+    resp = (session or requests).post(url, json=params)
     return utils.response_else_exception(resp)
 
 
-def _execute_order(base_url, order, priv_key_wif):
+@tracing.traced()
+def _create_order(
+    base_url,
+    priv_key_wif,
+    pair,
+    blockchain,
+    side,
+    price,
+    want_amount,
+    asset_id,
+    use_native_tokens,
+    order_type,
+    contract_hash,
+    session=None,
+    token_cache=None,
+    clock=None,
+):
+    """This endpoint creates an order which can be executed through Broadcast Order.
+
+    Orders can only be created after sufficient funds have been deposited into the user's contract
+    balance. A successful order will have zero or one make and/or zero or more fills.
+
+    NOTE: Based on the params you are using, let's say you are trying to sell SWTH for NEO at the price of 0.01
+    exchange rate. The `want_amount` for a sell would be the amount of NEO you want. For eg
+    we want_amount of neo = 0.1 and we want to sell 1 SWTH for 0.0005 NEOs. In this case the sell order would become
+    at 0.0005 exchange rate for 0.1 NEO and 200 SWTH ( so you need to have 200 SWTH in your smart-contract)
+
+    IMPORTANT: After calling this endpoint, the Broadcast Order endpoint has to be called for the order to be executed.
+
+    Args:
+        base_url (str)           : This paramter governs whether to connect to test or mainnet.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        pair (str)               : The pair to buy or sell on.
+        blockchain (str)         : Blockchain that the pair is on. Possible values are: neo.
+        address (str)            : Address of the order maker. Do not include this in the parameters to be signed.
+        side (str)               : Whether to buy or sell on this pair. Possible values are: buy, sell.
+        price (str)              : Buy or sell price to 8 decimal places precision.
+        want_amount (int)        : Amount of tokens offered in the order.
+        asset_id (str)           : Asset which is being traded for eg. in SWTH_NEO then its SWTH
+        use_native_tokens (bool) : Whether to use SWTH as fees or not. Possible values are: true or false.
+        order_type (str)         : Order type, possible values are: limit.
+        contract_hash (str)      : Switcheo Exchange contract hash to execute the deposit on.
+        session (requests.Session) : Optional pooled session to send the request with.
+        token_cache (TokenInfoCache) : Optional cache of the exchange token metadata.
+        clock (ExchangeClock) : Optional clock synchronized with the exchange to timestamp the payload.
+
+    Returns:
+        If response from the server is HTTP_OK (200) then this returns the requests.response object
+        Check schemas.CREATE_ORDER_RESPONSE_SCHEMA
+    """
+    params = _sign_order_params(base_url, priv_key_wif, pair, blockchain, side, price, want_amount, asset_id,
+                                use_native_tokens, order_type, contract_hash, session=session, token_cache=token_cache,
+                                clock=clock)
+    return _send_order(base_url, params, session=session)
+
+
+@tracing.traced()
+def _execute_order(base_url, order, priv_key_wif, session=None, executor=None):
     """This is the second endpoint required to execute an order.
 
     After using the Create Order endpoint, you will receive a response which needs to be signed.
@@ -157,76 +228,116 @@ def _execute_order(base_url, order, priv_key_wif):
 
     Args:
         order (dict) : The response object returned after creating an order
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        session (requests.Session) : Optional pooled session to send the request with.
+        executor (concurrent.futures.Executor) : Optional executor used to sign the fills and makes concurrently.
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
 
     """
     id = order["id"]
     fills, makes = order["fills"], order["makes"]
-    logger.debug("Fills are {}".format(fills))
-    logger.debug("makes are {}".format(makes))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Fills are {0}, makes are {1}".format(fills, makes))
 
-    priv_key = get_private_key_from_wif(priv_key_wif)
+    priv_key = as_signer(priv_key_wif).private_key
     signatures = {
-        "fills": sign_array(fills, priv_key),
-        "makes": sign_array(makes, priv_key),
+        "fills": sign_array(fills, priv_key, executor=executor),
+        "makes": sign_array(makes, priv_key, executor=executor),
     }
     params = {"signatures": signatures}
 
-    logger.debug("Params being sent to create deposit: {0}".format(params))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Params being sent to execute order: {0}".format(params))
     url = utils.format_urls(base_url, orders.EXECUTE_ORDER.format(id=id))
 
-    resp = requests.post(url, json=params)
+    resp = (session or requests).post(url, json=params)
     return utils.response_else_exception(resp)
 
 
-def _create_cancellation(base_url, order_id, priv_key_wif):
-    """This is the first API call required to cancel an order.
-
-    Only orders with makes and with an available_amount of more than 0 can be cancelled.
+def _sign_cancellation_params(order_id, priv_key_wif, timestamp=None, clock=None):
+    """Build and sign the parameters sent to the create cancellation end point.
 
     Args:
         order_id (str) : The order id which needs to be cancelled.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        timestamp (int) : Optional nonce in epoch milliseconds, defaults to the current time.
+        clock (ExchangeClock) : Optional clock synchronized with the exchange to timestamp the payload.
     Returns:
-        If response from the server is HTTP_OK (200) then this returns the requests.response object
-
+        dict of the signed parameters
     """
     signable_params = {
         "order_id": order_id,
-        "timestamp": utils.get_current_epoch_milli(),
+        "timestamp": utils.get_current_epoch_milli(clock=clock) if timestamp is None else timestamp,
     }
 
-    priv_key = get_private_key_from_wif(priv_key_wif)
+    signer = as_signer(priv_key_wif)
 
     signable_params_json_str = utils.jsonify(signable_params)
     encoded_msg = encode_msg(signable_params_json_str)
-    signature = sign_msg(encoded_msg, priv_key)
+    signature = sign_msg(encoded_msg, signer.private_key)
 
-    script_hash = get_script_hash_from_wif(priv_key_wif)
-    params = {**signable_params, "signature": signature, "address": script_hash}
+    script_hash = signer.script_hash
+    return {**signable_params, "signature": signature, "address": script_hash}
 
-    logger.debug("Params being sent to create deposit: {0}".format(params))
+
+@tracing.traced()
+def _send_cancellation(base_url, params, session=None):
+    """Send the parameters built by _sign_cancellation_params to the create cancellation end point.
+
+    Args:
+        base_url (str) : This paramter governs whether to connect to test or mainnet.
+        params (dict)  : The signed parameters of the cancellation.
+        session (requests.Session) : Optional pooled session to send the request with.
+    Returns:
+        If response from the server is HTTP_OK (200) then this returns the requests.response object
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Params being sent to create cancellation: {0}".format(params))
     url = utils.format_urls(base_url, orders.CREATE_CANCELLATION)
-    resp = requests.post(url, json=params)
+    resp = (session or requests).post(url, json=params)
     return utils.response_else_exception(resp)
 
 
-def _execute_cancellation(base_url, cancellation, priv_key_wif):
+@tracing.traced()
+def _create_cancellation(base_url, order_id, priv_key_wif, session=None, clock=None):
+    """This is the first API call required to cancel an order.
+
+    Only orders with makes and with an available_amount of more than 0 can be cancelled.
+
+    Args:
+        order_id (str) : The order id which needs to be cancelled.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        session (requests.Session) : Optional pooled session to send the request with.
+        clock (ExchangeClock) : Optional clock synchronized with the exchange to timestamp the payload.
+    Returns:
+        If response from the server is HTTP_OK (200) then this returns the requests.response object
+
+    """
+    params = _sign_cancellation_params(order_id, priv_key_wif, clock=clock)
+    return _send_cancellation(base_url, params, session=session)
+
+
+@tracing.traced()
+def _execute_cancellation(base_url, cancellation, priv_key_wif, session=None):
     """This is the second endpoint that must be called to cancel an order.
 
     After calling the Create Cancellation endpoint, you will receive a transaction in the resp which must be signed.
 
     Args:
         cancellation (dict) : The cancellation object which is received from create cancellation end point.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        session (requests.Session) : Optional pooled session to send the request with.
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
 
     """
-    logger.debug("cancellation transaction is {0}".format(utils.jsonify(cancellation["transaction"])))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("cancellation transaction is {0}".format(utils.jsonify(cancellation["transaction"])))
 
-    pk = get_private_key_from_wif(priv_key_wif)
+    pk = as_signer(priv_key_wif).private_key
     signature = sign_transaction(cancellation["transaction"], pk)
 
     url = utils.format_urls(base_url, orders.EXECUTE_CANCELLATION.format(id=cancellation["id"]))
-    resp = requests.post(url, json={"signature": signature})
+    resp = (session or requests).post(url, json={"signature": signature})
     return utils.response_else_exception(resp)
@@ -5,13 +5,22 @@ Authentication is not required for these endpoints.
 """
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from pyswitcheo import instrumentation
 from pyswitcheo import utils
+from pyswitcheo.candles import candles_to_columns
 from pyswitcheo.internal.urls import tickers
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of candles requested in a single call to the candlesticks end point.
+MAX_CANDLES_PER_REQUEST = 1000
 
-def _get_candle_sticks(base_url, pair, start_time, end_time, interval):
+# Default number of chunks of a long time range fetched concurrently.
+DEFAULT_CANDLE_WORKERS = 4
+
+
+def _get_candle_sticks(base_url, pair, start_time, end_time, interval, session=None):
     """Get candlestick chart data filtered by url parameters.
 
     Args:
@@ -20,6 +29,7 @@ def _get_candle_sticks(base_url, pair, start_time, end_time, interval):
         start_time (int)   : Start of time range for data in epoch seconds
         end_time (int)	   : End of time range for data in epoch seconds
         interval (int)	   : Candlestick period in minutes Possible values are: 1, 5, 30, 60, 360, 1440
+        session (requests.Session) : Optional pooled session to send the request with.
 
 
     Returns:
@@ -55,11 +65,75 @@ def _get_candle_sticks(base_url, pair, start_time, end_time, interval):
         "end_time": end_time,
         "interval": interval,
     }
-    resp = requests.get(url, params=params)
+    resp = (session or requests).get(url, params=params)
     return utils.response_else_exception(resp)
 
 
-def __get_prices(url, symbols=None, bases=None):
+def _split_time_range(start_time, end_time, interval, max_candles=MAX_CANDLES_PER_REQUEST):
+    """Split [start_time, end_time] into consecutive ranges holding at most max_candles candles each.
+
+    Args:
+        start_time (int)  : Start of time range in epoch seconds
+        end_time (int)    : End of time range in epoch seconds
+        interval (int)    : Candlestick period in minutes
+        max_candles (int) : Maximum number of candles per range.
+    Returns:
+        list of (start_time, end_time) tuples
+    """
+    span = interval * 60 * max_candles
+    chunks = []
+    chunk_start = start_time
+    while chunk_start <= end_time:
+        chunk_end = min(chunk_start + span - 1, end_time)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + 1
+    return chunks
+
+
+def _get_candle_sticks_array(base_url, pair, start_time, end_time, interval, fixed8=False,
+                             max_candles=MAX_CANDLES_PER_REQUEST, max_workers=DEFAULT_CANDLE_WORKERS,
+                             executor=None, session=None):
+    """Get candlestick chart data of any time range as typed columns.
+
+    The range is split in chunks of at most max_candles candles which are fetched concurrently and
+    stitched back together, sorted by time and without duplicated candles at the chunk boundaries.
+
+    Args:
+        base_url (str)     : This paramter governs whether to connect to test or mainnet.
+        pair (str)         : Show chart data of this trading pair
+        start_time (int)   : Start of time range for data in epoch seconds
+        end_time (int)     : End of time range for data in epoch seconds
+        interval (int)     : Candlestick period in minutes Possible values are: 1, 5, 30, 60, 360, 1440
+        fixed8 (bool)      : Whether to return the prices as int64 Fixed8 units instead of float64.
+        max_candles (int)  : Maximum number of candles requested per call.
+        max_workers (int)  : Number of chunks fetched concurrently when no executor is given.
+        executor (concurrent.futures.Executor) : Optional executor to fetch the chunks on.
+        session (requests.Session) : Optional pooled session to send the requests with.
+
+    Returns:
+        pyswitcheo.candles.CandleSticks object
+    """
+    def fetch(chunk):
+        resp = _get_candle_sticks(base_url, pair, chunk[0], chunk[1], interval, session=session)
+        return utils.response_to_json(resp)
+
+    chunks = _split_time_range(start_time, end_time, interval, max_candles=max_candles)
+    if len(chunks) <= 1:
+        results = [fetch(chunk) for chunk in chunks]
+    elif executor is not None:
+        results = list(executor.map(instrumentation.bind_context(fetch), chunks))
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            results = list(pool.map(instrumentation.bind_context(fetch), chunks))
+
+    candles = {}
+    for result in results:
+        for candle in result:
+            candles[int(candle["time"])] = candle
+    return candles_to_columns([candles[key] for key in sorted(candles)], fixed8=fixed8)
+
+
+def __get_prices(url, symbols=None, bases=None, session=None):
     """."""
     params = {}
     if symbols:
@@ -68,34 +142,37 @@ def __get_prices(url, symbols=None, bases=None):
     if bases:
         params["bases"] = bases
 
-    logger.debug("Sending params in this request {params}".format(params=params))
-    resp = requests.get(url, params=params)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sending params in this request {params}".format(params=params))
+    resp = (session or requests).get(url, params=params)
     return utils.response_else_exception(resp)
 
 
-def _get_last_twenty_four_hours(base_url):
+def _get_last_twenty_four_hours(base_url, session=None):
     """Get 24-hour data for all pairs and markets.
 
     Args:
         base_url (str)  : This paramter governs whether to connect to test or mainnet.
+        session (requests.Session) : Optional pooled session to send the request with.
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
 
     """
     url = utils.format_urls(base_url, tickers.LAST_TWENTY_FOUR_HOURS)
-    return __get_prices(url)
+    return __get_prices(url, session=session)
 
 
-def _get_last_price(base_url, symbols=None):
+def _get_last_price(base_url, symbols=None, session=None):
     """Get last price of given symbol(s). Defaults to all symbols.
 
     Args:
         base_url (str)       : This paramter governs whether to connect to test or mainnet..
         symbols (list[str])  : Return the price for these symbols for eg. ["SWTH"]
+        session (requests.Session) : Optional pooled session to send the request with.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
 
     """
     url = utils.format_urls(base_url, tickers.LAST_PRICE)
-    return __get_prices(url, symbols)
+    return __get_prices(url, symbols, session=session)
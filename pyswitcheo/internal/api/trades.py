@@ -5,15 +5,32 @@ This happens when an incoming order matches an offer on the opposite side of the
 Trades can be seen on the Trade History column on Switcheo Exchange.
 """
 import logging
+import calendar
 import requests
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pyswitcheo import utils
+from pyswitcheo.candles import _column
 from pyswitcheo.internal.urls import trades
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of trades returned by a single call to the list trades end point.
+MAX_TRADES_PAGE = 10000
+
+# Columns of TradeColumns besides the ids, and their array typecodes.
+TRADE_FIELDS = ("event_time", "fill_amount", "take_amount", "is_buy")
+TRADE_TYPES = {"event_time": "q", "fill_amount": "q", "take_amount": "q", "is_buy": "b"}
+
+# Trades of a time range sorted by event_time (epoch millis), ids as a list of str.
+TradeColumns = namedtuple("TradeColumns", ("id",) + TRADE_FIELDS)
+
 
 def _list_trades(
-    base_url, contract_hash, pair, from_time=None, to_time=None, limit=None
+    base_url, contract_hash, pair, from_time=None, to_time=None, limit=None, session=None
 ):
     """Retrieve trades that have already occurred on Switcheo Exchange filtered by the request parameters.
 
@@ -24,6 +41,7 @@ def _list_trades(
         from_time (int)     : Only return trades after this time in epoch seconds.
         to_time (int)       : Only return trades before this time in epoch seconds.
         limit (int)         : Only return this number of trades (min: 1, max: 10000, default: 5000).
+        session (requests.Session) : Optional pooled session to send the request with.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
@@ -55,5 +73,128 @@ def _list_trades(
         "to": to_time,
         "limit": limit,
     }
-    resp = requests.get(url, params=params)
+    resp = (session or requests).get(url, params=params)
     return utils.response_else_exception(resp)
+
+
+def _event_time_to_epoch(event_time):
+    """Convert the event_time of a trade, for eg. 2018-06-08T11:32:03.219Z, to epoch seconds (floored)."""
+    fmt = "%Y-%m-%dT%H:%M:%S.%fZ" if "." in event_time else "%Y-%m-%dT%H:%M:%SZ"
+    return calendar.timegm(datetime.strptime(event_time, fmt).utctimetuple())
+
+
+def _event_time_to_millis(event_time):
+    """Convert the event_time of a trade, for eg. 2018-06-08T11:32:03.219Z, to epoch milliseconds."""
+    fmt = "%Y-%m-%dT%H:%M:%S.%fZ" if "." in event_time else "%Y-%m-%dT%H:%M:%SZ"
+    parsed = datetime.strptime(event_time, fmt)
+    return calendar.timegm(parsed.utctimetuple()) * 1000 + parsed.microsecond // 1000
+
+
+def _trades_to_arrays(trade_list):
+    """Return the ids and the array.array columns of trades returned by the list trades end point."""
+    arrays = {"event_time": array("q", [_event_time_to_millis(trade["event_time"]) for trade in trade_list]),
+              "fill_amount": array("q", [int(trade["fill_amount"]) for trade in trade_list]),
+              "take_amount": array("q", [int(trade["take_amount"]) for trade in trade_list]),
+              "is_buy": array("b", [bool(trade["is_buy"]) for trade in trade_list])}
+    return [trade["id"] for trade in trade_list], arrays
+
+
+def _clip_trades(ids, arrays, start, end):
+    """Return the ids and arrays of the trades, sorted oldest first, with an event_time in [start, end) seconds."""
+    times = arrays["event_time"]
+    lo, hi = bisect_left(times, start * 1000), bisect_left(times, end * 1000)
+    return ids[lo:hi], {field: arrays[field][lo:hi] for field in TRADE_FIELDS}
+
+
+def _iter_trade_pages(base_url, contract_hash, pair, start=None, end=None, page_size=MAX_TRADES_PAGE,
+                      prefetch=False, session=None):
+    """Page backwards through the trades of a time range, yielding one list of new trades per page.
+
+    The end point returns the newest trades first. Every following page ends on the second of the
+    oldest trade received so far, trades of that second which were already yielded are dropped.
+    With prefetch the next page is requested on a background thread as soon as a page is received,
+    while the caller is still processing it.
+
+    Args:
+        base_url (str)      : This paramter governs whether to connect to test or mainnet.
+        contract_hash (str) : Only return trades for this contract hash.
+        pair (str)          : Only return trades for this pair.
+        start (int)         : Only return trades after this time in epoch seconds.
+        end (int)           : Only return trades before this time in epoch seconds.
+        page_size (int)     : Number of trades to request per call (min: 1, max: 10000).
+        prefetch (bool)     : Whether to fetch the next page in the background.
+        session (requests.Session) : Optional pooled session to send the request with.
+    """
+    def fetch(to_time):
+        resp = _list_trades(base_url, contract_hash, pair, from_time=start, to_time=to_time, limit=page_size,
+                            session=session)
+        return utils.response_to_json(resp)
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending = None
+    to_time, seen = end, set()
+    try:
+        page = fetch(to_time)
+        while page:
+            next_to_time = None
+            if len(page) >= page_size:
+                oldest = _event_time_to_epoch(page[-1]["event_time"])
+                # "to" only has a resolution of seconds, so ask again for the second of the oldest trade.
+                next_to_time = oldest + 1
+                if to_time is not None and next_to_time >= to_time:
+                    # A whole page within the same second, move on to make progress.
+                    logger.warning("More than {0} trades within second {1}, some of them are skipped".format(
+                        page_size, oldest))
+                    next_to_time = to_time - 1
+                if executor is not None:
+                    pending = executor.submit(fetch, next_to_time)
+
+            trades_page = [trade for trade in page if trade["id"] not in seen]
+            seen = {trade["id"] for trade in page}
+            if trades_page:
+                yield trades_page
+
+            if next_to_time is None:
+                break
+            to_time = next_to_time
+            page = pending.result() if pending is not None else fetch(to_time)
+            pending = None
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _iter_trades(base_url, contract_hash, pair, start=None, end=None, page_size=MAX_TRADES_PAGE,
+                 prefetch=False, session=None):
+    """Lazily yield every trade of a time range, newest first, fetching it page by page.
+
+    Only one page (two with prefetch) is held in memory at a time. See _iter_trade_pages for the arguments.
+
+    Returns:
+        generator of the trade dicts returned by the list trades end point.
+    """
+    for page in _iter_trade_pages(base_url, contract_hash, pair, start=start, end=end, page_size=page_size,
+                                  prefetch=prefetch, session=session):
+        for trade in page:
+            yield trade
+
+
+def _get_trades_array(base_url, contract_hash, pair, start, end, session=None):
+    """Get the trades of a time range as typed columns, oldest first.
+
+    Args:
+        base_url (str)      : This paramter governs whether to connect to test or mainnet.
+        contract_hash (str) : Only return trades for this contract hash.
+        pair (str)          : Only return trades for this pair.
+        start (int)         : Only return trades at or after this time in epoch seconds.
+        end (int)           : Only return trades before this time in epoch seconds.
+        session (requests.Session) : Optional pooled session to send the requests with.
+    Returns:
+        TradeColumns object sorted by event_time, oldest first.
+    """
+    fetched = list(_iter_trades(base_url, contract_hash, pair, start=start, end=end, session=session))
+    fetched.reverse()
+    ids, arrays = _clip_trades(*_trades_to_arrays(fetched), start=start, end=end)
+    return TradeColumns(ids, **{field: _column(TRADE_TYPES[field], arrays[field]) for field in TRADE_FIELDS})
@@ -11,18 +11,18 @@ put on hold until the withdrawal has been fully executed.
 import logging
 import requests
 from pyswitcheo import utils
+from pyswitcheo import tracing
 from pyswitcheo.serialization import sign_msg
 from pyswitcheo.internal.urls import withdrawals
-from pyswitcheo.crypto_utils import (
-    encode_msg,
-    get_private_key_from_wif,
-    get_script_hash_from_wif,
-)
+from pyswitcheo.crypto_utils import encode_msg
+from pyswitcheo.signer import as_signer
 
 logger = logging.getLogger(__name__)
 
 
-def _create_withdrawal(base_url, priv_key_wif, asset_id, amount, contract_hash, blockchain="NEO"):
+@tracing.traced()
+def _create_withdrawal(base_url, priv_key_wif, asset_id, amount, contract_hash, blockchain="NEO", session=None,
+                       token_cache=None, clock=None):
     """Creates a withdrawal which can be executed later through execute_withdrawal.
 
     To be able to make a withdrawal, sufficient funds are required in the contract balance.
@@ -30,11 +30,14 @@ def _create_withdrawal(base_url, priv_key_wif, asset_id, amount, contract_hash,
 
     Args:
         base_url (str)      : This paramter governs whether to connect to test or mainnet..
-        priv_key_wif (str)      : The private key wif of the user.
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
         asset_id (str)      : The asset symbol or ID to withdraw. for eg. SWTH
         amount (int)        : Amount of tokens to withdraw.
         contract_hash (str) : Switcheo Exchange contract hash to execute the withdraw on.
         blockchain (str)    : Blockchain that the token to withdraw is on. Possible values are: neo.
+        session (requests.Session) : Optional pooled session to send the request with.
+        token_cache (TokenInfoCache) : Optional cache of the exchange token metadata.
+        clock (ExchangeClock) : Optional clock synchronized with the exchange to timestamp the payload.
 
     Returns:
         An id representing this transaction
@@ -47,28 +50,32 @@ def _create_withdrawal(base_url, priv_key_wif, asset_id, amount, contract_hash,
     signable_params = {
         "blockchain": blockchain,
         "asset_id": asset_id,
-        "amount": utils.convert_to_neo_asset_amount(amount, asset_id, base_url),
-        "timestamp": utils.get_current_epoch_milli(),
+        "amount": utils.convert_to_neo_asset_amount(amount, asset_id, base_url, session=session,
+                                                    token_cache=token_cache),
+        "timestamp": utils.get_current_epoch_milli(clock=clock),
         "contract_hash": contract_hash,
     }
     signable_params_json_str = utils.jsonify(signable_params)
 
     # The withdrawer's address. Do not include this in the parameters to be signed.
-    script_hash = get_script_hash_from_wif(priv_key_wif)
+    signer = as_signer(priv_key_wif)
+    script_hash = signer.script_hash
 
-    pk = get_private_key_from_wif(priv_key_wif)
+    pk = signer.private_key
     encoded_msg = encode_msg(signable_params_json_str)
     signature = sign_msg(encoded_msg, pk)
 
     params = {**signable_params, "signature": signature, "address": script_hash}
 
-    logger.debug("Params being sent to create withdrawal: {0}".format(params))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Params being sent to create withdrawal: {0}".format(params))
     url = utils.format_urls(base_url, withdrawals.CREATE_WITHDRAWAL)
-    resp = requests.post(url, json=params)
+    resp = (session or requests).post(url, json=params)
     return utils.response_else_exception(resp)
 
 
-def _execute_withdrawal(base_url, withdrawal, priv_key_wif):
+@tracing.traced()
+def _execute_withdrawal(base_url, withdrawal, priv_key_wif, session=None, clock=None):
     """This is the second endpoint required to execute a withdrawal.
 
     After using the Create Withdrawal endpoint, you will receive a response which requires additional signing.
@@ -79,26 +86,30 @@ def _execute_withdrawal(base_url, withdrawal, priv_key_wif):
     Args:
         base_url (str)    : This paramter governs whether to connect to test or mainnet.
         withdrawal (dict) : Withdrawal is the json object returned after executing create_withdrawal end point.
-        priv_key_wif (str)    : The private key of the user. (wif)
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        session (requests.Session) : Optional pooled session to send the request with.
+        clock (ExchangeClock) : Optional clock synchronized with the exchange to timestamp the payload.
 
     Returns:
         If response from the server is HTTP_OK (200) then this returns the requests.response object
 
     """
-    logger.debug("Withdrawal invoke transaction is {0}".format(utils.jsonify(withdrawal)))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Withdrawal invoke transaction is {0}".format(utils.jsonify(withdrawal)))
 
-    pk = get_private_key_from_wif(priv_key_wif)
+    pk = as_signer(priv_key_wif).private_key
 
     signable_params = {
         "id": withdrawal["id"],
-        "timestamp": utils.get_current_epoch_milli()
+        "timestamp": utils.get_current_epoch_milli(clock=clock)
     }
     signable_params_json_str = utils.jsonify(signable_params)
     encoded_signable_params = encode_msg(signable_params_json_str)
     signature = sign_msg(encoded_signable_params, pk)
 
     params = {"signature": signature, **signable_params}
-    logger.debug("Final params being sent to execute withdrawal {0}".format(params))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final params being sent to execute withdrawal {0}".format(params))
     url = utils.format_urls(base_url, withdrawals.EXECUTE_WITHDRAWAL.format(id=withdrawal["id"]))
-    resp = requests.post(url, json=params)
+    resp = (session or requests).post(url, json=params)
     return utils.response_else_exception(resp)
@@ -0,0 +1,221 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Local order book maintained from successive list_offers snapshots."""
+
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from pyswitcheo.datatypes.fixed8 import FIXED8_SCALE, Fixed8, round_half_even
+
+# Sides of the order book.
+BID, ASK = "bid", "ask"
+
+# An offer of the book with its price in Fixed8 units and its remaining quantity in units of the base asset.
+BookOffer = namedtuple("BookOffer", ["id", "side", "price", "quantity", "offer"])
+
+# Offers added, removed and changed between two snapshots, as lists of BookOffer.
+OrderBookDiff = namedtuple("OrderBookDiff", ["added", "removed", "changed"])
+
+
+class _Ladder(object):
+    """Price levels of one side of the book.
+
+    Prices and the cumulative quantities are kept in parallel arrays of signed 64 bit integers sorted
+    from the best price outwards, the quantity of every level is also indexed by price.
+    """
+
+    __slots__ = ("descending", "levels", "prices", "cumulative")
+
+    def __init__(self, descending):
+        self.descending = descending
+        self.levels = {}
+        self.prices = array("q")
+        self.cumulative = array("q")
+
+    def add(self, price, quantity):
+        self.levels[price] = self.levels.get(price, 0) + quantity
+
+    def remove(self, price, quantity):
+        remaining = self.levels[price] - quantity
+        if remaining:
+            self.levels[price] = remaining
+        else:
+            del self.levels[price]
+
+    def rebuild(self):
+        prices = sorted(self.levels, reverse=self.descending)
+        cumulative = array("q")
+        total = 0
+        for price in prices:
+            total += self.levels[price]
+            cumulative.append(total)
+        self.prices = array("q", prices)
+        self.cumulative = cumulative
+
+    def index_through(self, price):
+        """Return the number of levels priced at or better than price."""
+        if self.descending:
+            # Prices are stored best (highest) first, search on the negated ordering.
+            lo, hi = 0, len(self.prices)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.prices[mid] >= price:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+        return bisect_right(self.prices, price)
+
+
+class OrderBook(object):
+    """Order book of one pair rebuilt incrementally from the results of SwitcheoApi.list_offers.
+
+    For a pair BASE_QUOTE, asks are offers of the base asset and bids are offers of the quote asset.
+    Prices are expressed in Fixed8 units of quote per base (price * 10^8 as an int) and quantities in
+    the smallest unit of the base asset, so every query works on plain integers.
+
+    Example:
+        book = OrderBook("SWTH_NEO")
+        diff = book.update(api.list_offers("neo", "SWTH_NEO", contract_hash))
+        book.best_bid(), book.best_ask(), book.depth_at_price(ASK, book.best_ask())
+    """
+
+    def __init__(self, pair):
+        """Initialize an empty book.
+
+        Args:
+            pair (str) : The pair of the offers, for eg. SWTH_NEO
+        """
+        self.pair = pair
+        self.base, self.quote = pair.split("_", 1)
+        self._offers = {}
+        self._ladders = {BID: _Ladder(descending=True), ASK: _Ladder(descending=False)}
+
+    def _to_book_offer(self, offer):
+        """Convert an offer of the list_offers response to a BookOffer, None if it has no price."""
+        offer_amount, want_amount = int(offer["offer_amount"]), int(offer["want_amount"])
+        available = int(offer["available_amount"])
+        if offer_amount == 0 or want_amount == 0:
+            # Dust or fully filled offers have no price and nothing to take, they are left out of the book.
+            return None
+        if offer["offer_asset"] == self.base:
+            price = round_half_even(want_amount * FIXED8_SCALE, offer_amount)
+            return BookOffer(offer["id"], ASK, price, available, offer)
+        if offer["offer_asset"] == self.quote:
+            price = round_half_even(offer_amount * FIXED8_SCALE, want_amount)
+            quantity = round_half_even(available * want_amount, offer_amount)
+            return BookOffer(offer["id"], BID, price, quantity, offer)
+        raise ValueError("Offer {0} does not belong to the pair {1}".format(offer["id"], self.pair))
+
+    def _insert(self, book_offer):
+        self._offers[book_offer.id] = book_offer
+        self._ladders[book_offer.side].add(book_offer.price, book_offer.quantity)
+
+    def _delete(self, book_offer):
+        del self._offers[book_offer.id]
+        self._ladders[book_offer.side].remove(book_offer.price, book_offer.quantity)
+
+    def update(self, offers):
+        """Apply a new snapshot of the offers and return what changed since the previous one.
+
+        Args:
+            offers (list|requests.Response) : The result of SwitcheoApi.list_offers, parsed or not.
+        Returns:
+            OrderBookDiff of BookOffer objects. Changed offers are reported with their new state.
+        """
+        if hasattr(offers, "json"):
+            offers = offers.json()
+
+        snapshot = {}
+        for offer in offers:
+            book_offer = self._to_book_offer(offer)
+            if book_offer is not None:
+                snapshot[book_offer.id] = book_offer
+
+        added, removed, changed = [], [], []
+        for offer_id, previous in list(self._offers.items()):
+            if offer_id not in snapshot:
+                self._delete(previous)
+                removed.append(previous)
+
+        touched = set()
+        for offer_id, book_offer in snapshot.items():
+            previous = self._offers.get(offer_id)
+            if previous is None:
+                added.append(book_offer)
+            elif previous.offer != book_offer.offer:
+                self._delete(previous)
+                changed.append(book_offer)
+                touched.add(previous.side)
+            else:
+                continue
+            self._insert(book_offer)
+            touched.add(book_offer.side)
+
+        touched.update(offer.side for offer in removed)
+        for side in touched:
+            self._ladders[side].rebuild()
+        return OrderBookDiff(added, removed, changed)
+
+    def offer(self, offer_id):
+        """Return the BookOffer with the given id, or None."""
+        return self._offers.get(offer_id)
+
+    def __len__(self):
+        return len(self._offers)
+
+    def prices(self, side):
+        """Return the price levels of a side, best first, as an array of Fixed8 units."""
+        return self._ladders[side].prices
+
+    def best_bid(self):
+        """Return the highest bid price in Fixed8 units, or None if there are no bids."""
+        prices = self._ladders[BID].prices
+        return prices[0] if prices else None
+
+    def best_ask(self):
+        """Return the lowest ask price in Fixed8 units, or None if there are no asks."""
+        prices = self._ladders[ASK].prices
+        return prices[0] if prices else None
+
+    def spread(self):
+        """Return the difference between the best ask and the best bid, or None if a side is empty."""
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def depth_at_price(self, side, price):
+        """Return the quantity resting at exactly this price.
+
+        Args:
+            side (str)              : BID or ASK.
+            price (int|str|Fixed8)  : Price in Fixed8 units, or a Fixed8/numeric string which is converted.
+        """
+        return self._ladders[side].levels.get(_price_units(price), 0)
+
+    def cumulative_depth(self, side, levels=None, price=None):
+        """Return the total quantity of the best levels of a side.
+
+        Args:
+            side (str)   : BID or ASK.
+            levels (int) : Number of levels from the best price to sum up.
+            price (int|str|Fixed8) : Alternatively, sum up all the levels at or better than this price.
+        Returns:
+            (int) quantity in units of the base asset.
+        """
+        ladder = self._ladders[side]
+        if price is not None:
+            count = ladder.index_through(_price_units(price))
+        elif levels is not None:
+            count = min(levels, len(ladder.cumulative))
+        else:
+            count = len(ladder.cumulative)
+        return ladder.cumulative[count - 1] if count > 0 else 0
+
+
+def _price_units(price):
+    """Return a price as an int of Fixed8 units."""
+    if isinstance(price, int):
+        return price
+    return Fixed8(price).raw
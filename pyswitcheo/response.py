@@ -0,0 +1,26 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Response objects returned by the pooled session."""
+
+import requests
+from pyswitcheo import utils
+
+
+class SwitcheoResponse(requests.Response):
+    """A requests.Response whose json body is parsed lazily, at most once.
+
+    The first call to json() (or utils.response_to_json) parses the body, with orjson when it is
+    installed, and every following call returns the same object. It should therefore not be mutated.
+    """
+
+    def json(self, **kwargs):
+        """Return the parsed json body, memoized. Keyword arguments fall back to requests' own parsing."""
+        if kwargs:
+            return super().json(**kwargs)
+        return utils.response_to_json(self)
+
+    @classmethod
+    def cast(cls, response):
+        """Turn a requests.Response into a SwitcheoResponse in place and return it."""
+        response.__class__ = cls
+        return response
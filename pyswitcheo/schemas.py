@@ -2,6 +2,11 @@
 # -*- coding: utf-8 -*-
 """This module can be used to validate incoming response from Switcheo API server."""
 
+import itertools
+import functools
+from jsonschema.validators import validator_for
+from pyswitcheo import utils
+
 
 LIST_TRADES_SCHEMA = {
     "type": "array",
@@ -90,3 +95,71 @@ CREATE_ORDER_RESPONSE_SCHEMA = {
         "makes": {"type": "array"},
     },
 }
+
+
+# Schemas of the responses checked by SwitcheoApi, keyed by the end point they are returned from.
+RESPONSE_SCHEMAS = {
+    "list_trades": LIST_TRADES_SCHEMA,
+    "create_withdrawal": CREATE_WITHDRAWAL_SCHEMA,
+    "create_deposit": CREATE_DEPOSIT_SCHEMA,
+    "create_order": CREATE_ORDER_RESPONSE_SCHEMA,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_validator(endpoint):
+    """Return the compiled validator for the response schema of an end point.
+
+    The schema is checked and the validator built only once per end point.
+
+    Args:
+        endpoint (str) : One of the keys of RESPONSE_SCHEMAS.
+    Returns:
+        jsonschema validator instance
+    """
+    schema = RESPONSE_SCHEMAS[endpoint]
+    validator_cls = validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+class ResponseValidator(object):
+    """Validates responses against their end point schema, optionally only 1 in every N of them."""
+
+    def __init__(self, sample_rate=1):
+        """Initialize the validator.
+
+        Args:
+            sample_rate (int) : Validate one response out of every sample_rate responses per end point.
+        """
+        if sample_rate < 1:
+            raise ValueError("sample_rate should be >= 1, received {0}".format(sample_rate))
+        self.sample_rate = sample_rate
+        self._counters = {endpoint: itertools.count() for endpoint in RESPONSE_SCHEMAS}
+
+    def should_validate(self, endpoint):
+        """Return True if the next response of this end point falls in the sample."""
+        counter = self._counters.get(endpoint)
+        if counter is None:
+            return False
+        return next(counter) % self.sample_rate == 0
+
+    def validate(self, endpoint, json_obj):
+        """Validate an already parsed response.
+
+        Raises:
+            jsonschema.ValidationError in case the response does not match the schema.
+        """
+        if self.should_validate(endpoint):
+            get_validator(endpoint).validate(json_obj)
+        return json_obj
+
+    def validate_response(self, endpoint, response):
+        """Validate a requests.Response, parsing its body only when it falls in the sample.
+
+        Raises:
+            jsonschema.ValidationError in case the response does not match the schema.
+        """
+        if self.should_validate(endpoint):
+            get_validator(endpoint).validate(utils.response_to_json(response))
+        return response
@@ -2,8 +2,12 @@
 # -*- coding: utf-8 -*-
 """Crypto related wrapper functions."""
 
+import struct
 import logging
+from itertools import repeat
 import pyswitcheo.crypto_utils as cutils
+from pyswitcheo import instrumentation
+from pyswitcheo import tracing
 from neocore.Cryptography.Crypto import Crypto
 from pyswitcheo.datatypes.fixed8 import Fixed8
 from pyswitcheo.datatypes.transaction_types import (
@@ -17,6 +21,9 @@ logger = logging.getLogger(__name__)
 
 MAX_TRANSACTION_ATTRIBUTE_SIZE = 65535
 
+# The length of a DescriptionUrl (0x81) attribute is written on a single byte.
+MAX_DESCRIPTION_URL_SIZE = 255
+
 
 def serialize_transaction_output(output):
     """Serialize an object of type TransactionOutput
@@ -53,12 +60,12 @@ def serialize_transaction_input(input):
     Returns:
         (str) serialized version of TransactionInput
     """
-    logger.debug("serialize_transaction_input")
-    logger.debug(cutils.reverse_hex(input.prevHash))
-    logger.debug(cutils.reverse_hex(cutils.num_to_hex_string(input.prevIndex, 2)))
-    return cutils.reverse_hex(input.prevHash) + cutils.reverse_hex(
+    serialized = cutils.reverse_hex(input.prevHash) + cutils.reverse_hex(
         cutils.num_to_hex_string(input.prevIndex, 2)
     )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Serialized transaction input {0}".format(serialized))
+    return serialized
 
 
 def serialize_claim_exclusive():
@@ -112,11 +119,12 @@ def serialize_witness(witness):
     Returns:
         (str) serialized version of witness
     """
-    invo_len = cutils.num_to_var_int(len(witness.invocationScript) / 2)
-    veri_len = cutils.num_to_var_int(len(witness.verificationScript) / 2)
+    invo_len = cutils.num_to_var_int(len(witness.invocationScript) // 2)
+    veri_len = cutils.num_to_var_int(len(witness.verificationScript) // 2)
     return invo_len + witness.invocationScript + veri_len + witness.verificationScript
 
 
+@tracing.traced()
 def sign_transaction(transaction, priv_key):
     """Sign a transaction object returned as a part of any transaction creation using user's private key.
 
@@ -126,10 +134,12 @@ def sign_transaction(transaction, priv_key):
     Returns:
         A signed transaction string
     """
-    serialized_tx_msg = serialize_transaction(tx=transaction, signed=False)
+    serialized_tx_msg = serialize_transaction_bytes(tx=transaction, signed=False).hex()
     return sign_msg(serialized_tx_msg, priv_key)
 
 
+@tracing.traced()
+@instrumentation.phase(instrumentation.SIGNING)
 def sign_msg(msg, priv_key):
     """Sign a given message using a private key.
 
@@ -163,9 +173,9 @@ def serialize_transaction_attribute(attr):
 
     out = cutils.num_to_hex_string(attr.usage)
     if attr.usage == 0x81:
-        out += cutils.num_to_hex_string(attr_len / 2)
+        out += cutils.num_to_hex_string(_description_url_size(attr.data))
     elif attr.usage == 0x90 or attr.usage >= 0xf0:
-        out += cutils.num_to_var_int(attr_len / 2)
+        out += cutils.num_to_var_int(attr_len // 2)
 
     if (attr.usage == 0x02) or (attr.usage == 0x03):
         out += attr.data[2:64]
@@ -175,6 +185,7 @@ def serialize_transaction_attribute(attr):
     return out
 
 
+@instrumentation.phase(instrumentation.SERIALIZATION)
 def serialize_transaction(tx, signed=True):
     """Serialize a transaction object
 
@@ -221,19 +232,132 @@ def serialize_transaction(tx, signed=True):
             witness = Witness(**script)
             out += serialize_witness(witness)
 
-    logger.debug("Final serialized transaction message to sign {0}".format(out))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final serialized transaction message to sign {0}".format(out))
     return out.strip()
 
 
-def sign_array(input_arr, priv_key):
+@tracing.traced()
+@instrumentation.phase(instrumentation.SIGNING)
+def sign_array(input_arr, priv_key, executor=None):
     """Sign each item in an input array.
 
     Args:
         input_arr (dict) : An input array with transaction objects. This is a dictionary with "txn" key in it.
+        priv_key (bytes) : Private key to be used to sign this.
+        executor (concurrent.futures.Executor) : Optional executor used to sign all the transactions concurrently.
     Returns:
         A dictionary of signed objects, where key is the id of each element in the input_arr.
     """
-    signed_map = {}
-    for item in input_arr:
-        signed_map[item["id"]] = sign_transaction(item["txn"], priv_key)
-    return signed_map
+    if executor is None:
+        signed_map = {}
+        for item in input_arr:
+            signed_map[item["id"]] = sign_transaction(item["txn"], priv_key)
+        return signed_map
+
+    ids = [item["id"] for item in input_arr]
+    signatures = executor.map(sign_transaction, [item["txn"] for item in input_arr], repeat(priv_key, len(ids)))
+    return dict(zip(ids, signatures))
+
+
+# Fixed size layouts of a TransactionInput (prevHash, prevIndex) and a TransactionOutput (assetId, value, scriptHash)
+_INPUT_STRUCT = struct.Struct("<32sH")
+_OUTPUT_STRUCT = struct.Struct("<32sq20s")
+
+
+def _var_int_bytes(num):
+    """Bytes counterpart of crypto_utils.num_to_var_int."""
+    if num < 0xfd:
+        return bytes((num,))
+    elif num <= 0xffff:
+        return b"\xfd" + struct.pack("<H", num)
+    elif num <= 0xffffffff:
+        # num_to_var_int writes three bytes after the prefix, keep the output identical to it.
+        return b"\xfe" + struct.pack("<I", num)[:3]
+    return b"\xff" + struct.pack("<Q", num)
+
+
+def _var_bytes(hex_data):
+    """Return the var int length prefix followed by the bytes of a hex string."""
+    data = bytes.fromhex(hex_data)
+    return _var_int_bytes(len(data)) + data
+
+
+def _description_url_size(data):
+    """Return the size in bytes of the hex data of a DescriptionUrl attribute, which has to fit in one byte."""
+    size = len(data) // 2
+    if size > MAX_DESCRIPTION_URL_SIZE:
+        raise ValueError("DescriptionUrl attribute data is {0} bytes, it cannot exceed {1} bytes".format(
+            size, MAX_DESCRIPTION_URL_SIZE))
+    return size
+
+
+def _attribute_bytes(usage, data):
+    """Bytes counterpart of serialize_transaction_attribute."""
+    if len(data) > MAX_TRANSACTION_ATTRIBUTE_SIZE:
+        raise Exception(
+            "Attribute data size is beyond max attribute size {0}".format(MAX_TRANSACTION_ATTRIBUTE_SIZE)
+        )
+    out = bytearray((usage,))
+    if usage == 0x81:
+        out.append(_description_url_size(data))
+    elif usage == 0x90 or usage >= 0xf0:
+        out += _var_int_bytes(len(data) // 2)
+    out += bytes.fromhex(data[2:64] if usage in (0x02, 0x03) else data)
+    return out
+
+
+@instrumentation.phase(instrumentation.SERIALIZATION)
+def serialize_transaction_bytes(tx, signed=True):
+    """Serialize a transaction object to raw bytes.
+
+    This gives the same output as bytes.fromhex(serialize_transaction(tx, signed)), but writes every
+    field straight into a single buffer instead of concatenating hex strings.
+
+    Args:
+        tx (dict)     : Transaction object returned after creating a deposit, withdrawal, order or cancellation.
+        signed (bool) : Whether to include the witness scripts.
+    Returns:
+        (bytes) serialized transaction
+    """
+    buf = bytearray((tx["type"], tx["version"]))
+
+    if tx["type"] != 0xd1:
+        raise TypeError("Only TransactionInvocation (0xd1) is supported, got {0}.".format(tx["type"]))
+    buf += _var_bytes(tx["script"])
+    if tx["version"] >= 1:
+        buf += Fixed8(tx["gas"]).to_bytes_le()
+
+    attributes = tx["attributes"]
+    buf += _var_int_bytes(len(attributes))
+    for attr in attributes:
+        buf += _attribute_bytes(attr["usage"], attr["data"])
+
+    # Inputs and outputs have a fixed size, reserve their space once and pack them in place.
+    tx_ins = tx["inputs"]
+    buf += _var_int_bytes(len(tx_ins))
+    offset = len(buf)
+    buf += bytes(_INPUT_STRUCT.size * len(tx_ins))
+    for tx_in in tx_ins:
+        _INPUT_STRUCT.pack_into(buf, offset, bytes.fromhex(tx_in["prevHash"])[::-1], tx_in["prevIndex"])
+        offset += _INPUT_STRUCT.size
+
+    tx_outs = tx["outputs"]
+    buf += _var_int_bytes(len(tx_outs))
+    offset = len(buf)
+    buf += bytes(_OUTPUT_STRUCT.size * len(tx_outs))
+    for output in tx_outs:
+        _OUTPUT_STRUCT.pack_into(buf, offset,
+                                 bytes.fromhex(output["assetId"])[::-1],
+                                 Fixed8(output["value"]).raw,
+                                 bytes.fromhex(output["scriptHash"])[::-1])
+        offset += _OUTPUT_STRUCT.size
+
+    tx_scripts = tx["scripts"]
+    if signed and tx_scripts:
+        buf += _var_int_bytes(len(tx_scripts))
+        for script in tx_scripts:
+            buf += _var_bytes(script["invocationScript"])
+            buf += _var_bytes(script["verificationScript"])
+
+    return bytes(buf)
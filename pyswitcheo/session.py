@@ -0,0 +1,347 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Pooled HTTP transport shared by every call made through SwitcheoApi."""
+
+import time
+import email.utils
+import random
+import logging
+import threading
+import requests
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from pyswitcheo import instrumentation
+from pyswitcheo import tracing
+from pyswitcheo.internal.urls import exchange
+from pyswitcheo.response import SwitcheoResponse
+
+logger = logging.getLogger(__name__)
+
+# Number of keep-alive connections kept open per host.
+DEFAULT_POOL_SIZE = 10
+
+# Longest Retry-After in seconds which RetryPolicy waits for by default.
+DEFAULT_MAX_RETRY_AFTER = 30.0
+
+# Endpoint classes used to pick the rate limit of a request.
+PUBLIC, ACCOUNT, TRADING = "public", "account", "trading"
+
+# Path prefixes of the public market data end points, relative to the api version.
+_PUBLIC_PREFIXES = ("/tickers", "/offers", "/trades", "/exchange")
+
+
+def endpoint_class(method, url):
+    """Return the endpoint class of a request: trading for writes, public or account for reads.
+
+    Args:
+        method (str) : HTTP method of the request.
+        url (str)    : Full url of the request.
+    """
+    if method.upper() != "GET":
+        return TRADING
+    path = urlparse(url).path
+    # Strip the api version, for eg. /v2/tickers/last_price -> /tickers/last_price
+    path = "/" + path.lstrip("/").partition("/")[2]
+    return PUBLIC if path.startswith(_PUBLIC_PREFIXES) else ACCOUNT
+
+
+def _parse_retry_after(value):
+    """Return the number of seconds to wait from a Retry-After header, in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy(object):
+    """Jittered exponential backoff for the idempotent requests which hit a transient error.
+
+    The n-th retry waits a random time between 0 and min(max_backoff, backoff_factor * 2 ** n) seconds
+    ("full jitter"), unless the response carries a Retry-After header which is then honoured. A Retry-After
+    longer than max_retry_after is not waited for, the response is returned to the caller instead.
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.25, max_backoff=10.0, statuses=(429, 500, 503),
+                 methods=("GET", "HEAD", "OPTIONS"), max_retry_after=DEFAULT_MAX_RETRY_AFTER):
+        """Initialize the policy.
+
+        Args:
+            max_retries (int)      : Maximum number of retries of a request.
+            backoff_factor (float) : Base delay in seconds of the exponential backoff.
+            max_backoff (float)    : Maximum delay in seconds computed by the backoff.
+            statuses (tuple[int])  : HTTP status codes which are retried.
+            methods (tuple[str])   : Idempotent HTTP methods which can safely be retried.
+            max_retry_after (float) : Longest Retry-After in seconds which is waited for before retrying.
+        """
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def get_delay(self, method, response, attempt):
+        """Return the seconds to wait before retrying, or None if the response should be returned.
+
+        Args:
+            method (str)                : HTTP method of the request.
+            response (requests.Response): The response received.
+            attempt (int)               : Number of retries already made.
+        """
+        if attempt >= self.max_retries or response.status_code not in self.statuses:
+            return None
+        if method.upper() not in self.methods:
+            return None
+        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            # Do not block the calling thread for as long as the server asks, for eg. a day.
+            return retry_after if retry_after <= self.max_retry_after else None
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+
+class TokenBucket(object):
+    """Thread safe token bucket allowing bursts of capacity requests and rate requests per second."""
+
+    def __init__(self, rate, capacity=None):
+        """Initialize a full bucket.
+
+        Args:
+            rate (float)   : Number of tokens added per second.
+            capacity (int) : Maximum number of tokens, defaults to one second worth of tokens.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return the seconds to wait before it is actually available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Wait until a token is available and take it."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimiter(object):
+    """Client side rate limiting with one token bucket per endpoint class."""
+
+    def __init__(self, limits, classify=endpoint_class):
+        """Initialize the limiter.
+
+        Args:
+            limits (dict)       : Endpoint class to (requests per second, burst), for eg. {"trading": (5, 10)}.
+                                  Classes missing from the dict are not limited.
+            classify (callable) : Returns the endpoint class of (method, url).
+        """
+        self.classify = classify
+        self.buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in limits.items()}
+
+    def acquire(self, method, url):
+        """Wait until the request is allowed by the limit of its endpoint class."""
+        bucket = self.buckets.get(self.classify(method, url))
+        if bucket is not None:
+            bucket.acquire()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    """HTTPConnection reporting its DNS resolution and TCP handshake to the instrumentation."""
+
+    def connect(self):
+        with instrumentation.timed(instrumentation.CONNECT):
+            super().connect()
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    """HTTPSConnection reporting its DNS resolution, TCP and TLS handshakes to the instrumentation."""
+
+    def connect(self):
+        with instrumentation.timed(instrumentation.CONNECT):
+            super().connect()
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class SwitcheoAdapter(HTTPAdapter):
+    """Pooled HTTPAdapter building SwitcheoResponse objects, which parse their json body only once.
+
+    Its connections report the time spent opening them to the instrumentation.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                   "https": _TimedHTTPSConnectionPool}
+
+    def build_response(self, req, resp):
+        return SwitcheoResponse.cast(super().build_response(req, resp))
+
+
+class _InFlight(object):
+    """A GET request being sent on behalf of every caller asking for the same url and params."""
+
+    __slots__ = ("event", "response", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+        self.error = None
+
+
+# Keyword arguments of a GET request which still allow it to be shared with identical requests.
+_COALESCABLE_KWARGS = frozenset(["params", "allow_redirects"])
+
+# Paths of the GETs which are never shared, a reused timestamp would skew the exchange clock.
+_UNCOALESCABLE_PATHS = (exchange.GET_TIMESTAMP,)
+
+# Number of fresh responses kept before the expired ones are purged.
+_MAX_FRESH_RESPONSES = 1024
+
+
+def _request_key(url, params):
+    """Return a hashable key identifying a GET request by its url and params."""
+    if params is None:
+        items = ()
+    elif isinstance(params, dict):
+        items = tuple(sorted((str(key), str(value)) for key, value in params.items() if value is not None))
+    else:
+        items = tuple(params) if not isinstance(params, (str, bytes)) else (params,)
+    return url, items
+
+
+class SwitcheoSession(requests.Session):
+    """A requests.Session with a keep-alive connection pool mounted for http and https.
+
+    Reusing the same session across calls avoids a fresh TCP+TLS handshake on every request.
+    Every request first waits for the rate limit of its endpoint class, and idempotent requests
+    failing with a transient error are retried according to the retry policy.
+
+    With coalescing enabled, concurrent GETs with the same url and params share a single network
+    call and the very same response object, and with a freshness window a successful response is
+    also reused by the identical GETs sent within that window. The exchange timestamp is always fetched.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, pool_block=False, retry=None, rate_limits=None,
+                 coalesce=False, freshness=0, wire_log=None):
+        """Initialize the session and mount the pooled adapters.
+
+        Args:
+            pool_size (int)   : Maximum number of connections to keep alive per host.
+            pool_block (bool) : Whether to block when no free connection is available in the pool,
+                                instead of opening a throw-away connection.
+            retry (RetryPolicy) : Retry policy of the requests, defaults to RetryPolicy(). False disables retries.
+            rate_limits (dict)  : Optional endpoint class to (requests per second, burst), see RateLimiter.
+            coalesce (bool)     : Whether concurrent identical GETs share one network call.
+            freshness (float)   : Seconds for which a successful GET response is reused by identical GETs.
+            wire_log (pyswitcheo.wirelog.WireLog) : Optional ring buffer capturing a sample of the requests.
+        """
+        super().__init__()
+        self.pool_size = pool_size
+        self.pool_block = pool_block
+        self.retry = RetryPolicy() if retry is None else retry or None
+        self.rate_limiter = RateLimiter(rate_limits) if rate_limits else None
+        self.coalesce = coalesce or bool(freshness)
+        self.freshness = freshness
+        self.wire_log = wire_log
+        self._coalesce_lock = threading.Lock()
+        self._in_flight = {}
+        self._fresh = {}
+        adapter = SwitcheoAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=pool_block)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        """Send a request, waiting for the rate limit and retrying transient errors of idempotent requests."""
+        if self.coalesce and not args and method.upper() == "GET" and _COALESCABLE_KWARGS.issuperset(kwargs) \
+                and not urlparse(url).path.rstrip("/").endswith(_UNCOALESCABLE_PATHS):
+            return self._coalesced(_request_key(url, kwargs.get("params")), method, url, **kwargs)
+        return self._send(method, url, *args, **kwargs)
+
+    def _coalesced(self, key, method, url, **kwargs):
+        """Send a GET unless an identical one is in flight or fresh, in which case its response is returned."""
+        with self._coalesce_lock:
+            fresh = self._fresh.get(key)
+            if fresh is not None and fresh[1] > time.monotonic():
+                return fresh[0]
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _InFlight()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.response
+
+        try:
+            response = self._send(method, url, **kwargs)
+            # Read the body before sharing the response across threads.
+            response.content
+            call.response = response
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._coalesce_lock:
+                del self._in_flight[key]
+                if self.freshness and call.response is not None and call.response.ok:
+                    self._remember(key, call.response)
+            call.event.set()
+        return response
+
+    def _remember(self, key, response):
+        """Keep a response for the freshness window, must be called with the coalesce lock held."""
+        now = time.monotonic()
+        if len(self._fresh) >= _MAX_FRESH_RESPONSES:
+            self._fresh = {k: v for k, v in self._fresh.items() if v[1] > now}
+        self._fresh[key] = (response, now + self.freshness)
+
+    def _send(self, method, url, *args, **kwargs):
+        """Send a request through the rate limiter and the retry policy."""
+        attempt, start = 0, time.perf_counter()
+        with tracing.span("HTTP " + method.upper(), {"http.method": method.upper(), "http.url": url}) as span:
+            while True:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(method, url)
+                with instrumentation.timed(instrumentation.HTTP):
+                    response = super().request(method, url, *args, **kwargs)
+                delay = self.retry.get_delay(method, response, attempt) if self.retry is not None else None
+                if delay is None:
+                    instrumentation.record_request(method, url, response.status_code, attempt,
+                                                   time.perf_counter() - start)
+                    span.set_attribute("http.status_code", response.status_code)
+                    span.set_attribute("http.retry_count", attempt)
+                    if self.wire_log is not None:
+                        self.wire_log.capture(method, response, attempt, time.perf_counter() - start,
+                                              body=not kwargs.get("stream"))
+                    return response
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("{0} {1} returned {2}, retrying in {3:.3f}s".format(
+                        method, url, response.status_code, delay))
+                response.close()
+                time.sleep(delay)
+                attempt += 1
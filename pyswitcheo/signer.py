@@ -0,0 +1,97 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Key material of an account derived once from its WIF."""
+
+import threading
+from collections import OrderedDict
+from neocore.KeyPair import KeyPair
+from pyswitcheo import instrumentation
+from pyswitcheo.crypto_utils import get_script_hash_from_address
+
+
+class Signer(object):
+    """Holds the private key, public key, address and script hash derived from a WIF.
+
+    Deriving these requires an EC point multiplication and a base58 round trip, so a Signer should be
+    built once and passed to every API call in place of the WIF.
+    """
+
+    __slots__ = ("private_key", "public_key", "address", "script_hash")
+
+    def __init__(self, wif):
+        """Derive the key material.
+
+        Args:
+            wif (str) : The private key wif of the user.
+        """
+        with instrumentation.timed(instrumentation.KEY_DERIVATION):
+            keypair = KeyPair(KeyPair.PrivateKeyFromWIF(wif))
+            self.private_key = bytes(keypair.PrivateKey)
+            self.public_key = keypair.PublicKey.encode_point(True).decode()
+            self.address = keypair.GetAddress()
+            self.script_hash = get_script_hash_from_address(self.address)
+
+    def __repr__(self):
+        return "Signer(address={0!r})".format(self.address)
+
+
+class SignerCache(object):
+    """Opt-in cache of the Signers built from WIFs, least recently used first out.
+
+    The cache holds the WIFs and the decoded private keys in memory until they are evicted or clear()
+    is called, so it is only used when explicitly created, for eg. by SwitcheoApi(cache_signers=True).
+    """
+
+    def __init__(self, maxsize=128):
+        """Initialize the cache.
+
+        Args:
+            maxsize (int) : Maximum number of Signers kept.
+        """
+        self.maxsize = maxsize
+        self._signers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, wif):
+        """Return the Signer of a WIF, building it on the first call.
+
+        Args:
+            wif (str) : The private key wif of the user.
+        Returns:
+            Signer object
+        """
+        with self._lock:
+            signer = self._signers.get(wif)
+            if signer is not None:
+                self._signers.move_to_end(wif)
+                return signer
+        signer = Signer(wif)
+        with self._lock:
+            self._signers[wif] = signer
+            while len(self._signers) > self.maxsize:
+                self._signers.popitem(last=False)
+        return signer
+
+    def clear(self):
+        """Drop every cached Signer and the key material it holds."""
+        with self._lock:
+            self._signers.clear()
+
+    def __len__(self):
+        return len(self._signers)
+
+
+def as_signer(priv_key_wif, cache=None):
+    """Return a Signer for either a WIF or an already built Signer.
+
+    Args:
+        priv_key_wif (str|Signer) : The private key wif of the user, or a Signer built from it.
+        cache (SignerCache) : Optional cache to reuse the Signer of a WIF from, a new one is built otherwise.
+    Returns:
+        Signer object
+    """
+    if isinstance(priv_key_wif, Signer):
+        return priv_key_wif
+    if cache is not None:
+        return cache.get(priv_key_wif)
+    return Signer(priv_key_wif)
@@ -0,0 +1,249 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Persistent local cache of the candlesticks and trades, which cannot change once their period is over.
+
+The history is split in fixed time buckets. A bucket is written to disk only once it is closed, so a
+range is served from disk for every closed bucket and only the missing or still open buckets are
+fetched from the exchange.
+
+Every bucket is one file made of a small header followed by the raw little endian columns, one after
+the other, so it can be read with a single call or memory mapped:
+
+    candles/<pair>/<interval>/<bucket start>.bin : time, open, close, high, low (int64, prices in Fixed8
+                                                   units), volume, quote_volume (float64)
+    trades/<contract hash>/<pair>/<bucket start>.bin : event_time (int64 epoch millis), fill_amount,
+                                                       take_amount (int64), is_buy (int8), ids (utf-8,
+                                                       newline separated)
+"""
+
+import os
+import re
+import sys
+import time
+import struct
+import logging
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from pyswitcheo import instrumentation
+from pyswitcheo import utils
+from pyswitcheo.candles import CANDLE_FIELDS, PRICE_FIELDS, _column, arrays_to_columns, candles_to_arrays
+from pyswitcheo.internal.api import tickers
+from pyswitcheo.internal.api import trades
+from pyswitcheo.internal.api.trades import TRADE_FIELDS, TRADE_TYPES, TradeColumns
+
+logger = logging.getLogger(__name__)
+
+# Number of candles held by one bucket, so that a bucket is fetched with a single request.
+CANDLES_PER_BUCKET = tickers.MAX_CANDLES_PER_REQUEST
+
+# Number of seconds of trades held by one bucket.
+TRADES_BUCKET_SECONDS = 86400
+
+# Number of seconds after the end of a trades bucket before it is considered closed.
+TRADES_SETTLE_SECONDS = 60
+
+_HEADER = struct.Struct("<4sI")
+_CANDLES_MAGIC = b"PSC1"
+_TRADES_MAGIC = b"PST1"
+_CANDLE_TYPES = {field: "q" if field == "time" or field in PRICE_FIELDS else "d" for field in CANDLE_FIELDS}
+
+# Pairs and contract hashes become directory names, they are limited to these characters.
+_PATH_COMPONENT = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+
+def _path_component(value, name):
+    """Return value as a directory name, rejecting anything which could point outside of the store."""
+    value = str(value)
+    if not _PATH_COMPONENT.match(value):
+        raise ValueError("Invalid {0} {1!r}, only letters, digits, _ and - are allowed".format(name, value))
+    return value
+
+
+def _write_bucket(path, magic, count, arrays, tail=b""):
+    """Atomically write a bucket file made of the header, the columns and an optional tail."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # A temp file of its own per writer, concurrent writers of the same bucket never share one.
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(magic, count))
+            for col in arrays:
+                if sys.byteorder != "little":  # pragma: no cover
+                    col = array(col.typecode, col)
+                    col.byteswap()
+                f.write(col.tobytes())
+            f.write(tail)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_bucket(path, magic, typecodes):
+    """Read a bucket file, returning the columns and the remaining bytes, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    file_magic, count = _HEADER.unpack_from(data)
+    if file_magic != magic:
+        raise ValueError("{0} is not a pyswitcheo bucket file".format(path))
+    offset = _HEADER.size
+    columns = []
+    for typecode in typecodes:
+        col = array(typecode)
+        size = col.itemsize * count
+        col.frombytes(data[offset:offset + size])
+        if sys.byteorder != "little":  # pragma: no cover
+            col.byteswap()
+        columns.append(col)
+        offset += size
+    return columns, data[offset:]
+
+
+class MarketDataStore(object):
+    """On disk cache for the candlesticks and the trades of one exchange.
+
+    Example:
+        store = MarketDataStore("~/.pyswitcheo", "https://api.switcheo.network/v2")
+        candles = store.get_candle_sticks("SWTH_NEO", 1531215240, 1533807240, 5)
+    """
+
+    def __init__(self, path, base_url, session=None, clock=time.time, max_workers=tickers.DEFAULT_CANDLE_WORKERS):
+        """Initialize the store.
+
+        Args:
+            path (str)                 : Directory holding the cached buckets, created if missing.
+            base_url (str)             : This paramter governs whether to connect to test or mainnet.
+            session (requests.Session) : Optional pooled session to send the requests with.
+            clock (callable)           : Returns the current time in epoch seconds, to tell open buckets apart.
+            max_workers (int)          : Number of missing buckets fetched concurrently.
+        """
+        self.base_url = base_url
+        self.path = os.path.join(os.path.expanduser(path), urlparse(base_url).netloc or "default")
+        self.session = session
+        self.clock = clock
+        self.max_workers = max_workers
+
+    def _fetch_all(self, fetch, buckets):
+        """Fetch several buckets, concurrently if there is more than one."""
+        if len(buckets) <= 1:
+            return [fetch(bucket) for bucket in buckets]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(buckets))) as pool:
+            return list(pool.map(instrumentation.bind_context(fetch), buckets))
+
+    def _candles_path(self, pair, interval, bucket):
+        return os.path.join(self.path, "candles", _path_component(pair, "pair"), str(int(interval)),
+                            "{0}.bin".format(int(bucket)))
+
+    def _load_candles(self, pair, interval, bucket_starts, span):
+        """Return the arrays of every bucket, reading the closed ones from disk and fetching the others."""
+        loaded, missing = {}, []
+        for bucket in bucket_starts:
+            result = _read_bucket(self._candles_path(pair, interval, bucket), _CANDLES_MAGIC,
+                                  [_CANDLE_TYPES[field] for field in CANDLE_FIELDS])
+            if result is None:
+                missing.append(bucket)
+            else:
+                loaded[bucket] = dict(zip(CANDLE_FIELDS, result[0]))
+
+        def fetch(bucket):
+            resp = tickers._get_candle_sticks(self.base_url, pair, bucket, bucket + span - 1, interval,
+                                              session=self.session)
+            candles = sorted(utils.response_to_json(resp), key=lambda candle: int(candle["time"]))
+            return candles_to_arrays(candles)
+
+        closed_before = self.clock() - interval * 60
+        for bucket, arrays in zip(missing, self._fetch_all(fetch, missing)):
+            loaded[bucket] = arrays
+            if bucket + span <= closed_before:
+                _write_bucket(self._candles_path(pair, interval, bucket), _CANDLES_MAGIC, len(arrays["time"]),
+                              [arrays[field] for field in CANDLE_FIELDS])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Candles {0} {1}: {2} buckets from disk, {3} fetched".format(
+                pair, interval, len(bucket_starts) - len(missing), len(missing)))
+        return [loaded[bucket] for bucket in bucket_starts]
+
+    def get_candle_sticks(self, pair, start_time, end_time, interval, fixed8=False):
+        """Get the candles of a time range, only fetching the buckets which are not on disk yet.
+
+        Args:
+            pair (str)         : Show chart data of this trading pair
+            start_time (int)   : Start of time range for data in epoch seconds
+            end_time (int)     : End of time range for data in epoch seconds (inclusive)
+            interval (int)     : Candlestick period in minutes Possible values are: 1, 5, 30, 60, 360, 1440
+            fixed8 (bool)      : Whether to return the prices as int64 Fixed8 units instead of float64.
+        Returns:
+            pyswitcheo.candles.CandleSticks object
+        """
+        span = interval * 60 * CANDLES_PER_BUCKET
+        bucket_starts = list(range(start_time - start_time % span, end_time + 1, span))
+
+        arrays = {field: array(_CANDLE_TYPES[field]) for field in CANDLE_FIELDS}
+        for bucket_arrays in self._load_candles(pair, interval, bucket_starts, span):
+            times = bucket_arrays["time"]
+            lo, hi = bisect_left(times, start_time), bisect_right(times, end_time)
+            for field in CANDLE_FIELDS:
+                arrays[field].extend(bucket_arrays[field][lo:hi])
+        return arrays_to_columns(arrays, fixed8=fixed8)
+
+    def _trades_path(self, contract_hash, pair, bucket):
+        return os.path.join(self.path, "trades", _path_component(contract_hash, "contract hash"),
+                            _path_component(pair, "pair"), "{0}.bin".format(int(bucket)))
+
+    def _load_trades(self, contract_hash, pair, bucket_starts):
+        """Return (ids, arrays) of every bucket, reading the closed ones from disk and fetching the others."""
+        loaded, missing = {}, []
+        for bucket in bucket_starts:
+            result = _read_bucket(self._trades_path(contract_hash, pair, bucket), _TRADES_MAGIC,
+                                  [TRADE_TYPES[field] for field in TRADE_FIELDS])
+            if result is None:
+                missing.append(bucket)
+            else:
+                columns, tail = result
+                ids = tail.decode("utf-8").split("\n") if columns[0] else []
+                loaded[bucket] = (ids, dict(zip(TRADE_FIELDS, columns)))
+
+        def fetch(bucket):
+            # The end point returns the newest trades first, they are stored oldest first.
+            fetched = list(trades._iter_trades(self.base_url, contract_hash, pair, start=bucket,
+                                               end=bucket + TRADES_BUCKET_SECONDS, session=self.session))
+            fetched.reverse()
+            # Keep the trades of the bucket only, a trade at its end is the first one of the next bucket.
+            return trades._clip_trades(*trades._trades_to_arrays(fetched), start=bucket,
+                                       end=bucket + TRADES_BUCKET_SECONDS)
+
+        closed_before = self.clock() - TRADES_SETTLE_SECONDS
+        for bucket, (ids, arrays) in zip(missing, self._fetch_all(fetch, missing)):
+            loaded[bucket] = (ids, arrays)
+            if bucket + TRADES_BUCKET_SECONDS <= closed_before:
+                _write_bucket(self._trades_path(contract_hash, pair, bucket), _TRADES_MAGIC, len(ids),
+                              [arrays[field] for field in TRADE_FIELDS], "\n".join(ids).encode("utf-8"))
+        return [loaded[bucket] for bucket in bucket_starts]
+
+    def get_trades(self, contract_hash, pair, start, end):
+        """Get the trades of a time range, only fetching the buckets which are not on disk yet.
+
+        Args:
+            contract_hash (str) : Only return trades for this contract hash.
+            pair (str)          : Only return trades for this pair.
+            start (int)         : Only return trades at or after this time in epoch seconds.
+            end (int)           : Only return trades before this time in epoch seconds.
+        Returns:
+            TradeColumns object sorted by event_time, oldest first.
+        """
+        bucket_starts = list(range(start - start % TRADES_BUCKET_SECONDS, end, TRADES_BUCKET_SECONDS))
+
+        ids, arrays = [], {field: array(TRADE_TYPES[field]) for field in TRADE_FIELDS}
+        for bucket_ids, bucket_arrays in self._load_trades(contract_hash, pair, bucket_starts):
+            times = bucket_arrays["event_time"]
+            lo, hi = bisect_left(times, start * 1000), bisect_left(times, end * 1000)
+            ids.extend(bucket_ids[lo:hi])
+            for field in TRADE_FIELDS:
+                arrays[field].extend(bucket_arrays[field][lo:hi])
+        return TradeColumns(ids, **{field: _column(TRADE_TYPES[field], arrays[field]) for field in TRADE_FIELDS})
@@ -0,0 +1,103 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Cache for the token metadata published by the exchange."""
+
+import time
+import logging
+import threading
+from pyswitcheo import utils
+from pyswitcheo.internal.api import exchange
+
+logger = logging.getLogger(__name__)
+
+# Number of seconds the token metadata is considered fresh.
+DEFAULT_TOKEN_CACHE_TTL = 300
+
+
+class TokenInfoCache(object):
+    """Time based cache for the response of the exchange tokens end point.
+
+    The decimals of every token are indexed by the lowercased symbol and by the lowercased asset hash,
+    so both "SWTH" and "ab38352559b8b203bde5fddfa0b07d8b2525e132" resolve to the same precision
+    without reparsing the token list.
+    """
+
+    def __init__(self, base_url, session=None, ttl=DEFAULT_TOKEN_CACHE_TTL):
+        """Initialize the cache.
+
+        Args:
+            base_url (str)             : This paramter governs whether to connect to test or mainnet.
+            session (requests.Session) : Optional pooled session to send the request with.
+            ttl (float)                : Seconds after which the metadata is fetched again. None never expires.
+        """
+        self.base_url = base_url
+        self.session = session
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tokens = None
+        self._decimals = {}
+        self._expires_at = 0.0
+
+    def _is_fresh(self):
+        if self._tokens is None:
+            return False
+        return self.ttl is None or time.monotonic() < self._expires_at
+
+    def refresh(self):
+        """Fetch the token metadata from the exchange and rebuild the decimals index."""
+        response = exchange._get_contract_tokens_info(self.base_url, session=self.session)
+        tokens = utils.response_to_json(response)
+
+        decimals = {}
+        for symbol, info in tokens.items():
+            decimals[str(symbol).lower()] = info["decimals"]
+            if info.get("hash"):
+                decimals[str(info["hash"]).lower()] = info["decimals"]
+
+        with self._lock:
+            self._tokens = tokens
+            self._decimals = decimals
+            self._expires_at = time.monotonic() + (self.ttl or 0)
+        return tokens
+
+    def invalidate(self):
+        """Drop the cached metadata, the next lookup fetches it again."""
+        with self._lock:
+            self._tokens = None
+            self._decimals = {}
+            self._expires_at = 0.0
+
+    def tokens(self):
+        """Return the cached response of the tokens end point, fetching it if stale."""
+        if not self._is_fresh():
+            return self.refresh()
+        return self._tokens
+
+    def get_decimals(self, asset_id):
+        """Return the precision of a token given its symbol or asset hash.
+
+        An unknown asset triggers one refresh in case the token was listed after the cache was filled.
+
+        Args:
+            asset_id (str) : The asset symbol or ID, for eg. SWTH
+        Returns:
+            (int) number of decimals of the asset
+        Raises:
+            KeyError in case the exchange does not know about the asset.
+        """
+        asset_id = str(asset_id).lower()
+        refreshed = False
+        if not self._is_fresh():
+            self.refresh()
+            refreshed = True
+
+        decimals = self._decimals.get(asset_id)
+        if decimals is None and not refreshed:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Asset {0} not found in token cache, refreshing".format(asset_id))
+            self.refresh()
+            decimals = self._decimals.get(asset_id)
+
+        if decimals is None:
+            raise KeyError(asset_id)
+        return decimals
@@ -0,0 +1,271 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Optional tracing of the SwitcheoApi calls, disabled unless a tracer is passed to the client.
+
+Every call opens a parent span, for eg SwitcheoApi.create_order, with child spans for the steps of the
+create/execute flows (_create_order, sign_array, sign_transaction, _execute_order, ...) and one span per
+HTTP request carrying its method, url, status and number of retries.
+
+The tracer only needs a start_as_current_span(name, attributes=None) method returning a context manager,
+so an OpenTelemetry tracer can be passed as is:
+
+    client = SwitcheoApi(base_url, tracer=opentelemetry.trace.get_tracer("pyswitcheo"))
+
+Tracer together with InMemorySpanExporter records the spans locally, for tests and offline analysis:
+
+    exporter = InMemorySpanExporter()
+    client = SwitcheoApi(base_url, tracer=Tracer(exporter))
+    client.create_order(...)
+    for span in exporter.get_finished_spans():
+        print(span.name, span.duration)
+"""
+
+import os
+import time
+import functools
+import threading
+
+# Status of a span, as in OpenTelemetry.
+UNSET = "UNSET"
+OK = "OK"
+ERROR = "ERROR"
+
+
+class _Local(threading.local):
+    """Active tracer of the current thread and the innermost span opened by a Tracer."""
+
+    tracer = None
+    span = None
+
+
+_local = _Local()
+
+if hasattr(time, "time_ns"):
+    _now_ns = time.time_ns
+else:  # Python 3.6
+    def _now_ns():
+        return int(time.time() * 1e9)
+
+
+class Span(object):
+    """A timed operation recorded by Tracer, timestamps are in epoch nanoseconds like in OpenTelemetry."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_time", "end_time", "attributes", "status",
+                 "events", "_tracer")
+
+    def __init__(self, tracer, name, parent=None, attributes=None):
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else int.from_bytes(os.urandom(16), "big")
+        self.span_id = int.from_bytes(os.urandom(8), "big")
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes or {})
+        self.status = UNSET
+        self.events = []
+        self.start_time = _now_ns()
+        self.end_time = None
+
+    def set_attribute(self, key, value):
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        """Set several attributes of the span."""
+        self.attributes.update(attributes)
+
+    def set_status(self, status, description=None):
+        """Set the status of the span, one of UNSET, OK or ERROR."""
+        self.status = status
+        if description is not None:
+            self.attributes["status.description"] = description
+
+    def record_exception(self, exception):
+        """Add an exception event to the span."""
+        self.events.append(("exception", {"exception.type": type(exception).__name__,
+                                          "exception.message": str(exception)}))
+
+    def is_recording(self):
+        """Return True until the span is ended."""
+        return self.end_time is None
+
+    def end(self):
+        """End the span and hand it to the exporter of its tracer."""
+        if self.end_time is None:
+            self.end_time = _now_ns()
+            self._tracer._export(self)
+
+    @property
+    def duration(self):
+        """Return the duration of the span in seconds, None while it is running."""
+        return (self.end_time - self.start_time) / 1e9 if self.end_time is not None else None
+
+    def __repr__(self):
+        return "Span(name={0!r}, span_id={1:016x}, parent_id={2}, duration={3!r}, status={4!r})".format(
+            self.name, self.span_id, "{0:016x}".format(self.parent_id) if self.parent_id else None, self.duration,
+            self.status)
+
+
+class _CurrentSpan(object):
+    """Context manager making a span the current one of the thread until the block exits."""
+
+    __slots__ = ("span", "previous")
+
+    def __init__(self, span):
+        self.span = span
+
+    def __enter__(self):
+        self.previous, _local.span = _local.span, self.span
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.span = self.previous
+        if exc is not None:
+            self.span.record_exception(exc)
+            self.span.set_status(ERROR, "{0}: {1}".format(exc_type.__name__, exc))
+        self.span.end()
+        return False
+
+
+class Tracer(object):
+    """Minimal tracer recording spans parented by the thread they are opened in."""
+
+    def __init__(self, exporter=None):
+        """Initialize the tracer.
+
+        Args:
+            exporter (InMemorySpanExporter) : Receives the spans once they end, anything with an export(spans)
+                                              method works.
+        """
+        self.exporter = exporter
+
+    def _export(self, span):
+        if self.exporter is not None:
+            self.exporter.export([span])
+
+    def start_span(self, name, attributes=None):
+        """Start a span child of the current one, without making it current. Call end() on it."""
+        return Span(self, name, parent=_local.span, attributes=attributes)
+
+    def start_as_current_span(self, name, attributes=None):
+        """Start a span child of the current one, current until the returned context manager exits."""
+        return _CurrentSpan(self.start_span(name, attributes=attributes))
+
+
+class InMemorySpanExporter(object):
+    """Keeps the finished spans in memory."""
+
+    def __init__(self):
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        """Record finished spans."""
+        with self._lock:
+            self._spans.extend(spans)
+
+    def get_finished_spans(self):
+        """Return the finished spans, in the order they ended."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        """Forget the recorded spans."""
+        with self._lock:
+            self._spans = []
+
+
+class _NoopSpan(object):
+    """Span returned while no tracer is active, every method does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def set_status(self, status, description=None):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+    def is_recording(self):
+        return False
+
+    def end(self):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Activation(object):
+    """Context manager making a tracer the active one of the thread until the block exits."""
+
+    __slots__ = ("tracer", "previous")
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def __enter__(self):
+        self.previous, _local.tracer = _local.tracer, self.tracer
+        return self.tracer
+
+    def __exit__(self, *exc_info):
+        _local.tracer = self.previous
+        return False
+
+
+def activate(tracer):
+    """Return a context manager making tracer the active tracer of the current thread."""
+    return _Activation(tracer)
+
+
+def span(name, attributes=None):
+    """Return a context manager opening a span with the active tracer, a no-op span if there is none."""
+    tracer = _local.tracer
+    if tracer is None:
+        return _NOOP_SPAN
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def traced(name=None):
+    """Decorate a function so that every call of it is a span of the active tracer, named after it by default."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _local.tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with tracer.start_as_current_span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind(func):
+    """Wrap func so that it is traced as a child of the current span when run on a worker thread."""
+    tracer, parent = _local.tracer, _local.span
+    if tracer is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = _local.tracer, _local.span
+        _local.tracer, _local.span = tracer, parent
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.tracer, _local.span = previous
+
+    return wrapper
@@ -7,12 +7,21 @@ import math
 import logging
 import datetime
 from http import HTTPStatus
+from pyswitcheo import instrumentation
 from pyswitcheo.errors import HTTPResponseError
 from pyswitcheo.internal.api import exchange
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 logger = logging.getLogger(__name__)
 
+# Marks a response whose body was not parsed yet, json null being a valid body.
+_NOT_PARSED = object()
+
 
 def format_urls(base_url, end_point):
     """Create a url given a base url and an end point.
@@ -24,24 +33,30 @@ def format_urls(base_url, end_point):
         A properly formatted url to query
     """
     url = '/'.join([str(base_url).strip('/'), str(end_point).strip('/')])
-    logger.debug("Url to query: {0}".format(url))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Url to query: {0}".format(url))
     return url
 
 
-def convert_to_neo_asset_amount(amount, asset_id, base_url):
+def convert_to_neo_asset_amount(amount, asset_id, base_url, session=None, token_cache=None):
     """Convert a given input to a neo asset precision.
 
     Internally this API queries the Switcheo exchange to get the correct precision
-    for a given asset.
+    for a given asset, unless a token cache is passed which already knows about it.
 
     Args:
         amount (int)   : Input amount for which precision needs to be calculated.
         asset_id (str) : A string representing the correct asset.
         base_url (str) : URL of the switcheo exchange which will return the correct decimal precision.
+        session (requests.Session) : Optional pooled session to send the request with.
+        token_cache (TokenInfoCache) : Optional cache of the exchange token metadata.
     """
+    if token_cache is not None:
+        return int(amount * math.pow(10, token_cache.get_decimals(asset_id)))
+
     # sanitize the asset_id
     asset_id = str(asset_id).lower()
-    response = exchange._get_contract_tokens_info(base_url)
+    response = exchange._get_contract_tokens_info(base_url, session=session)
     json_resp = response_to_json(response)
 
     # sanitize the json_response, i.e. all keys should be lower
@@ -54,25 +69,60 @@ def response_else_exception(response):
     """Return a response in case HTTPStatus is 200, else raise a custom exception.
     """
     if response.status_code != HTTPStatus.OK:
-        logger.debug("Response returned from the server: {0}".format(response.text))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response returned from the server: {0}".format(response.text))
         raise HTTPResponseError(response)
     return response
 
 
 def response_to_json(response):
-    """A simple wrapper to convert requests.content or requests.text to a corresponding json object."""
-    logger.debug("Original response {}".format(response.content.decode("UTF-8")))
-    json_response = json.loads(response.content.decode("UTF-8"))
-    logger.debug("Response dumped as json {0}".format(json_response))
+    """A simple wrapper to convert requests.content or requests.text to a corresponding json object.
+
+    The parsed object is memoized on the response, so a response shared by coalesced requests is parsed
+    only once and every caller receives the same object, which should not be mutated.
+    """
+    json_response = getattr(response, "_pyswitcheo_json", _NOT_PARSED)
+    if json_response is not _NOT_PARSED:
+        return json_response
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Original response {}".format(response.content.decode("UTF-8")))
+    with instrumentation.timed(instrumentation.DECODE):
+        json_response = loads_json(response.content)
+    response._pyswitcheo_json = json_response
     return json_response
 
 
+def loads_json(data):
+    """Parse a UTF-8 encoded json document, with orjson when it is installed.
+
+    Args:
+        data (bytes) : The json document.
+    Returns:
+        The parsed json object.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # For eg. integers beyond 64 bits, which the standard library handles.
+            pass
+    return json.loads(data.decode("UTF-8"))
+
+
 def jsonify(json_obj):
     """Convert a given json object to string with sorted key and without spaces."""
-    logger.debug("Json before invoking jsonify {}".format(json_obj))
-    return json.dumps(json_obj, sort_keys=True, separators=(",", ":"))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Json before invoking jsonify {}".format(json_obj))
+    with instrumentation.timed(instrumentation.SERIALIZATION):
+        return json.dumps(json_obj, sort_keys=True, separators=(",", ":"))
 
 
-def get_current_epoch_milli():
-    """Get the current time in epoch milliseconds."""
+def get_current_epoch_milli(clock=None):
+    """Get the current time in epoch milliseconds.
+
+    Args:
+        clock (ExchangeClock) : Optional clock synchronized with the exchange, the local clock is used otherwise.
+    """
+    if clock is not None:
+        return clock.now_millis()
     return int(round(datetime.datetime.now().timestamp() * 1000))
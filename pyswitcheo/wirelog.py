@@ -0,0 +1,116 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Sampled capture of the raw requests and responses exchanged with the API, kept in memory for post-mortems.
+
+Capturing a request keeps the bodies already held by requests, only copying the ones longer than the
+maximum body size, and decodes them when the records are read or dumped. A sampled request costs little
+more than an append to a bounded deque, the other ones a counter increment.
+
+Example:
+    wire_log = WireLog(capacity=500, sample_rate=100)
+    client = SwitcheoApi("https://test-api.switcheo.network", wire_log=wire_log)
+    ...
+    wire_log.dump("switcheo-wire.jsonl")
+"""
+
+import json
+import time
+import itertools
+from collections import deque, namedtuple
+
+DEFAULT_CAPACITY = 1000
+DEFAULT_SAMPLE_RATE = 100
+
+# Bodies longer than this many bytes are cut when captured.
+DEFAULT_MAX_BODY_SIZE = 64 * 1024
+
+
+def _cut(body, max_size):
+    """Return body, cut to max_size bytes or characters if longer."""
+    return body[:max_size] if body is not None and len(body) > max_size else body
+
+
+def _decode(body):
+    """Return a body as text, None if there is no body."""
+    if isinstance(body, bytes):
+        return body.decode("UTF-8", errors="replace")
+    return body
+
+
+class WireRecord(namedtuple("WireRecord", ["timestamp", "method", "url", "status", "retries", "seconds",
+                                           "request_body", "response_body"])):
+    """A request captured by WireLog, with its raw request and response bodies."""
+
+    __slots__ = ()
+
+    def to_dict(self):
+        """Return the record as a json serializable dict, with the bodies decoded."""
+        record = self._asdict()
+        record["request_body"] = _decode(self.request_body)
+        record["response_body"] = _decode(self.response_body)
+        return record
+
+
+class WireLog(object):
+    """Ring buffer of the last sampled requests of a SwitcheoSession."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, sample_rate=DEFAULT_SAMPLE_RATE, capture_errors=True,
+                 max_body_size=DEFAULT_MAX_BODY_SIZE):
+        """Initialize the wire log.
+
+        Args:
+            capacity (int)        : Number of records kept, the oldest ones are dropped first.
+            sample_rate (int)     : Capture one request out of every sample_rate requests.
+            capture_errors (bool) : Whether to also capture every response with a 4xx or 5xx status.
+            max_body_size (int)   : Bytes of every body kept, the rest is dropped.
+        """
+        if sample_rate < 1:
+            raise ValueError("sample_rate should be >= 1, received {0}".format(sample_rate))
+        self.sample_rate = sample_rate
+        self.capture_errors = capture_errors
+        self.max_body_size = max_body_size
+        self._records = deque(maxlen=capacity)
+        self._counter = itertools.count()
+
+    def should_capture(self, status):
+        """Return True if the next request falls in the sample, or failed and errors are captured."""
+        sampled = next(self._counter) % self.sample_rate == 0
+        return sampled or (self.capture_errors and status >= 400)
+
+    def capture(self, method, response, retries=0, seconds=None, body=True):
+        """Record a final response of the session if it falls in the sample.
+
+        Args:
+            method (str) : HTTP method of the request.
+            response (requests.Response) : The response, holding the prepared request.
+            retries (int)   : Number of retries the request took.
+            seconds (float) : Time taken by the request, retries included.
+            body (bool)     : Whether the response body can be read, False for streamed responses.
+        """
+        if not self.should_capture(response.status_code):
+            return
+        request_body = response.request.body if response.request is not None else None
+        response_body = response.content if body else None
+        self._records.append(WireRecord(time.time(), method.upper(), response.url, response.status_code, retries,
+                                        seconds, _cut(request_body, self.max_body_size),
+                                        _cut(response_body, self.max_body_size)))
+
+    def records(self):
+        """Return the captured records as dicts, oldest first."""
+        return [record.to_dict() for record in list(self._records)]
+
+    def clear(self):
+        """Drop every captured record."""
+        self._records.clear()
+
+    def dump(self, path):
+        """Write the captured records to path, one json object per line, and return their number."""
+        records = self.records()
+        with open(path, "w") as f:
+            for record in records:
+                f.write(json.dumps(record))
+                f.write("\n")
+        return len(records)
+
+    def __len__(self):
+        return len(self._records)
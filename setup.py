@@ -26,7 +26,8 @@ extra_requires = {
     'docs': [
         'sphinx >= 1.4',
         'sphinx_rtd_theme',
-        'Flask-Sphinx-Themes']}
+        'Flask-Sphinx-Themes'],
+    'numpy': ['numpy']}
 
 setup(
     name='pyswitcheo',
@@ -37,8 +38,8 @@ setup(
     install_requires=install_requires,
     setup_requires=['pytest-runner'],
     tests_require=test_requires,
-    extra_requires=extra_requires,
-    packages=find_packages(),
+    extras_require=extra_requires,
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*", "tests", "tests.*"]),
     zip_safe=False,
     author="Ankur Srivastava",
     author_email="best.ankur@gmail.com",
@@ -56,3 +56,111 @@ def deposit_swth_before_withdrawal(request, url):
                                       contract_hash="a195c1549e7da61b8da315765a790ac7e7633b82",
                                       blockchain="neo")
     print(deposit_response.text)
+
+
+class FakeSession(object):
+    """A stand-in for requests.Session which replays canned json bodies keyed by the url suffix.
+
+    A route value can either be a json serializable object or a callable accepting
+    (method, url, params, json) and returning one.
+    """
+
+    def __init__(self, routes=None):
+        self.routes = routes or {}
+        self.calls = []
+        self.closed = False
+
+    def get(self, url, params=None, **kwargs):
+        return self.request("GET", url, params=params, **kwargs)
+
+    def post(self, url, json=None, **kwargs):
+        return self.request("POST", url, json=json, **kwargs)
+
+    def request(self, method, url, params=None, json=None, **kwargs):
+        import json as _json
+        from requests.models import Response
+
+        self.calls.append((method, url, params, json))
+        response = Response()
+        response.url = url
+        for suffix, body in self.routes.items():
+            if url.rstrip("/").endswith(suffix.rstrip("/")):
+                if callable(body):
+                    body = body(method, url, params, json)
+                response.status_code = 200
+                response._content = _json.dumps(body).encode("UTF-8")
+                return response
+        response.status_code = 404
+        response._content = b'{"error": "not found"}'
+        return response
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClock(object):
+    """A stand-in for the time module of the modules under test, sleeping only moves the clock forward.
+
+    Every clock function reads the same value, so the durations measured in the tests are exact.
+    """
+
+    def __init__(self, monkeypatch, now=1000.0):
+        import threading
+
+        self.monkeypatch = monkeypatch
+        self.now = now
+        self._lock = threading.Lock()
+
+    def patch(self, *modules):
+        """Make modules read the time from this clock until the end of the test."""
+        for module in modules:
+            self.monkeypatch.setattr(module, "time", self)
+        return self
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = time = monotonic
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.now += seconds
+
+
+@pytest.fixture(scope="function")
+def fake_clock(monkeypatch):
+    """Returns a FakeClock, its patch(module) method replaces the time module of module with the clock."""
+    return FakeClock(monkeypatch)
+
+
+@pytest.fixture(scope="function")
+def fake_session():
+    """Returns a factory building FakeSession objects for offline tests."""
+    return FakeSession
+
+
+@pytest.fixture(scope="function")
+def sample_transaction():
+    """Returns a deposit invocation transaction as received from the create deposit end point."""
+    import copy
+    from benchmarks.fixtures import TRANSACTION
+    return copy.deepcopy(TRANSACTION)
+
+
+@pytest.fixture(scope="function")
+def trade_history():
+    """Returns 30 trades, two per second and newest first, with a route serving them like the list trades end point."""
+    import time
+    start = 1528457523
+    history = [{"id": "trade-{0}".format(i), "fill_amount": i, "take_amount": i, "is_buy": bool(i % 2),
+                "event_time": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(start + i // 2))}
+               for i in reversed(range(30))]
+
+    def list_trades(method, url, params, json):
+        from_time, to_time = params.get("from"), params.get("to")
+        seconds = [(trade, start + trade["fill_amount"] // 2) for trade in history]
+        matching = [trade for trade, second in seconds
+                    if (from_time is None or second >= from_time) and (to_time is None or second < to_time)]
+        return matching[:params["limit"]]
+
+    return history, list_trades
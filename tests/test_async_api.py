@@ -0,0 +1,93 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the asyncio client."""
+
+import asyncio
+import inspect
+import threading
+import pytest
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.async_api import AsyncSwitcheoApi
+from pyswitcheo.utils import response_to_json
+
+
+def test_async_api_mirrors_sync_api():
+    """Every public SwitcheoApi method should have a coroutine (or async generator) counterpart."""
+    public = [name for name, _ in inspect.getmembers(SwitcheoApi, inspect.isfunction) if not name.startswith("_")]
+    for name in public:
+        assert hasattr(AsyncSwitcheoApi, name), "AsyncSwitcheoApi is missing {0}".format(name)
+        if name != "close":
+            method = getattr(AsyncSwitcheoApi, name)
+            assert asyncio.iscoroutinefunction(method) or inspect.isasyncgenfunction(method), name
+
+
+@pytest.mark.asyncio
+async def test_async_api_concurrent_calls(fake_session):
+    """Concurrent coroutines should all be served through the shared session."""
+    def offers(method, url, params, json):
+        return [{"id": params["pair"], "offer_asset": "SWTH", "want_asset": "NEO",
+                 "available_amount": 1, "offer_amount": 1, "want_amount": 1}]
+
+    session = fake_session({"/offers": offers})
+    pairs = ["SWTH_NEO", "GAS_NEO", "SWTH_GAS"]
+    async with AsyncSwitcheoApi(base_url="https://test-api.switcheo.network", session=session) as client:
+        responses = await asyncio.gather(*[client.list_offers("neo", pair, "a195c1549e7da61b8da315765a790ac7e7633b82")
+                                           for pair in pairs])
+
+    assert [response_to_json(resp)[0]["id"] for resp in responses] == pairs
+    assert len(session.calls) == len(pairs)
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_async_iter_trades(fake_session, trade_history):
+    """The async iterator should yield the same trades as the synchronous one."""
+    history, route = trade_history
+    session = fake_session({"/trades": route})
+    async with AsyncSwitcheoApi(base_url="https://test-api.switcheo.network", session=session) as client:
+        iterator = client.iter_trades("a195c1549e7da61b8da315765a790ac7e7633b82", "SWTH_NEO", page_size=4)
+        ids = [trade["id"] async for trade in iterator]
+    assert ids == [trade["id"] for trade in history]
+
+
+@pytest.mark.asyncio
+async def test_async_api_runs_more_calls_than_pooled_connections(fake_session):
+    """max_workers, not pool_size, should bound the number of calls in flight."""
+    barrier = threading.Barrier(20, timeout=5)
+
+    def contracts(method, url, params, json):
+        barrier.wait()
+        return {}
+
+    session = fake_session({"/exchange/contracts": contracts})
+    async with AsyncSwitcheoApi(base_url="https://test-api.switcheo.network", session=session, pool_size=4,
+                                max_workers=20) as client:
+        await asyncio.gather(*[client.list_contracts() for _ in range(20)])
+    assert len(session.calls) == 20
+
+
+@pytest.mark.asyncio
+async def test_async_iter_trades_cancelled_while_fetching(fake_session, trade_history):
+    """Cancelling the iteration while a page is being fetched should wait for it before closing the pages."""
+    history, route = trade_history
+    fetching, release = threading.Event(), threading.Event()
+
+    def slow_route(method, url, params, json):
+        fetching.set()
+        release.wait(5)
+        return route(method, url, params, json)
+
+    async def consume(client):
+        return [trade async for trade in client.iter_trades("a195c1549e7da61b8da315765a790ac7e7633b82",
+                                                            "SWTH_NEO", page_size=4)]
+
+    session = fake_session({"/trades": slow_route})
+    async with AsyncSwitcheoApi(base_url="https://test-api.switcheo.network", session=session) as client:
+        task = asyncio.ensure_future(consume(client))
+        while not fetching.is_set():
+            await asyncio.sleep(0.001)
+        task.cancel()
+        threading.Timer(0.05, release.set).start()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert len(session.calls) == 1
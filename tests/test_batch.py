@@ -0,0 +1,107 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the pipelined batches of orders."""
+
+import threading
+from pyswitcheo import batch
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.errors import HTTPResponseError
+from pyswitcheo.signer import as_signer
+
+WIF = "L4FSnRosoUv22cCu5z7VEEGd2uQWTK7Me83vZxgQQEsJZ2MReHbu"
+CONTRACT_HASH = "a195c1549e7da61b8da315765a790ac7e7633b82"
+TOKENS = {"SWTH": {"hash": "ab38352559b8b203bde5fddfa0b07d8b2525e132", "decimals": 8}}
+
+
+def _order(price, **kwargs):
+    order = {"pair": "SWTH_NEO", "side": "buy", "price": price, "want_amount": 10, "asset_id": "SWTH",
+             "use_native_tokens": True, "contract_hash": CONTRACT_HASH}
+    order.update(kwargs)
+    return order
+
+
+def test_create_orders_pipelines_and_reports_per_order(fake_session, sample_transaction):
+    """Every order should be created, signed and broadcast on its own, errors included."""
+    lock = threading.Lock()
+
+    def create(method, url, params, json):
+        if json["price"] == "0.0003":
+            return {"error": "rejected"}
+        return {"id": "order-{0}".format(json["price"]), "fills": [],
+                "makes": [{"id": "make-{0}".format(json["price"]), "txn": sample_transaction}]}
+
+    broadcasts = []
+
+    def broadcast(method, url, params, json):
+        with lock:
+            broadcasts.append((url, json))
+        return {"id": url.split("/")[-2], "status": "processed"}
+
+    session = fake_session({"/exchange/tokens": TOKENS, "/orders": create, "/broadcast": broadcast})
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session, validate_responses=True)
+    batch = [_order("0.0001"), _order("0.0002"), _order("0.0003"), _order("0.0004", asset_id="UNKNOWN")]
+    results = client.create_orders(WIF, batch, max_workers=4)
+
+    assert [result.order for result in results] == batch
+    assert [result.ok for result in results] == [True, True, False, False]
+    assert results[0].response.json()["id"] == "order-0.0001"
+    assert isinstance(results[3].error, KeyError)
+    assert len(broadcasts) == 2
+    assert sorted(make for url, json in broadcasts for make in json["signatures"]["makes"]) == \
+        ["make-0.0001", "make-0.0002"]
+
+    # The payloads are signed with distinct nonces.
+    timestamps = [json["timestamp"] for method, url, params, json in session.calls if url.endswith("/orders")]
+    assert len(set(timestamps)) == 3
+
+
+def test_create_orders_failed_broadcast(fake_session):
+    """An http error of the broadcast should be returned as the error of the order."""
+    session = fake_session({"/exchange/tokens": TOKENS,
+                            "/orders": {"id": "order-1", "fills": [], "makes": []}})
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session)
+    result, = client.create_orders(WIF, [_order("0.0001")])
+    assert not result.ok
+    assert isinstance(result.error, HTTPResponseError)
+    assert client.create_orders(WIF, []) == []
+
+
+def test_cancel_orders_and_cancel_all(fake_session, sample_transaction):
+    """Cancellations should be created and broadcast per order, errors included."""
+    def create(method, url, params, json):
+        if json["order_id"] == "missing":
+            return {"error": "unknown order"}
+        return {"id": "cancel-{0}".format(json["order_id"]), "transaction": sample_transaction}
+
+    open_orders = [{"id": "o1", "order_status": "open", "makes": [{"available_amount": "100"}]},
+                   {"id": "o2", "order_status": "completed", "makes": [{"available_amount": "0"}]},
+                   {"id": "o3", "order_status": "cancelled", "makes": []},
+                   {"id": "o4", "makes": [{"available_amount": "0"}]}]
+    session = fake_session({"/cancellations": create, "/broadcast": {"status": "cancelled"},
+                            "/orders": open_orders})
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session)
+
+    results = client.cancel_orders(["o1", "missing"], WIF)
+    assert [(result.order_id, result.ok) for result in results] == [("o1", True), ("missing", False)]
+    assert isinstance(results[1].error, KeyError)
+
+    results = client.cancel_all(WIF, CONTRACT_HASH, pair="SWTH_NEO")
+    assert [result.order_id for result in results] == ["o1", "o4"]
+    assert all(result.ok for result in results)
+    list_params = [params for method, url, params, json in session.calls if method == "GET"]
+    assert list_params[0]["pair"] == "SWTH_NEO" and list_params[0]["order_status"] == "open"
+
+
+def test_list_open_orders_pages_until_exhausted(fake_session):
+    """The open orders should be listed page by page, each page starting before the last order of the previous one."""
+    history = [{"id": "o{0}".format(i), "order_status": "open"} for i in reversed(range(5))]
+
+    def list_orders(method, url, params, json):
+        ids = [order["id"] for order in history]
+        start = ids.index(params["before_id"]) + 1 if "before_id" in params else 0
+        return history[start:start + params["limit"]]
+
+    session = fake_session({"/orders": list_orders})
+    assert batch._list_open_orders("https://test-api.switcheo.network/v2", as_signer(WIF).address, CONTRACT_HASH,
+                                   session=session, page_size=2) == history
+    assert [params.get("before_id") for method, url, params, json in session.calls] == [None, "o3", "o1"]
@@ -0,0 +1,116 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the exchange clock synchronization."""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from pyswitcheo import utils
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.clock import ExchangeClock
+
+BASE_URL = "https://test-api.switcheo.network/v2"
+OFFSET = 90000
+
+
+def _timestamp(method, url, params, json):
+    return {"timestamp": int(time.time() * 1000) + OFFSET}
+
+
+class TimestampAdapter(BaseAdapter):
+    """Transport adapter answering every request with the current exchange timestamp."""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        response = Response()
+        response.status_code, response.url, response.request = 200, request.url, request
+        response._content = json.dumps(_timestamp("GET", request.url, None, None)).encode("UTF-8")
+        return response
+
+    def close(self):
+        pass
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_exchange_clock_estimates_offset(fake_session):
+    """The offset should be estimated once and then applied without any request."""
+    session = fake_session({"/exchange/timestamp": _timestamp})
+    clock = ExchangeClock(BASE_URL, session=session, samples=3)
+
+    assert clock.is_stale()
+    now = clock.now_millis()
+    assert abs(now - (utils.get_current_epoch_milli() + OFFSET)) < 1000
+    assert len(session.calls) == 3
+    assert clock.rtt >= 0
+
+    for _ in range(10):
+        utils.get_current_epoch_milli(clock=clock)
+    assert len(session.calls) == 3
+    assert not clock.is_stale()
+
+
+def test_exchange_clock_resyncs_in_background(fake_session):
+    """A stale offset should be refreshed in the background, keeping the last one on failure."""
+    session = fake_session({"/exchange/timestamp": _timestamp})
+    clock = ExchangeClock(BASE_URL, session=session, resync_interval=0, samples=1)
+    clock.sync()
+    time.sleep(0.01)
+
+    clock.now_millis()
+    assert _wait_for(lambda: len(session.calls) == 2)
+
+    session.routes.clear()
+    offset = clock.offset
+    time.sleep(0.01)
+    assert abs(clock.now_millis() - (utils.get_current_epoch_milli() + OFFSET)) < 1000
+    assert _wait_for(lambda: len(session.calls) == 3 and not clock._syncing)
+    assert clock.offset == offset
+
+
+def test_api_signs_with_the_exchange_clock(fake_session):
+    """Signed payloads should carry the exchange time when sync_clock is enabled."""
+    session = fake_session({"/exchange/timestamp": _timestamp, "/cancellations": {"error": "unknown order"}})
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session, sync_clock=True)
+    client.cancel_orders(["o1"], "L4FSnRosoUv22cCu5z7VEEGd2uQWTK7Me83vZxgQQEsJZ2MReHbu")
+
+    sent = [json for method, url, params, json in session.calls if url.endswith("/cancellations")][0]
+    assert abs(sent["timestamp"] - (utils.get_current_epoch_milli() + OFFSET)) < 1000
+
+
+def test_exchange_clock_bypasses_fresh_responses():
+    """A timestamp fetched earlier through a freshness window should not be reused to estimate the offset."""
+    client = SwitcheoApi("https://test-api.switcheo.network", coalesce_reads=True, freshness_ms=2000)
+    adapter = TimestampAdapter()
+    client.session.mount("https://", adapter)
+    client.get_exchange_timestamp()
+    time.sleep(0.3)
+
+    clock = ExchangeClock(client.base_url, session=client.session, samples=2)
+    assert abs(clock.sync() - OFFSET) < 100
+    assert adapter.requests == 3
+    client.close()
+
+
+def test_exchange_clock_first_sync_happens_once(fake_session):
+    """Threads asking for the first timestamp together should share one synchronization."""
+    def slow_timestamp(method, url, params, json):
+        time.sleep(0.05)
+        return _timestamp(method, url, params, json)
+
+    session = fake_session({"/exchange/timestamp": slow_timestamp})
+    clock = ExchangeClock(BASE_URL, session=session, samples=1)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: clock.now_millis(), range(4)))
+    assert len(session.calls) == 1
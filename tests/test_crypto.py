@@ -3,7 +3,9 @@
 """Tests related to crypto.py file."""
 
 
-from pyswitcheo.serialization import serialize_transaction  # , sign_msg
+import copy
+import pytest
+from pyswitcheo.serialization import serialize_transaction, serialize_transaction_bytes  # , sign_msg
 # from pyswitcheo.crypto_utils import get_private_key_from_wif, encode_msg
 
 
@@ -59,6 +61,43 @@ def test_serialize_transaction():
     assert expected_serialized == got, "Expected {0} but received {1} for input {2}".format(expected_serialized, got)
 
 
+def test_serialize_transaction_bytes():
+    """Test the bytes serializer against the expected transaction serialization."""
+    got = serialize_transaction_bytes(input_json_response["transaction"], signed=False)
+    assert bytes.fromhex(expected_serialized) == got
+
+
+@pytest.mark.parametrize("num_inputs, num_outputs", [
+    (0, 0),
+    (1, 1),
+    (10, 3),
+    (300, 300),
+])
+def test_serialize_transaction_bytes_matches_hex(num_inputs, num_outputs):
+    """The bytes serializer should match the hex serializer for any number of inputs and outputs."""
+    tx = copy.deepcopy(input_json_response["transaction"])
+    tx["inputs"] = [{"prevHash": "{0:064x}".format(i * 7919), "prevIndex": i} for i in range(num_inputs)]
+    tx["outputs"] = [dict(tx["outputs"][0], value=i / 1e8 + 0.5) for i in range(num_outputs)]
+    tx["attributes"].append({"usage": 0xf0, "data": "ab" * 300})
+    tx["scripts"] = [{"invocationScript": "40" + "ab" * 64, "verificationScript": "21" + "cd" * 33 + "ac"}]
+
+    for signed in (False, True):
+        want = serialize_transaction(tx, signed=signed)
+        got = serialize_transaction_bytes(tx, signed=signed)
+        assert bytes.fromhex(want) == got
+
+
+def test_description_url_attribute_size():
+    """A DescriptionUrl attribute longer than its one byte length allows should be rejected by both serializers."""
+    tx = copy.deepcopy(input_json_response["transaction"])
+    tx["attributes"] = [{"usage": 0x81, "data": "ab" * 255}]
+    assert bytes.fromhex(serialize_transaction(tx, signed=False)) == serialize_transaction_bytes(tx, signed=False)
+
+    tx["attributes"] = [{"usage": 0x81, "data": "ab" * 256}]
+    for serializer in (serialize_transaction, serialize_transaction_bytes):
+        with pytest.raises(ValueError, match="cannot exceed 255 bytes"):
+            serializer(tx, signed=False)
+
 # FIXME: (ansrivas)
 # def test_sign_message():
 #     """Test message signing."""
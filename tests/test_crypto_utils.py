@@ -31,6 +31,9 @@ def test_ensure_hex(input_hex, raises_exception):
     ('0101', '0101'),
     ('010111', '110101'),
     ('abcdef', 'efcdab'),
+    ('ABCDEF', 'EFCDAB'),
+    ('abc', 'cab'),
+    ('', ''),
 ])
 def test_reverse_hex(input_hex, want):
     """Check regex parsing."""
@@ -45,6 +48,9 @@ def test_num_to_hex_string():
         got = cutils.num_to_hex_string(inp)
         assert want == got, "Expected {0} but received {1} for input {2}".format(want, got, inp)
 
+    assert cutils.num_to_hex_string(47, 2, little_endian=True) == "2f00"
+    assert cutils.num_to_hex_string(0x1234, 1) == "1234"
+
     num = -1
     with pytest.raises(Exception) as excinfo:
         cutils.num_to_hex_string(num=num, size=1, little_endian=False)
@@ -65,8 +71,50 @@ def test_num_to_hex_string():
     (0xff, 'fdff00'),
     (100000, 'fea08601'),
     (4000000, 'fe00093d'),
+    (0x12345678, 'fe785634'),
+    (0x100000000, 'ff0000000001000000'),
 ])
 def test_num_to_var_int(input_hex, want):
     """Check regex parsing."""
     got = cutils.num_to_var_int(input_hex)
     assert want == got, "Expected {0} but received {1} for input {2}".format(want, got, input_hex)
+
+
+def test_address_script_hash_round_trip():
+    """Conversions should round trip and repeated addresses should hit the cache."""
+    address = "ANVLCD3xqGXKhDnrivpVFvDLcvkpgPbbMt"
+    script_hash = cutils.get_script_hash_from_address(address)
+    assert cutils.get_address_from_script_hash(script_hash) == address
+    assert cutils.addresses_to_script_hashes([address, address]) == [script_hash, script_hash]
+    assert cutils.script_hashes_to_addresses([script_hash]) == [address]
+
+    hits = cutils.get_script_hash_from_address.cache_info().hits
+    cutils.addresses_to_script_hashes([address] * 10)
+    assert cutils.get_script_hash_from_address.cache_info().hits == hits + 10
+
+
+def test_script_hash_from_address_invalid_checksum():
+    """A corrupted address should be rejected."""
+    with pytest.raises(Exception, match="invalid checksum"):
+        cutils.get_script_hash_from_address("ANVLCD3xqGXKhDnrivpVFvDLcvkpgPbbMu")
+
+
+def test_encode_msg_logs_only_at_debug_level(caplog):
+    """The message to sign should only be formatted for the logs when debug is enabled."""
+    with caplog.at_level("INFO", logger="pyswitcheo.crypto_utils"):
+        encoded = cutils.encode_msg("{}")
+    assert not caplog.records
+
+    with caplog.at_level("DEBUG", logger="pyswitcheo.crypto_utils"):
+        assert cutils.encode_msg("{}") == encoded == "010001f027b7d0000"
+    assert caplog.records[0].getMessage() == "Length of hex message 2, final message to sign : 010001f027b7d0000"
+
+
+def test_benchmark_baselines_cover_every_case():
+    """Every benchmarked primitive should have a baseline, otherwise the --check gate silently skips it."""
+    from benchmarks import bench_crypto_utils as bench
+    baselines = bench.load_baselines()
+    assert sorted(baselines) == sorted(name for name, _ in bench.CASES)
+    assert bench.regressions({"is_hex(32 bytes)": baselines["is_hex(32 bytes)"] * 1.2}, baselines) == []
+    assert bench.regressions({"is_hex(32 bytes)": baselines["is_hex(32 bytes)"] * 1.3}, baselines) == \
+        ["is_hex(32 bytes)"]
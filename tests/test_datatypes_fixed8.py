@@ -3,7 +3,9 @@
 """Tests related to datatypes Fixed8 module."""
 
 import pytest
-from pyswitcheo.datatypes.fixed8 import Fixed8
+from decimal import Decimal
+from fractions import Fraction
+from pyswitcheo.datatypes.fixed8 import Fixed8, to_fixed8_array
 
 
 @pytest.mark.parametrize("num, want", [
@@ -16,3 +18,78 @@ def test_Fixed8_num_to_fixed_8(num, want):
     """Tests for num_to_fixed_8."""
     got = Fixed8.num_to_fixed_8(num, size=8)
     assert want == got, "Expected {0} but received {1} for input {2}".format(want, got, num)
+
+
+@pytest.mark.parametrize("value, raw", [
+    (1, 100000000),
+    (0.1, 10000000),
+    (1e-08, 1),
+    ("0.00049408", 49408),
+    ("110169445.0", 11016944500000000),
+    (Decimal("92233720368.54775807"), (1 << 63) - 1),
+    ("0.000000005", 0),
+    ("0.000000015", 2),
+    (-2.5, -250000000),
+])
+def test_Fixed8_parsing(value, raw):
+    """Values should be parsed exactly, rounding half to even beyond 8 decimals."""
+    assert Fixed8(value).raw == raw
+    assert Fixed8.from_raw(raw) == Fixed8(value)
+
+
+def test_Fixed8_out_of_range():
+    """Values which do not fit in 64 bits should be rejected."""
+    with pytest.raises(OverflowError):
+        Fixed8("92233720368.54775808")
+
+
+def test_Fixed8_arithmetic_and_comparison():
+    """Fixed8 should support exact arithmetic and comparison."""
+    a, b = Fixed8("0.1"), Fixed8("0.2")
+    assert a + b == Fixed8("0.3")
+    assert b - a == a
+    assert a * 3 == Fixed8("0.3")
+    assert a * b == Fixed8("0.02")
+    assert b / 2 == a
+    assert Fixed8(1) / Fixed8(3) == Fixed8("0.33333333")
+    assert -a == Fixed8("-0.1")
+    assert a < b and b >= a and a != b
+    assert a == Fixed8(0.1) == Fixed8("0.1") and a <= 0.1 and a >= Decimal("0.1") and a < 1
+    assert sorted([b, a]) == [a, b]
+    assert str(Fixed8("-1.5")) == "-1.50000000"
+    assert Fixed8(0.1).value == "0.1"
+    assert Fixed8("0.1").to_decimal() == Decimal("0.1")
+
+
+def test_Fixed8_equality_is_consistent_with_hash_and_ordering():
+    """Numbers of the same exact value should be equal to a Fixed8 and hash alike, strings should not compare."""
+    assert Fixed8(2) == 2 and hash(Fixed8(2)) == hash(2)
+    assert Fixed8("1.5") == Fixed8(1.5) and hash(Fixed8("1.5")) == hash(Fixed8(1.5))
+    for other in (1.5, Decimal("1.5"), Fraction(3, 2)):
+        assert Fixed8("1.5") == other and hash(Fixed8("1.5")) == hash(other)
+        assert Fixed8("1.5") <= other and Fixed8("1.5") >= other
+    # 0.1 is slightly more than 1/10 as a float, only the ordering tells them apart.
+    assert Fixed8("0.1") != 0.1 and Fixed8("0.1") < 0.1
+    assert Fixed8(1) < float("inf") and Fixed8(1) != float("nan")
+    assert Fixed8("1.5") != "1.5"
+    with pytest.raises(TypeError):
+        Fixed8("1.5") <= "1.5"
+    assert len({Fixed8(1), 1, 1.0, Fixed8("1.00000000"), Fixed8("0.1"), Fixed8(0.1)}) == 2
+
+
+@pytest.mark.parametrize("num, want", [
+    (30, '005ed0b200000000'),
+    (1e-08, '0100000000000000'),
+    (-1, '001f0afaffffffff'),
+])
+def test_Fixed8_to_bytes_le(num, want):
+    """The little endian bytes should match the reverse hex representation."""
+    assert Fixed8(num).to_bytes_le() == bytes.fromhex(want)
+    assert Fixed8(num).to_reverse_hex() == want
+
+
+def test_to_fixed8_array():
+    """A list of mixed amounts should be converted to an int64 array."""
+    got = to_fixed8_array([1, "0.5", 0.25, Decimal("2"), Fixed8("0.00000001")])
+    assert got.typecode == "q"
+    assert list(got) == [100000000, 50000000, 25000000, 200000000, 1]
@@ -42,3 +42,18 @@ def test_create_and_execute_deposit(url):
                                                  deposit=deposit_json_resp,
                                                  priv_key_wif=priv_key_wif,)
     assert execute_response.status_code == HTTPStatus.OK
+
+
+def test_execute_deposit_signs_with_the_bytes_serializer(fake_session, sample_transaction, monkeypatch):
+    """The deposit transaction should be signed through serialize_transaction_bytes, like every other one."""
+    from pyswitcheo import serialization
+
+    def hex_serializer(*args, **kwargs):
+        raise AssertionError("serialize_transaction should not be used to sign")
+
+    monkeypatch.setattr(serialization, "serialize_transaction", hex_serializer)
+    session = fake_session({"/deposits/d1/broadcast": {"result": "ok"}})
+    deposits._execute_deposit("https://test-api.switcheo.network/v2", {"id": "d1", "transaction": sample_transaction},
+                              "L2vHHz8L4rtkUkFaxzQoPro33bo7McYMRoUU69DjE334a8NT8zc9", session=session)
+    (method, _, _, body), = session.calls
+    assert method == "POST" and len(body["signature"]) == 128
@@ -0,0 +1,49 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the signing executors."""
+
+import copy
+import pytest
+from pyswitcheo.executors import get_signing_executor, InlineExecutor
+from pyswitcheo.serialization import sign_array
+from pyswitcheo.signer import Signer
+
+WIF = "L4FSnRosoUv22cCu5z7VEEGd2uQWTK7Me83vZxgQQEsJZ2MReHbu"
+
+
+def _transactions(transaction, count):
+    txns = []
+    for i in range(count):
+        txn = copy.deepcopy(transaction)
+        txn["inputs"][1]["prevIndex"] = i
+        txns.append({"id": "txn-{0}".format(i), "txn": txn})
+    return txns
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_sign_array_with_executor(mode, sample_transaction):
+    """Every executor should produce the same mapping as the sequential signing."""
+    priv_key = Signer(WIF).private_key
+    txns = _transactions(sample_transaction, 6)
+    want = sign_array(txns, priv_key)
+
+    executor = get_signing_executor(mode, max_workers=2)
+    try:
+        got = sign_array(txns, priv_key, executor=executor)
+    finally:
+        executor.shutdown()
+    assert want == got
+    assert list(got.keys()) == [item["id"] for item in txns]
+
+
+def test_inline_executor_propagates_exceptions():
+    """Errors raised while signing should surface to the caller."""
+    future = InlineExecutor().submit(int, "not a number")
+    with pytest.raises(ValueError):
+        future.result()
+
+
+def test_unknown_signing_executor():
+    """An unknown mode should be rejected."""
+    with pytest.raises(ValueError):
+        get_signing_executor("gpu")
@@ -0,0 +1,156 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the per phase instrumentation of the calls."""
+
+import pytest
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from pyswitcheo import instrumentation
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.instrumentation import Instrumentation, PrometheusExporter, endpoint_label
+from pyswitcheo.session import RetryPolicy, SwitcheoSession
+
+WIF = "L4FSnRosoUv22cCu5z7VEEGd2uQWTK7Me83vZxgQQEsJZ2MReHbu"
+CONTRACT_HASH = "a195c1549e7da61b8da315765a790ac7e7633b82"
+
+
+def test_endpoint_label():
+    """The api version and the ids should be removed from the endpoints."""
+    assert endpoint_label("https://test-api.switcheo.network/v2/exchange/contracts") == "/exchange/contracts"
+    assert endpoint_label("http://localhost/v2/orders/c415f943-bea8-4dbf-82e3-8460c559d8b7/broadcast?x=1") == \
+        "/orders/{id}/broadcast"
+
+
+def test_phases_are_exclusive_and_follow_worker_threads(fake_clock):
+    """A nested phase should pause the enclosing one, bound workers should report to the same call."""
+    fake_clock.patch(instrumentation)
+    calls = []
+    instr = Instrumentation([calls.append])
+
+    def decode(_):
+        with instrumentation.timed(instrumentation.DECODE):
+            fake_clock.sleep(0.001)
+
+    def work():
+        with instrumentation.timed(instrumentation.SIGNING):
+            fake_clock.sleep(0.02)
+            with instrumentation.timed(instrumentation.SERIALIZATION):
+                fake_clock.sleep(0.05)
+            with instrumentation.timed(instrumentation.SIGNING):
+                fake_clock.sleep(0.01)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(instrumentation.bind(decode), range(2)))
+        return "done"
+
+    assert instr.run("work", work) == "done"
+    assert instrumentation.current_call() is None
+    call, = calls
+    assert call.name == "work" and call.error is None
+    assert call.phases["serialization"] == pytest.approx(0.05)
+    assert call.phases["signing"] == pytest.approx(0.03)
+    # The workers share the clock, one of them may see the sleep of the other.
+    assert 0.002 <= call.phases["decode"] + 1e-9 <= 0.004 + 1e-9
+    assert call.seconds == pytest.approx(0.082)
+
+
+def test_bind_context_propagates_the_call_and_the_span():
+    """Workers bound with bind_context should report to the current call and be traced under the current span."""
+    from pyswitcheo import tracing
+    calls, exporter = [], tracing.InMemorySpanExporter()
+
+    @tracing.traced()
+    def decode(_):
+        with instrumentation.timed(instrumentation.DECODE):
+            return instrumentation.current_call()
+
+    def work():
+        with tracing.activate(tracing.Tracer(exporter)), tracing.span("work") as parent:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                return parent, list(pool.map(instrumentation.bind_context(decode), range(2)))
+
+    parent, seen = Instrumentation([calls.append]).run("work", work)
+    assert seen == calls * 2 and "decode" in calls[0].phases
+    assert [span.parent_id for span in exporter.get_finished_spans()[:2]] == [parent.span_id] * 2
+    assert instrumentation.bind_context(decode) is decode
+
+
+def test_failing_hook_does_not_break_the_call():
+    """An exception raised by a hook should be logged and swallowed."""
+    def broken(call):
+        raise RuntimeError("boom")
+
+    assert Instrumentation([broken]).run("call", lambda: 42) == 42
+
+
+def test_api_reports_requests_with_status_and_retries():
+    """Every call should carry its endpoint, status and retry count."""
+    from requests.adapters import BaseAdapter
+    from requests.models import Response
+
+    class Adapter(BaseAdapter):
+        statuses = [503, 200]
+
+        def send(self, request, **kwargs):
+            response = Response()
+            response.status_code = self.statuses.pop(0)
+            response._content = b'{"NEO": {"V2": "a195c1549e7da61b8da315765a790ac7e7633b82"}}'
+            response.url, response.request = request.url, request
+            return response
+
+        def close(self):
+            pass
+
+    session = SwitcheoSession(retry=RetryPolicy(backoff_factor=0, methods=("GET",)))
+    session.mount("https://", Adapter())
+    exporter, calls = PrometheusExporter(), []
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session, hooks=[exporter, calls.append])
+    client.list_contracts()
+
+    call, = calls
+    assert call.name == "list_contracts"
+    assert (call.endpoint, call.status, call.retries) == ("/exchange/contracts", 200, 1)
+    assert set(call.phases) == {"http"}
+    assert call.network_seconds == call.phases["http"]
+
+    text = exporter.render()
+    assert 'pyswitcheo_calls_total{call="list_contracts",outcome="ok"} 1' in text
+    assert 'pyswitcheo_requests_total{method="GET",endpoint="/exchange/contracts",status="200"} 1' in text
+    assert 'pyswitcheo_request_retries_total{method="GET",endpoint="/exchange/contracts"} 1' in text
+    assert 'pyswitcheo_call_duration_seconds_bucket{call="list_contracts",le="+Inf"} 1' in text
+    assert 'pyswitcheo_phase_seconds_total{call="list_contracts",phase="http"}' in text
+
+
+def test_api_reports_connect_and_signing_phases(fake_session, sample_transaction):
+    """New connections should be timed, the local work of an order should be split by phase."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    calls = []
+    try:
+        client = SwitcheoApi("http://127.0.0.1:{0}".format(server.server_address[1]), hooks=[calls.append])
+        client.get_exchange_timestamp()
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert calls[0].phases["connect"] > 0
+
+    session = fake_session({"/exchange/tokens": {"SWTH": {"hash": "ab38352559b8b203bde5fddfa0b07d8b2525e132",
+                                                          "decimals": 8}},
+                            "/orders": {"id": "order-1", "fills": [{"id": "fill-1", "txn": sample_transaction}],
+                                        "makes": []},
+                            "/broadcast": {"id": "order-1"}})
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session, hooks=[calls.append])
+    client.create_order(WIF, "SWTH_NEO", "buy", 0.0001, 10, "SWTH", True, CONTRACT_HASH)
+    assert calls[-1].name == "create_order"
+    assert set(calls[-1].phases) >= {"decode", "serialization", "signing"}
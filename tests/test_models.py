@@ -0,0 +1,101 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the compact typed models."""
+
+import pytest
+from pyswitcheo.datatypes.fixed8 import Fixed8
+from pyswitcheo.datatypes.models import (Balance, Fill, Make, Offer, Order, Trade, decode_balances, decode_offers,
+                                         decode_orders, decode_trades)
+
+NEO_ASSET_ID = "c56f33fc6ecfcd0c225c4ab356fee59390af8560be0e930faebe74a6daff7c9b"
+SWTH_ASSET_ID = "ab38352559b8b203bde5fddfa0b07d8b2525e132"
+
+
+def _order(index):
+    return {"id": "order-{0}".format(index), "blockchain": "neo", "contract_hash": "a195c1549e7da61b8da3",
+            "address": "6d0b2bca2fe8a1ac0d5e", "side": "buy",
+            # A new string for every order, as json.loads would build it.
+            "offer_asset_id": "".join([NEO_ASSET_ID[:32], NEO_ASSET_ID[32:]]),
+            "want_asset_id": SWTH_ASSET_ID, "offer_amount": "2050000", "want_amount": "2050000000",
+            "transfer_amount": "0", "priority_gas_amount": "0", "use_native_token": True,
+            "native_fee_transfer_amount": 0, "deposit_txn": None, "created_at": "2018-08-08T10:40:59.398Z",
+            "status": "processed",
+            "fills": [{"id": "fill-1", "offer_hash": "bb70a40e", "offer_asset_id": SWTH_ASSET_ID,
+                       "want_asset_id": NEO_ASSET_ID, "fill_amount": "1000000000", "want_amount": "1000000",
+                       "filled_amount": "", "fee_asset_id": SWTH_ASSET_ID, "fee_amount": "73888",
+                       "price": "0.001", "txn": None, "status": "success",
+                       "created_at": "2018-08-08T10:40:59.398Z", "transaction_hash": "97ad8c0c"}],
+            "makes": [{"id": "make-1", "offer_hash": None, "available_amount": "1050000",
+                       "offer_asset_id": NEO_ASSET_ID, "offer_amount": "1050000", "want_asset_id": SWTH_ASSET_ID,
+                       "want_amount": "1050000000", "filled_amount": "0.0", "txn": None, "cancel_txn": None,
+                       "price": "0.001", "status": "confirming", "created_at": "2018-08-08T10:40:59.398Z",
+                       "transaction_hash": "4c4e8c0c",
+                       "trades": [{"id": "trade-1", "fill_amount": 100, "take_amount": "200",
+                                   "event_time": "2018-06-08T11:32:03.219Z", "is_buy": True}]}]}
+
+
+def test_order_from_json():
+    """Amounts should be ints, fills and makes should be decoded as well."""
+    order = Order.from_json(_order(1))
+    assert order.offer_amount == 2050000
+    assert order.native_fee_transfer_amount == 0
+    assert order.use_native_token is True
+    assert order.fills == [Fill.from_json(_order(1)["fills"][0])]
+    assert order.fills[0].fill_amount == 1000000000
+    assert order.fills[0].filled_amount is None
+    make = order.makes[0]
+    assert isinstance(make, Make)
+    assert make.filled_amount == 0
+    assert make.trades == [Trade("trade-1", 100, 200, "2018-06-08T11:32:03.219Z", True)]
+    assert Fixed8.from_raw(make.available_amount) == Fixed8("0.0105")
+    assert order.to_dict()["id"] == "order-1"
+    assert repr(order).startswith("Order(id='order-1', blockchain='neo'")
+    with pytest.raises(AttributeError):
+        order.extra = 1
+
+
+def test_models_intern_asset_ids():
+    """Equal asset ids of different orders should be the same object."""
+    first, second = decode_orders([_order(1), _order(2)])
+    assert first.offer_asset_id is second.offer_asset_id
+    assert first.offer_asset_id is first.makes[0].offer_asset_id
+    assert first != second
+
+
+def test_models_are_hashable():
+    """Equal models should hash the same, also the ones holding lists, so that they can go in sets and dicts."""
+    first, same, second = decode_orders([_order(1), _order(1), _order(2)])
+    assert hash(first) == hash(same)
+    assert len({first, same, second}) == 2
+    assert {Balance("GAS", 1, 0, 0): "gas"}[Balance("GAS", 1, 0, 0)] == "gas"
+    assert first.makes[0].trades[0] in {Trade("trade-1", 100, 200, "2018-06-08T11:32:03.219Z", True)}
+
+
+def test_decode_trades_and_offers():
+    """Decimal strings should be parsed exactly."""
+    trades = decode_trades([{"id": "t", "fill_amount": "47320000000.0", "take_amount": 3,
+                             "event_time": "2018-06-08T11:32:03.219Z", "is_buy": False}])
+    assert trades[0].fill_amount == 47320000000
+    offers = decode_offers([{"id": "o", "offer_asset": "NEO", "want_asset": "SWTH", "available_amount": 50,
+                             "offer_amount": "100", "want_amount": 1e10}])
+    assert offers == [Offer("o", "NEO", "SWTH", 50, 100, 10000000000)]
+
+
+@pytest.mark.parametrize("amount", ["1.7", 2.9, "0.00000001"])
+def test_fractional_amounts_are_rejected(amount):
+    """An amount in the smallest unit of its asset with a fraction should raise instead of being truncated."""
+    with pytest.raises(ValueError, match="not a whole number"):
+        decode_trades([{"id": "t", "fill_amount": amount, "take_amount": 3,
+                        "event_time": "2018-06-08T11:32:03.219Z", "is_buy": False}])
+
+
+def test_decode_balances():
+    """Pending events should add up into the confirming amount."""
+    balances = decode_balances({"confirmed": {"GAS": "47320000000.0", "SWTH": "421549852102.0"},
+                                "confirming": {"GAS": [{"event_type": "withdrawal", "asset_id": "602c79718b16",
+                                                        "amount": "-100000000", "transaction_hash": None,
+                                                        "created_at": "2018-07-12T10:48:48.866Z"}]},
+                                "locked": {"NEO": "500000000.0"}})
+    assert balances["GAS"] == Balance("GAS", 47320000000, 0, -100000000)
+    assert balances["SWTH"].confirmed == 421549852102
+    assert balances["NEO"] == Balance("NEO", 0, 500000000, 0)
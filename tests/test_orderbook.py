@@ -0,0 +1,98 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the local order book."""
+
+import pytest
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.orderbook import ASK, BID, OrderBook
+
+
+def _ask(offer_id, offer_amount, want_amount, available_amount=None):
+    return {"id": offer_id, "offer_asset": "SWTH", "want_asset": "NEO", "offer_amount": offer_amount,
+            "want_amount": want_amount, "available_amount": offer_amount if available_amount is None
+            else available_amount}
+
+
+def _bid(offer_id, offer_amount, want_amount, available_amount=None):
+    return {"id": offer_id, "offer_asset": "NEO", "want_asset": "SWTH", "offer_amount": offer_amount,
+            "want_amount": want_amount, "available_amount": offer_amount if available_amount is None
+            else available_amount}
+
+
+SNAPSHOT = [
+    _ask("a1", 4000000000, 320000000, 2550000013),  # 25.5 SWTH at 0.08 NEO
+    _ask("a2", 1000000000, 90000000),  # 10 SWTH at 0.09 NEO
+    _ask("a3", 500000000, 40000000),  # 5 SWTH at 0.08 NEO
+    _bid("b1", 70000000, 1000000000),  # 10 SWTH at 0.07 NEO
+    _bid("b2", 30000000, 500000000, 15000000),  # 2.5 SWTH at 0.06 NEO
+]
+
+
+def test_order_book_ladders_and_queries():
+    """Prices should be sorted best first with the quantity aggregated per level."""
+    book = OrderBook("SWTH_NEO")
+    diff = book.update(SNAPSHOT)
+
+    assert len(diff.added) == 5 and not diff.removed and not diff.changed
+    assert len(book) == 5
+    assert book.best_ask() == 8000000
+    assert book.best_bid() == 7000000
+    assert book.spread() == 1000000
+    assert list(book.prices(ASK)) == [8000000, 9000000]
+    assert list(book.prices(BID)) == [7000000, 6000000]
+
+    assert book.depth_at_price(ASK, "0.08") == 3050000013
+    assert book.depth_at_price(BID, 6000000) == 250000000
+    assert book.depth_at_price(BID, "0.05") == 0
+
+    assert book.cumulative_depth(ASK, levels=1) == 3050000013
+    assert book.cumulative_depth(ASK) == 4050000013
+    assert book.cumulative_depth(BID, price="0.065") == 1000000000
+    assert book.cumulative_depth(BID, price="0.06") == 1250000000
+    assert book.cumulative_depth(ASK, price="0.07") == 0
+
+
+def test_order_book_diffs():
+    """Successive snapshots should only report the offers which changed."""
+    book = OrderBook("SWTH_NEO")
+    book.update(SNAPSHOT)
+    assert book.update(SNAPSHOT) == ([], [], [])
+
+    update = [dict(offer) for offer in SNAPSHOT if offer["id"] != "a3"]
+    update[0]["available_amount"] = 1000000000
+    update.append(_bid("b3", 80000000, 1000000000))
+    diff = book.update(update)
+
+    assert [offer.id for offer in diff.added] == ["b3"]
+    assert [offer.id for offer in diff.removed] == ["a3"]
+    assert [offer.id for offer in diff.changed] == ["a1"]
+    assert book.best_bid() == 8000000
+    assert book.depth_at_price(ASK, 8000000) == 1000000000
+    assert book.offer("a3") is None
+
+    book.update([])
+    assert book.best_bid() is None and book.best_ask() is None and book.spread() is None
+    assert book.cumulative_depth(ASK) == 0
+
+
+def test_order_book_skips_offers_without_price():
+    """Offers with a zero offer or want amount should be left out instead of failing the whole snapshot."""
+    book = OrderBook("SWTH_NEO")
+    book.update(SNAPSHOT)
+    diff = book.update(SNAPSHOT[:2] + [_ask("a3", 0, 40000000), _bid("b1", 70000000, 0)] + SNAPSHOT[4:])
+
+    assert sorted(offer.id for offer in diff.removed) == ["a3", "b1"]
+    assert len(book) == 3 and book.offer("a3") is None
+    assert book.best_bid() == 6000000
+
+
+def test_order_book_from_api(fake_session):
+    """The book should accept the response of list_offers and reject offers of another pair."""
+    session = fake_session({"/offers": SNAPSHOT})
+    api = SwitcheoApi("https://test-api.switcheo.network", session=session)
+    book = OrderBook("SWTH_NEO")
+    book.update(api.list_offers("neo", "SWTH_NEO", "a195c1549e7da61b8da315765a790ac7e7633b82"))
+    assert book.best_ask() == 8000000
+
+    with pytest.raises(ValueError):
+        OrderBook("GAS_NEO").update(SNAPSHOT)
@@ -0,0 +1,70 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the lazily parsed responses."""
+
+import io
+import logging
+import requests
+from urllib3 import HTTPResponse
+from requests.models import Response
+from pyswitcheo import utils
+from pyswitcheo.response import SwitcheoResponse
+from pyswitcheo.session import SwitcheoAdapter
+
+
+def _response(body):
+    response = Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def test_adapter_builds_switcheo_responses():
+    """The pooled adapter should hand out SwitcheoResponse objects."""
+    request = requests.Request("GET", "https://test-api.switcheo.network/v2/exchange/pairs").prepare()
+    raw = HTTPResponse(body=io.BytesIO(b'["SWTH_NEO"]'), status=200, preload_content=False)
+    response = SwitcheoAdapter().build_response(request, raw)
+    assert isinstance(response, SwitcheoResponse)
+    assert response.json() == ["SWTH_NEO"]
+    assert response.json() is response.json()
+
+
+def test_json_is_parsed_once(monkeypatch):
+    """The body should be parsed on first use only and shared by every caller."""
+    calls = []
+    loads_json = utils.loads_json
+    monkeypatch.setattr(utils, "loads_json", lambda data: calls.append(data) or loads_json(data))
+
+    response = SwitcheoResponse.cast(_response(b'{"id": "e0f56e23", "amount": 18446744073709551616}'))
+    assert calls == []
+    parsed = response.json()
+    assert parsed is utils.response_to_json(response) is response.json()
+    assert parsed["amount"] == 2 ** 64
+    assert len(calls) == 1
+
+    null = _response(b"null")
+    assert utils.response_to_json(null) is None
+    assert utils.response_to_json(null) is None
+    assert len(calls) == 2
+
+
+def test_debug_formatting_is_skipped_when_disabled(monkeypatch):
+    """The response body should not be formatted for the logs unless debug is enabled."""
+    class Body(bytes):
+        decoded = 0
+
+        def decode(self, *args):
+            Body.decoded += 1
+            return bytes.decode(self, *args)
+
+    monkeypatch.setattr(utils, "orjson", None)
+    utils.logger.setLevel(logging.INFO)
+    utils.response_to_json(_response(Body(b"[]")))
+    assert Body.decoded == 1
+
+    utils.logger.setLevel(logging.DEBUG)
+    try:
+        utils.response_to_json(_response(Body(b"[]")))
+    finally:
+        utils.logger.setLevel(logging.NOTSET)
+    assert Body.decoded == 3
@@ -0,0 +1,53 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the cached response validators."""
+
+import pytest
+from jsonschema import ValidationError
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.schemas import RESPONSE_SCHEMAS, ResponseValidator, get_validator
+
+BASE_URL = "https://test-api.switcheo.network"
+TRADES = [{"id": "712a5019-3a23-463e-b0e1-80e9f0ad4f91", "fill_amount": 9122032316, "take_amount": 20921746,
+           "event_time": "2018-06-08T11:32:03.219Z", "is_buy": False}]
+
+
+def test_get_validator_is_built_once_per_endpoint():
+    """The same compiled validator should be returned for every call."""
+    for endpoint in RESPONSE_SCHEMAS:
+        assert get_validator(endpoint) is get_validator(endpoint)
+    with pytest.raises(KeyError):
+        get_validator("unknown")
+
+
+def test_response_validator_sampling():
+    """Only one out of every sample_rate responses should be checked."""
+    validator = ResponseValidator(sample_rate=3)
+    invalid = {"id": 1}
+    with pytest.raises(ValidationError):
+        validator.validate("list_trades", invalid)
+    # The next two responses fall outside the sample.
+    assert validator.validate("list_trades", invalid) is invalid
+    assert validator.validate("list_trades", invalid) is invalid
+    with pytest.raises(ValidationError):
+        validator.validate("list_trades", invalid)
+
+    # Endpoints without a schema are never checked.
+    assert validator.validate("unknown", invalid) is invalid
+    with pytest.raises(ValueError):
+        ResponseValidator(sample_rate=0)
+
+
+def test_api_validates_responses_when_enabled(fake_session):
+    """SwitcheoApi should only validate the responses when asked to."""
+    session = fake_session({"/trades": {"error": "not a list"}})
+    api = SwitcheoApi(BASE_URL, session=session)
+    api.list_trades("a195c1549e7da61b8da315765a790ac7e7633b82", "SWTH_NEO")
+
+    api = SwitcheoApi(BASE_URL, session=session, validate_responses=True)
+    with pytest.raises(ValidationError):
+        api.list_trades("a195c1549e7da61b8da315765a790ac7e7633b82", "SWTH_NEO")
+
+    session.routes["/trades"] = TRADES
+    resp = api.list_trades("a195c1549e7da61b8da315765a790ac7e7633b82", "SWTH_NEO")
+    assert resp.json() == TRADES
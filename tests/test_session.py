@@ -0,0 +1,240 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the pooled session used by SwitcheoApi."""
+
+import json
+import time
+import pytest
+from http import HTTPStatus
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from pyswitcheo import session as session_module
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.session import (ACCOUNT, PUBLIC, TRADING, RetryPolicy, SwitcheoSession, TokenBucket,
+                                endpoint_class)
+from pyswitcheo.utils import response_to_json
+from pyswitcheo.wirelog import WireLog
+
+
+def test_session_pool_size():
+    """Every mounted adapter should honour the requested pool size."""
+    session = SwitcheoSession(pool_size=32)
+    for prefix in ("http://", "https://"):
+        adapter = session.get_adapter(prefix + "example.org")
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_connections == 32
+    session.close()
+
+
+def test_api_owns_a_pooled_session():
+    """SwitcheoApi should create a pooled session by default and close it on exit."""
+    with SwitcheoApi(base_url="https://test-api.switcheo.network", pool_size=4) as client:
+        assert isinstance(client.session, SwitcheoSession)
+        assert client.session.pool_size == 4
+
+
+def test_api_routes_every_call_through_session(fake_session):
+    """A session passed in should be used for every request made by the client."""
+    session = fake_session({"/exchange/contracts": {"NEO": {"V2": "a195c1549e7da61b8da315765a790ac7e7633b82"}},
+                            "/exchange/pairs": ["SWTH_NEO"]})
+    client = SwitcheoApi(base_url="https://test-api.switcheo.network", session=session)
+
+    response = client.list_contracts()
+    assert response.status_code == HTTPStatus.OK
+    assert "NEO" in response_to_json(response)
+
+    response = client.list_pairs(bases=["NEO"])
+    assert response_to_json(response) == ["SWTH_NEO"]
+
+    assert [call[1] for call in session.calls] == ["https://test-api.switcheo.network/v2/exchange/contracts",
+                                                   "https://test-api.switcheo.network/v2/exchange/pairs"]
+    client.close()
+    assert session.closed
+
+
+def test_api_rejects_session_options_with_an_explicit_session(fake_session):
+    """Session options passed along with a session would be ignored, they should be rejected."""
+    with pytest.raises(ValueError, match="coalesce_reads, freshness_ms, wire_log"):
+        SwitcheoApi(base_url="https://test-api.switcheo.network", session=fake_session(), coalesce_reads=True,
+                    freshness_ms=500, wire_log=WireLog())
+    with pytest.raises(ValueError, match="retry"):
+        SwitcheoApi(base_url="https://test-api.switcheo.network", session=fake_session(), retry=False)
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Transport adapter answering with a scripted sequence of status codes."""
+
+    def __init__(self, statuses, headers=None, delay=0, clock=time):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.delay = delay
+        self.clock = clock
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append((request.method, request.url, self.clock.monotonic()))
+        time.sleep(self.delay)
+        response = Response()
+        response.status_code = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        response.headers.update(self.headers)
+        response._content = '{{"request": {0}}}'.format(len(self.requests)).encode("UTF-8")
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def _scripted_session(statuses, headers=None, delay=0, clock=time, **kwargs):
+    session = SwitcheoSession(**kwargs)
+    adapter = ScriptedAdapter(statuses, headers, delay, clock)
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+def test_endpoint_class():
+    """Requests should be classified by method and path."""
+    assert endpoint_class("GET", "https://test-api.switcheo.network/v2/tickers/last_price") == PUBLIC
+    assert endpoint_class("GET", "https://test-api.switcheo.network/v2/offers?pair=SWTH_NEO") == PUBLIC
+    assert endpoint_class("GET", "https://test-api.switcheo.network/v2/balances") == ACCOUNT
+    assert endpoint_class("POST", "https://test-api.switcheo.network/v2/orders") == TRADING
+
+
+def test_session_retries_transient_errors_of_gets():
+    """GETs should be retried on 429/500/503 until they succeed or run out of retries."""
+    retry = RetryPolicy(max_retries=3, backoff_factor=0.001)
+    session, adapter = _scripted_session([503, 429, 200], retry=retry)
+    assert session.get("https://example.org/v2/offers").status_code == 200
+    assert len(adapter.requests) == 3
+
+    session, adapter = _scripted_session([500], retry=retry)
+    assert session.get("https://example.org/v2/offers").status_code == 500
+    assert len(adapter.requests) == 4
+
+    # Writes are never retried, neither are other errors.
+    session, adapter = _scripted_session([503, 200], retry=retry)
+    assert session.post("https://example.org/v2/orders", json={}).status_code == 503
+    session, adapter = _scripted_session([404, 200], retry=retry)
+    assert session.get("https://example.org/v2/offers").status_code == 404
+
+    session, adapter = _scripted_session([503, 200], retry=False)
+    assert session.get("https://example.org/v2/offers").status_code == 503
+
+
+def test_retry_policy_delays(fake_clock):
+    """The backoff should be jittered, capped and overridden by Retry-After."""
+    retry = RetryPolicy(backoff_factor=1, max_backoff=3)
+    response = Response()
+    response.status_code = 429
+    assert all(0 <= retry.get_delay("GET", response, attempt) <= min(3, 2 ** attempt) for attempt in range(3))
+    assert retry.get_delay("GET", response, 3) is None
+
+    response.headers["Retry-After"] = "2"
+    assert retry.get_delay("GET", response, 0) == 2.0
+    response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert retry.get_delay("GET", response, 0) == 0.0
+    # A longer wait than max_retry_after gives the response back instead of blocking.
+    response.headers["Retry-After"] = "86400"
+    assert retry.get_delay("GET", response, 0) is None
+    response.headers["Retry-After"] = "Fri, 01 Jan 2100 00:00:00 GMT"
+    assert retry.get_delay("GET", response, 0) is None
+    assert RetryPolicy(max_retry_after=86400).get_delay("GET", response, 0) is None
+    response.headers["Retry-After"] = "86400"
+    assert RetryPolicy(max_retry_after=86400).get_delay("GET", response, 0) == 86400.0
+
+    session, adapter = _scripted_session([429, 200], headers={"Retry-After": "86400"})
+    assert session.get("https://example.org/v2/offers").status_code == 429
+    assert len(adapter.requests) == 1
+
+    session, adapter = _scripted_session([429, 200], headers={"Retry-After": "0.05"},
+                                         clock=fake_clock.patch(session_module))
+    session.get("https://example.org/v2/offers")
+    assert adapter.requests[1][2] - adapter.requests[0][2] == pytest.approx(0.05)
+
+
+def test_rate_limits_per_endpoint_class(fake_clock):
+    """Requests beyond the burst should be spread according to the rate of their class."""
+    fake_clock.patch(session_module)
+    session, adapter = _scripted_session([200], clock=fake_clock, rate_limits={TRADING: (50, 2)})
+    for _ in range(5):
+        session.post("https://example.org/v2/orders", json={})
+    for _ in range(5):
+        session.get("https://example.org/v2/offers")
+
+    posts = [sent for method, url, sent in adapter.requests if method == "POST"]
+    gets = [sent for method, url, sent in adapter.requests if method == "GET"]
+    assert [sent - posts[0] for sent in posts] == pytest.approx([0, 0, 1 / 50, 2 / 50, 3 / 50])
+    assert gets[-1] == gets[0]
+
+    bucket = TokenBucket(rate=10, capacity=1)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1)
+    fake_clock.sleep(0.25)
+    assert bucket.reserve() == 0.0
+
+
+def test_session_coalesces_identical_gets():
+    """Concurrent identical GETs should share one call, different ones should not."""
+    session, adapter = _scripted_session([200], delay=0.1, coalesce=True)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        same = [pool.submit(session.get, "https://example.org/v2/offers", params={"pair": "SWTH_NEO", "x": None})
+                for _ in range(6)]
+        other = pool.submit(session.get, "https://example.org/v2/offers", params={"pair": "GAS_NEO"})
+        responses = [future.result() for future in same]
+
+    assert len(adapter.requests) == 2
+    assert all(response is responses[0] for response in responses)
+    assert response_to_json(responses[0]) is response_to_json(responses[1])
+    assert other.result() is not responses[0]
+
+    # Once completed, identical GETs are sent again unless a freshness window is set.
+    session.get("https://example.org/v2/offers", params={"pair": "SWTH_NEO"})
+    assert len(adapter.requests) == 3
+    session.post("https://example.org/v2/orders", json={})
+    session.post("https://example.org/v2/orders", json={})
+    assert len(adapter.requests) == 5
+
+
+def test_session_freshness_window(fake_clock):
+    """Successful GETs should be reused within the freshness window."""
+    fake_clock.patch(session_module)
+    session, adapter = _scripted_session([200], freshness=0.05)
+    first = session.get("https://example.org/v2/tickers/last_price")
+    assert session.get("https://example.org/v2/tickers/last_price") is first
+    fake_clock.sleep(0.06)
+    assert session.get("https://example.org/v2/tickers/last_price") is not first
+    assert len(adapter.requests) == 2
+
+    session, adapter = _scripted_session([500, 200], retry=False, freshness=1)
+    assert session.get("https://example.org/v2/tickers/last_price").status_code == 500
+    assert session.get("https://example.org/v2/tickers/last_price").status_code == 200
+
+    client = SwitcheoApi(base_url="https://test-api.switcheo.network", coalesce_reads=True, freshness_ms=500)
+    assert client.session.coalesce and client.session.freshness == 0.5
+    client.close()
+
+
+def test_wire_log_samples_requests_and_keeps_errors(tmpdir):
+    """The wire log should keep 1 in every sample_rate requests and every failed one, up to its capacity."""
+    wire_log = WireLog(capacity=3, sample_rate=2, max_body_size=8)
+    session, adapter = _scripted_session([200, 200, 200, 404, 200, 200, 200], retry=False, wire_log=wire_log)
+    session.post("https://example.org/v2/orders", json={"pair": "SWTH_NEO"})
+    for _ in range(6):
+        session.get("https://example.org/v2/offers", params={"pair": "SWTH_NEO"})
+
+    records = wire_log.records()
+    assert [(record["method"], record["status"]) for record in records] == [("GET", 404), ("GET", 200), ("GET", 200)]
+    assert records[0]["url"] == "https://example.org/v2/offers?pair=SWTH_NEO"
+    assert records[0]["response_body"] == '{"reques' and records[0]["retries"] == 0
+
+    wire_log.clear()
+    for _ in range(2):
+        session.post("https://example.org/v2/orders", json={"pair": "SWTH_NEO"})
+    assert len(wire_log) == 1 and wire_log.records()[0]["request_body"] == '{"pair":'
+    path = str(tmpdir.join("wire.jsonl"))
+    assert wire_log.dump(path) == 1
+    with open(path) as f:
+        assert json.loads(f.readline())["method"] == "POST"
@@ -0,0 +1,70 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the signer module."""
+
+from pyswitcheo.signer import Signer, SignerCache, as_signer
+from pyswitcheo.crypto_utils import get_private_key_from_wif, get_script_hash_from_wif
+
+WIF = "L4FSnRosoUv22cCu5z7VEEGd2uQWTK7Me83vZxgQQEsJZ2MReHbu"
+
+
+def test_signer_key_material():
+    """A signer should derive the same key material as the crypto_utils helpers."""
+    signer = Signer(WIF)
+    assert signer.private_key == bytes(get_private_key_from_wif(WIF))
+    assert signer.script_hash == get_script_hash_from_wif(WIF)
+    assert signer.address == "AG9YqjpmoQC5Ufxo2JUr8zCSrXba9krc7g"
+    assert signer.public_key == "027d2220b3ec77791f21968e53d7d4da0edd90c3e1ab14a3c434346b21584ac6e5"
+    assert WIF not in repr(signer)
+
+
+def test_as_signer_caches_only_in_an_explicit_cache():
+    """A WIF should only map to the same Signer through a SignerCache, which can be cleared."""
+    assert as_signer(WIF) is not as_signer(WIF)
+    cache = SignerCache(maxsize=1)
+    signer = as_signer(WIF, cache=cache)
+    assert as_signer(WIF, cache=cache) is signer and len(cache) == 1
+    assert as_signer(signer) is signer
+    cache.clear()
+    assert len(cache) == 0 and as_signer(WIF, cache=cache) is not signer
+
+
+def test_api_derives_the_key_material_once_per_call(fake_session, sample_transaction, monkeypatch):
+    """The key material should be derived once per call, and only kept across calls with cache_signers."""
+    from pyswitcheo import signer as signer_module
+    from pyswitcheo.api import SwitcheoApi
+
+    built = []
+
+    class CountingSigner(Signer):
+        __slots__ = ()
+
+        def __init__(self, wif):
+            built.append(wif)
+            super().__init__(wif)
+
+    monkeypatch.setattr(signer_module, "Signer", CountingSigner)
+    session = fake_session({"/cancellations": {"id": "c1", "transaction": sample_transaction},
+                            "/broadcast": {"id": "c1"}})
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session)
+    for _ in range(2):
+        client.create_cancellation("order-id", WIF)
+    assert len(built) == 2 and client.signer_cache is None
+
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session, cache_signers=True)
+    for _ in range(2):
+        client.create_cancellation("order-id", WIF)
+    assert len(built) == 3 and len(client.signer_cache) == 1
+
+
+def test_api_accepts_signer(fake_session):
+    """Internal API functions should accept a Signer in place of the WIF."""
+    from pyswitcheo.internal.api import orders
+
+    session = fake_session({"/cancellations": {"id": "c1"}})
+    signer = Signer(WIF)
+    orders._create_cancellation("https://test-api.switcheo.network/v2", "order-id", signer, session=session)
+    orders._create_cancellation("https://test-api.switcheo.network/v2", "order-id", WIF, session=session)
+
+    (_, _, _, with_signer), (_, _, _, with_wif) = session.calls
+    assert with_signer["address"] == with_wif["address"] == signer.script_hash
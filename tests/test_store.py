@@ -0,0 +1,127 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the on disk market data store."""
+
+import os
+import time
+import pytest
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.store import CANDLES_PER_BUCKET, TRADES_BUCKET_SECONDS, MarketDataStore
+
+BASE_URL = "https://test-api.switcheo.network/v2"
+CONTRACT_HASH = "a195c1549e7da61b8da315765a790ac7e7633b82"
+
+
+def _candles(method, url, params, json):
+    """Serve one minute candles with string fields for the requested range."""
+    start = params["start_time"] + (-params["start_time"] % 60)
+    return [{"time": str(t), "open": "0.00049408", "close": "0.00049238", "high": "0.000497",
+             "low": "0.00048919", "volume": "110169445.0", "quote_volume": "{0}.0".format(t)}
+            for t in range(start, params["end_time"] + 1, 60)]
+
+
+def test_store_serves_closed_candle_buckets_from_disk(tmpdir, fake_session):
+    """Only open or missing buckets should be fetched again."""
+    span = 60 * CANDLES_PER_BUCKET
+    start, end = span * 100 + 120, span * 102 + 600
+    session = fake_session({"/tickers/candlesticks": _candles})
+    store = MarketDataStore(str(tmpdir), BASE_URL, session=session, clock=lambda: span * 102 + 900)
+
+    first = store.get_candle_sticks("SWTH_NEO", start, end, 1)
+    assert len(session.calls) == 3
+    assert list(first.time) == list(range(start, end + 1, 60))
+    assert first.open[0] == 0.00049408
+
+    # The two closed buckets are read from disk, the last one is still open.
+    second = store.get_candle_sticks("SWTH_NEO", start, end, 1, fixed8=True)
+    assert len(session.calls) == 4
+    assert list(second.time) == list(first.time)
+    assert list(second.quote_volume) == list(first.quote_volume)
+    assert second.high[0] == 49700
+    assert len(os.listdir(os.path.join(str(tmpdir), "test-api.switcheo.network", "candles", "SWTH_NEO", "1"))) == 2
+
+    # Through the client, with a fresh store on the same directory.
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session, cache_dir=str(tmpdir))
+    client.get_candle_sticks_array("SWTH_NEO", start, span * 102 - 1, 1)
+    assert len(session.calls) == 4
+
+
+def test_store_serves_closed_trade_buckets_from_disk(tmpdir, fake_session, trade_history):
+    """Trades should be stored oldest first and read back identically."""
+    history, route = trade_history
+    session = fake_session({"/trades": route})
+    start = 1528457523 - 1528457523 % TRADES_BUCKET_SECONDS
+    store = MarketDataStore(str(tmpdir), BASE_URL, session=session, clock=lambda: start + 2 * TRADES_BUCKET_SECONDS)
+
+    first = store.get_trades(CONTRACT_HASH, "SWTH_NEO", 1528457523 + 1, 1528457523 + 10)
+    calls = len(session.calls)
+    second = store.get_trades(CONTRACT_HASH, "SWTH_NEO", 1528457523 + 1, 1528457523 + 10)
+    assert len(session.calls) == calls
+
+    expected = [trade for trade in reversed(history) if 2 <= trade["fill_amount"] < 20]
+    for trades in (first, second):
+        assert trades.id == [trade["id"] for trade in expected]
+        assert list(trades.fill_amount) == [trade["fill_amount"] for trade in expected]
+        assert list(trades.is_buy) == [trade["is_buy"] for trade in expected]
+        assert trades.event_time[0] == (1528457523 + 1) * 1000
+
+    # Through the client, with and without a store.
+    for cache_dir in (None, str(tmpdir)):
+        client = SwitcheoApi("https://test-api.switcheo.network", session=session, cache_dir=cache_dir)
+        calls = len(session.calls)
+        trades = client.get_trades_array(CONTRACT_HASH, "SWTH_NEO", 1528457523 + 1, 1528457523 + 10)
+        assert trades.id == first.id and list(trades.take_amount) == list(first.take_amount)
+        assert (len(session.calls) > calls) == (cache_dir is None)
+
+
+@pytest.mark.parametrize("contract_hash, pair", [("../..", "SWTH_NEO"), (CONTRACT_HASH, "../SWTH_NEO"),
+                                                 (CONTRACT_HASH, "SWTH/NEO"), ("", "SWTH_NEO")])
+def test_store_rejects_paths_outside_of_its_directory(tmpdir, fake_session, contract_hash, pair):
+    """Pairs and contract hashes which are not plain directory names should be rejected before any request."""
+    session = fake_session({})
+    store = MarketDataStore(str(tmpdir), BASE_URL, session=session, clock=lambda: 0)
+    with pytest.raises(ValueError):
+        store.get_trades(contract_hash, pair, 1528457523, 1528457533)
+    with pytest.raises(ValueError):
+        store.get_candle_sticks(pair if contract_hash == CONTRACT_HASH else contract_hash, 0, 60, 1)
+    assert session.calls == []
+
+
+def test_store_keeps_boundary_trades_in_one_bucket(tmpdir, fake_session):
+    """A trade at the end of a bucket should be stored and returned once, also if the server includes the end."""
+    boundary = 1528416000 - 1528416000 % TRADES_BUCKET_SECONDS + TRADES_BUCKET_SECONDS
+    history = [{"id": "trade-{0}".format(second), "fill_amount": 1, "take_amount": 1, "is_buy": True,
+                "event_time": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(second))}
+               for second in (boundary + 5, boundary, boundary - 5)]
+
+    def inclusive(method, url, params, json):
+        return [trade for trade in history if params["from"] <= int(trade["id"].split("-")[1]) <= params["to"]]
+
+    session = fake_session({"/trades": inclusive})
+    store = MarketDataStore(str(tmpdir), BASE_URL, session=session, clock=lambda: boundary * 2)
+    for _ in range(2):
+        got = store.get_trades(CONTRACT_HASH, "SWTH_NEO", boundary - 10, boundary + 10)
+        assert got.id == ["trade-{0}".format(boundary - 5), "trade-{0}".format(boundary),
+                          "trade-{0}".format(boundary + 5)]
+
+    directory = os.path.join(store.path, "trades", CONTRACT_HASH, "SWTH_NEO")
+    assert sorted(os.listdir(directory)) == ["{0}.bin".format(boundary - TRADES_BUCKET_SECONDS),
+                                             "{0}.bin".format(boundary)]
+
+
+def test_concurrent_writers_of_a_bucket(tmpdir):
+    """Writers of the same bucket should each use their own temp file, the bucket always being a complete one."""
+    from array import array
+    from concurrent.futures import ThreadPoolExecutor
+    from pyswitcheo.store import _read_bucket, _write_bucket
+
+    path = os.path.join(str(tmpdir), "bucket.bin")
+
+    def write(value):
+        _write_bucket(path, b"TEST", 1000, [array("q", [value] * 1000)])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(64)))
+    (column,), tail = _read_bucket(path, b"TEST", ["q"])
+    assert len(set(column)) == 1 and len(column) == 1000 and tail == b""
+    assert os.listdir(str(tmpdir)) == ["bucket.bin"]
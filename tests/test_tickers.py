@@ -54,3 +54,35 @@ def test_get_last_price(symbols, key, error_msg, url):
         assert len(response_json.keys()) > 0
     else:
         assert key in response_json.keys()
+
+
+def _candles(method, url, params, json):
+    """Serve one minute candles with string fields for the requested range."""
+    start = params["start_time"] - params["start_time"] % 60
+    return [{"time": str(t), "open": "0.00049408", "close": "0.00049238", "high": "0.000497",
+             "low": "0.00048919", "volume": "110169445.0", "quote_volume": "{0}.0".format(t)}
+            for t in range(start, params["end_time"] + 1, 60) if t >= params["start_time"]]
+
+
+def test_split_time_range():
+    """Chunks should cover the whole range without overlapping."""
+    assert tickers._split_time_range(0, 599, 1, max_candles=5) == [(0, 299), (300, 599)]
+    assert tickers._split_time_range(0, 0, 1, max_candles=5) == [(0, 0)]
+    assert tickers._split_time_range(10, 5, 1) == []
+
+
+@pytest.mark.parametrize("fixed8", [False, True])
+def test_get_candle_sticks_array(fixed8, fake_session):
+    """Chunks should be fetched and stitched into contiguous typed columns."""
+    session = fake_session({"/tickers/candlesticks": _candles})
+    columns = tickers._get_candle_sticks_array("https://test-api.switcheo.network/v2", "SWTH_NEO", 1531215240,
+                                               1531215240 + 60 * 99, 1, fixed8=fixed8, max_candles=7,
+                                               session=session)
+    assert len(session.calls) == 15
+    assert list(columns.time) == list(range(1531215240, 1531215240 + 60 * 100, 60))
+    assert list(columns.quote_volume) == [float(t) for t in columns.time]
+    assert columns.volume[0] == 110169445.0
+    if fixed8:
+        assert columns.high[0] == 49700 and columns.low[-1] == 48919
+    else:
+        assert columns.high[0] == 0.000497 and columns.low[-1] == 0.00048919
@@ -0,0 +1,65 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the token metadata cache."""
+
+import pytest
+from pyswitcheo.tokens import TokenInfoCache
+from pyswitcheo.utils import convert_to_neo_asset_amount
+
+BASE_URL = "https://test-api.switcheo.network/v2"
+TOKENS = {
+    "NEO": {"hash": "c56f33fc6ecfcd0c225c4ab356fee59390af8560be0e930faebe74a6daff7c9b", "decimals": 8},
+    "SWTH": {"hash": "ab38352559b8b203bde5fddfa0b07d8b2525e132", "decimals": 8},
+    "ACAT": {"hash": "7f86d61ff377f1b12e589a5907152b57e2ad9a7a", "decimals": 2},
+}
+
+
+def test_token_cache_indexes_symbols_and_hashes(fake_session):
+    """Both the symbol and the asset hash should resolve to the same precision."""
+    session = fake_session({"/exchange/tokens": TOKENS})
+    cache = TokenInfoCache(BASE_URL, session=session)
+
+    assert cache.get_decimals("acat") == 2
+    assert cache.get_decimals("7F86D61FF377F1B12E589A5907152B57E2AD9A7A") == 2
+    assert cache.get_decimals("SWTH") == 8
+    assert len(session.calls) == 1
+
+
+def test_token_cache_ttl_and_invalidation(fake_session):
+    """Expired or invalidated metadata should be fetched again."""
+    session = fake_session({"/exchange/tokens": TOKENS})
+    cache = TokenInfoCache(BASE_URL, session=session, ttl=0)
+    cache.get_decimals("NEO")
+    cache.get_decimals("NEO")
+    assert len(session.calls) == 2
+
+    cache = TokenInfoCache(BASE_URL, session=session, ttl=None)
+    cache.get_decimals("NEO")
+    cache.invalidate()
+    cache.get_decimals("NEO")
+    assert len(session.calls) == 4
+
+
+def test_token_cache_unknown_asset(fake_session):
+    """An unknown asset triggers a single refresh before failing."""
+    session = fake_session({"/exchange/tokens": TOKENS})
+    cache = TokenInfoCache(BASE_URL, session=session)
+    cache.tokens()
+    with pytest.raises(KeyError):
+        cache.get_decimals("UNKNOWN")
+    assert len(session.calls) == 2
+
+
+@pytest.mark.parametrize("asset_id, amount, expected", [
+    ("SWTH", 100, 10000000000),
+    ("ACAT", 100, 10000),
+])
+def test_convert_to_neo_asset_amount_with_cache(asset_id, amount, expected, fake_session):
+    """A warm cache should not make any network call."""
+    session = fake_session({"/exchange/tokens": TOKENS})
+    cache = TokenInfoCache(BASE_URL, session=session)
+    cache.tokens()
+
+    got = convert_to_neo_asset_amount(amount, asset_id, BASE_URL, session=session, token_cache=cache)
+    assert got == expected
+    assert len(session.calls) == 1
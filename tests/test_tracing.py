@@ -0,0 +1,125 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests related to the tracing of the create/execute flows."""
+
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from pyswitcheo import tracing
+from pyswitcheo.api import SwitcheoApi
+from pyswitcheo.session import SwitcheoSession
+from pyswitcheo.tracing import InMemorySpanExporter, Tracer
+
+WIF = "L4FSnRosoUv22cCu5z7VEEGd2uQWTK7Me83vZxgQQEsJZ2MReHbu"
+CONTRACT_HASH = "a195c1549e7da61b8da315765a790ac7e7633b82"
+
+
+class RoutesAdapter(BaseAdapter):
+    """Transport adapter answering with the json body of the longest route the url path ends with."""
+
+    def __init__(self, routes):
+        super().__init__()
+        self.routes = routes
+
+    def send(self, request, **kwargs):
+        path = request.path_url.split("?")[0].rstrip("/")
+        matches = [suffix for suffix in self.routes if path.endswith(suffix)]
+        response = Response()
+        response.url, response.request = request.url, request
+        if matches:
+            status, body = self.routes[max(matches, key=len)]
+        else:
+            status, body = 404, {"error": "not found"}
+        response.status_code = status
+        response._content = json.dumps(body).encode("UTF-8")
+        return response
+
+    def close(self):
+        pass
+
+
+def _client(routes, exporter):
+    session = SwitcheoSession(retry=False)
+    session.mount("https://", RoutesAdapter(routes))
+    return SwitcheoApi("https://test-api.switcheo.network", session=session, tracer=Tracer(exporter))
+
+
+def _children(spans, parent):
+    return [span.name for span in spans if span.parent_id == parent.span_id]
+
+
+def test_spans_nest_and_follow_bound_workers():
+    """Spans should be parented by the current span, also in bound worker threads, and record errors."""
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+
+    @tracing.traced()
+    def leaf(_):
+        return None
+
+    with tracing.activate(tracer), tracing.span("root", {"kind": "test"}) as root:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(tracing.bind(leaf), range(2)))
+        with pytest.raises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("boom")
+    assert tracing.span("outside") is tracing._NOOP_SPAN
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["leaf", "leaf", "failing", "root"]
+    assert {span.trace_id for span in spans} == {root.trace_id}
+    assert all(span.parent_id == root.span_id for span in spans[:3]) and root.parent_id is None
+    assert root.attributes == {"kind": "test"} and root.status == tracing.UNSET and root.duration >= 0
+    assert spans[2].status == tracing.ERROR and spans[2].events[0][1]["exception.message"] == "boom"
+    exporter.clear()
+    assert exporter.get_finished_spans() == []
+
+
+def test_create_order_spans(sample_transaction):
+    """An order should be a parent span with the create, signing and execute steps and their requests."""
+    exporter = InMemorySpanExporter()
+    client = _client({"/exchange/tokens": (200, {"SWTH": {"hash": "ab38352559b8b203bde5fddfa0b07d8b2525e132",
+                                                          "decimals": 8}}),
+                      "/orders": (200, {"id": "order-1", "fills": [{"id": "fill-1", "txn": sample_transaction}],
+                                        "makes": []}),
+                      "/orders/order-1/broadcast": (200, {"id": "order-1"})}, exporter)
+    client.create_order(WIF, "SWTH_NEO", "buy", 0.0001, 10, "SWTH", True, CONTRACT_HASH)
+
+    spans = exporter.get_finished_spans()
+    by_name = {span.name: span for span in spans}
+    root = by_name["SwitcheoApi.create_order"]
+    assert root.parent_id is None and len({span.trace_id for span in spans}) == 1
+    assert _children(spans, root) == ["_create_order", "_execute_order"]
+    assert _children(spans, by_name["_create_order"]) == ["HTTP GET", "sign_msg", "_send_order"]
+    assert _children(spans, by_name["_send_order"]) == ["HTTP POST"]
+    assert _children(spans, by_name["_execute_order"]) == ["sign_array", "sign_array", "HTTP POST"]
+    assert _children(spans, by_name["sign_transaction"]) == ["sign_msg"]
+
+    broadcast = [span for span in spans if span.parent_id == by_name["_execute_order"].span_id][-1]
+    assert broadcast.attributes == {"http.method": "POST", "http.status_code": 200, "http.retry_count": 0,
+                                    "http.url": "https://test-api.switcheo.network/v2/orders/order-1/broadcast"}
+
+
+def test_failed_execute_marks_the_spans(sample_transaction):
+    """A failing execute step should set the error status on its span and on the parent one."""
+    exporter = InMemorySpanExporter()
+    client = _client({"/cancellations": (200, {"id": "cancel-1", "transaction": sample_transaction}),
+                      "/cancellations/cancel-1/broadcast": (400, {"error": "Order already cancelled"})}, exporter)
+    with pytest.raises(Exception):
+        client.create_cancellation("order-1", WIF)
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans["_create_cancellation"].status == tracing.UNSET
+    assert spans["_execute_cancellation"].status == tracing.ERROR
+    assert spans["SwitcheoApi.create_cancellation"].status == tracing.ERROR
+    assert spans["sign_transaction"].parent_id == spans["_execute_cancellation"].span_id
+
+
+def test_no_tracer_records_nothing(fake_session):
+    """Without a tracer the calls should not open any span."""
+    client = SwitcheoApi("https://test-api.switcheo.network", session=fake_session({"/exchange/contracts": {}}))
+    assert client.tracer is None
+    client.list_contracts()
+    assert tracing._local.tracer is None and tracing._local.span is None
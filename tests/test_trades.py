@@ -5,6 +5,7 @@
 import pytest
 from http import HTTPStatus
 from jsonschema import validate
+from pyswitcheo.api import SwitcheoApi
 from pyswitcheo.internal.api import trades
 from pyswitcheo.utils import response_to_json
 from pyswitcheo.schemas import LIST_TRADES_SCHEMA
@@ -30,3 +31,32 @@ def test_list_trades(pair, contract_hash, error_msg, url):
         # If there is data, since we used limit, there should be only two entries
         assert len(json_response) == 2
     assert response.status_code == HTTPStatus.OK, error_msg
+
+
+@pytest.mark.parametrize("page_size, prefetch", [(4, False), (5, True), (3, True), (100, False)])
+def test_iter_trades_pages_and_dedupes(page_size, prefetch, fake_session, trade_history):
+    """Iterating should yield every trade of the range exactly once, newest first."""
+    history, route = trade_history
+    session = fake_session({"/trades": route})
+    client = SwitcheoApi("https://test-api.switcheo.network", session=session)
+
+    iterator = client.iter_trades("a195c1549e7da61b8da315765a790ac7e7633b82", "SWTH_NEO", page_size=page_size,
+                                  prefetch=prefetch)
+    assert [trade["id"] for trade in iterator] == [trade["id"] for trade in history]
+    assert len(session.calls) >= len(history) // page_size
+
+    ranged = list(trades._iter_trades(client.base_url, "a195c1549e7da61b8da315765a790ac7e7633b82", "SWTH_NEO",
+                                      start=1528457523 + 2, end=1528457523 + 5, page_size=2, session=session))
+    assert [trade["id"] for trade in ranged] == ["trade-{0}".format(i) for i in reversed(range(4, 10))]
+
+
+def test_iter_trades_is_lazy(fake_session, trade_history):
+    """Only the pages which are consumed should be requested."""
+    history, route = trade_history
+    session = fake_session({"/trades": route})
+    iterator = trades._iter_trades("https://test-api.switcheo.network/v2", "a195c1549e7da61b8da315765a790ac7e7633b82",
+                                   "SWTH_NEO", page_size=4, session=session)
+    assert not session.calls
+    assert next(iterator)["id"] == history[0]["id"]
+    assert len(session.calls) == 1
+    iterator.close()